@@ -0,0 +1,165 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the chunked_encoding.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import platform
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.cmd_builders import FFmpegJob, ffmpeg_cmd_args
+    from videomass.vdms_threads.chunked_encoding import (ChunkedJob,
+                                                         MergedProgress,
+                                                         chunk_encoder,
+                                                         keyframe_times,
+                                                         mapped_types,
+                                                         plan_segments,
+                                                         )
+except ImportError as error:
+    sys.exit(error)
+
+APPDATA = {'ffmpeg_cmd': 'ffmpeg',
+           'ffmpeg_loglev': '-loglevel info',
+           'ffmpeg_progress_pipe': False,
+           }
+FAKE_FFPROBE = """#!/bin/sh
+echo "0.000000,K__"
+echo "0.040000,___"
+echo "N/A,K__"
+echo "20.000000,K__"
+echo "10.000000,K__"
+"""
+
+
+def task(ptype='One pass', **kwargs):
+    """Returns a task dict like the ones of the panels"""
+    return {'type': ptype,
+            'args': ['-map 0:v? -c:v libaom-av1 -crf 30 -map 0:a? -c:a '
+                     'libopus -movflags faststart', ''],
+            'source': '/in/clip.mkv', 'destination': '/out/clip.mp4',
+            'start-time': '', 'end-time': '', 'pre-input-1': '',
+            'pre-input-2': '', 'volume': '', 'duration': 90000,
+            **kwargs}
+
+
+class TestChunkedEncoding(unittest.TestCase):
+    """Test case for the chunked encoding planner and jobs."""
+
+    def test_chunk_encoder(self):
+        self.assertEqual(chunk_encoder(task()), 'libaom-av1')
+        self.assertIsNone(chunk_encoder(task(args=['-c:v libx264', ''])))
+        self.assertIsNone(chunk_encoder(task(**{'start-time': '-ss 10'})))
+        self.assertIsNone(chunk_encoder(task('Two pass EBU')))
+        self.assertEqual(chunk_encoder(task('Two pass', args=[
+            '-pass 1 -c:v libvpx-vp9', '-pass 2 -c:v libvpx-vp9'])),
+            'libvpx-vp9')
+
+    def test_plan_segments(self):
+        keyframes = [0, 4, 9, 12, 18, 25, 31, 38]
+        self.assertEqual(plan_segments(keyframes, 40, 10),
+                         [(0, 12), (12, 25), (25, None)])
+        self.assertEqual(plan_segments(keyframes, 40, 60), [(0, None)])
+
+    def test_mapped_types(self):
+        streams = ['video', 'audio', 'subtitle']
+        self.assertEqual(mapped_types(['-c:v', 'libaom-av1'], streams),
+                         {'video', 'audio', 'subtitle'})
+        self.assertEqual(mapped_types(['-map', '0:a:0?'], streams),
+                         {'audio'})
+        self.assertEqual(mapped_types(['-map', '0:v?'], streams), {'video'})
+        self.assertEqual(mapped_types(['-an', '-sn'], streams), {'video'})
+        self.assertEqual(mapped_types(['-map', '0:0', '-map', '0:1'],
+                                      streams), {'video', 'audio'})
+        self.assertEqual(mapped_types(['-map', '0:s:1'], streams), set())
+        self.assertIsNone(mapped_types(['-map', '0:m:language:eng'],
+                                       streams))
+        self.assertIsNone(mapped_types(['-map', '1:a'], streams))
+
+    def test_chunked_job(self):
+        job = FFmpegJob(task(), 1, 1, ffmpeg_cmd_args(APPDATA))
+        chunked = ChunkedJob(job, [(0.0, 30.0), (30.0, None)], '/tmp/w',
+                             ['video', 'audio'])
+        first, last = [seg.first.argv for seg in chunked.jobs]
+        self.assertNotIn('-ss', first)
+        self.assertEqual(first[first.index('-t') + 1], '30.000000')
+        self.assertEqual(last[last.index('-ss') + 1], '30.000000')
+        self.assertLess(last.index('-ss'), last.index('-i'))
+        self.assertEqual(last[-1], '/tmp/w/segment_0002.mp4')
+        self.assertIn('-an', last)
+        self.assertEqual(chunked.rest.first.argv[-2:],
+                         ['-vn', '/tmp/w/rest.mp4'])
+        join = chunked.join.argv
+        self.assertEqual(join[join.index('-map'):join.index('-movflags')],
+                         ['-map', '0:v', '-map', '1', '-map_metadata', '1',
+                          '-map_chapters', '1', '-c', 'copy'])
+        self.assertEqual(join[join.index('-f') + 1], 'concat')
+        self.assertEqual(join[join.index('-movflags') + 1], 'faststart')
+        self.assertEqual(join[-1], '/out/clip.mp4')
+
+    def test_chunked_job_numeric_maps(self):
+        job = FFmpegJob(task(args=['-map 0:0 -map 0:1 -c:v libaom-av1', '']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        chunked = ChunkedJob(job, [(0.0, 30.0), (30.0, None)], '/tmp/w',
+                             ['video', 'audio'])
+        self.assertIsNotNone(chunked.rest)
+        job = FFmpegJob(task(args=['-map 0:p:1 -c:v libaom-av1', '']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        with self.assertRaises(ValueError):
+            ChunkedJob(job, [(0.0, 30.0), (30.0, None)], '/tmp/w',
+                       ['video', 'audio'])
+
+    def test_chunked_job_without_audio(self):
+        job = FFmpegJob(task(), 1, 1, ffmpeg_cmd_args(APPDATA))
+        chunked = ChunkedJob(job, [(0.0, 30.0), (30.0, None)], '/tmp/w',
+                             ['video'])
+        self.assertIsNone(chunked.rest)
+        self.assertNotIn('-map_metadata', chunked.join.argv)
+
+    def test_two_pass_segments(self):
+        job = FFmpegJob(task('Two pass', args=['-pass 1 -c:v libvpx-vp9',
+                                               '-pass 2 -c:v libvpx-vp9']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        chunked = ChunkedJob(job, [(0.0, 30.0), (30.0, None)], '/tmp/w')
+        seg = chunked.jobs[1]
+        for argv in (seg.first.argv, seg.second_pass().argv):
+            self.assertEqual(argv[argv.index('-passlogfile') + 1],
+                             '/tmp/w/segment_0002')
+        self.assertTrue(seg.first.header.startswith('Segment 2/2'))
+
+    def test_merged_progress(self):
+        posted = []
+        merged = MergedProgress(posted.append, 2, npasses=2)
+        merged.update(1, 1, progress={'msec': 1000, 'speed': '0.5x'})
+        merged.update(2, 1, progress={'msec': 3000, 'speed': '0.25x'})
+        merged.update(None, 1, progress={'msec': 9000, 'speed': '9x'})
+        self.assertEqual(posted[-1]['msec'], 2000)
+        self.assertEqual(posted[-1]['speed'], '0.375x')
+        merged.update(1, 2, progress={'msec': 1000, 'speed': '1x'})
+        merged.finish(1)
+        self.assertEqual(posted[-1]['msec'], 2500)
+        self.assertEqual(posted[-1]['segments'], '1/2')
+        self.assertEqual(posted[-1]['speed'], '0.125x')
+
+    @unittest.skipIf(platform.system() == 'Windows', "requires sh")
+    def test_keyframe_times(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = os.path.join(tmp, 'ffprobe')
+            with open(cmd, 'w', encoding='utf-8') as fln:
+                fln.write(FAKE_FFPROBE)
+            os.chmod(cmd, 0o755)
+            self.assertEqual(keyframe_times('clip.mkv', cmd),
+                             ([0.0, 10.0, 20.0], None))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the cmd_builders.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import shlex
+import time
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.data_cache import DataCache
+    from videomass.vdms_threads.cmd_builders import (FFmpegJob,
+                                                     build_jobs,
+                                                     ffmpeg_cmd_args,
+                                                     get_raw_cmdline_args,
+                                                     NUL,
+                                                     )
+except ImportError as error:
+    sys.exit(error)
+
+APPDATA = {'ffmpeg_cmd': 'ffmpeg',
+           'ffmpeg_loglev': '-loglevel warning',
+           'ffmpeg_progress_pipe': False,
+           }
+
+
+def task(ptype, **kwargs):
+    """Returns a task dict like the ones of the panels"""
+    return {'type': ptype,
+            'args': ['-c:v libx264 -metadata title="a b"', '-c:v libx264'],
+            'source': '/in/my "clip".mkv',
+            'destination': '/out/clip.mp4',
+            'start-time': '', 'end-time': '', 'pre-input-1': '',
+            'pre-input-2': '', 'volume': '', 'duration': 1000,
+            **kwargs}
+
+
+class TestFFmpegJob(unittest.TestCase):
+    """Test case for the FFmpegJob class."""
+
+    def test_one_pass_argv(self):
+        job = FFmpegJob(task('One pass', args=['-c copy', '']), 1, 2,
+                        ffmpeg_cmd_args(APPDATA))
+        self.assertFalse(job.twopass)
+        self.assertEqual(job.first.argv,
+                         ['ffmpeg', '-y', '-stats', '-hide_banner',
+                          '-loglevel', 'warning', '-i', '/in/my "clip".mkv',
+                          '-c', 'copy', '/out/clip.mp4'])
+        self.assertTrue(job.first.header.startswith('File 1/2\nSource:'))
+
+    def test_two_pass_argv(self):
+        job = FFmpegJob(task('Two pass'), 1, 1, ffmpeg_cmd_args(APPDATA))
+        self.assertTrue(job.twopass)
+        self.assertEqual(job.first.argv[-1], NUL)
+        self.assertIn('title=a b', job.first.argv)
+        self.assertEqual(job.second_pass().argv[-1], '/out/clip.mp4')
+        self.assertTrue(job.second_pass().stamp.startswith('\n'))
+
+    def test_cmdline_matches_argv(self):
+        job = FFmpegJob(task('Two pass', source='/in/clip.mkv'), 1, 1,
+                        ffmpeg_cmd_args(APPDATA))
+        self.assertEqual(shlex.split(job.first.cmdline), job.first.argv)
+
+    def test_ebu_second_pass(self):
+        job = FFmpegJob(task('Two pass EBU', EBU='loudnorm=I=-16',
+                             audiomap=['0:a:0', '0']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        self.assertIsNone(job.second)
+        for line in ('Input Integrated:    -27.0 LUFS',
+                     'Input True Peak:      -4.5 dBTP',
+                     'Input LRA:             6.0 LU',
+                     'Input Threshold:     -37.5 LUFS',
+                     'Target Offset:        +0.2 LU'):
+            job.parse_output(line)
+        argv = job.second_pass().argv
+        self.assertEqual(argv[argv.index('-filter:a:0') + 1],
+                         'loudnorm=I=-16:measured_I=-27.0:measured_LRA=6.0'
+                         ':measured_TP=-4.5:measured_thresh=-37.5'
+                         ':offset=+0.2:linear=true:dual_mono=true')
+
+    def test_loudness_measurement_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'clip.mkv')
+            with open(source, 'w', encoding='utf-8') as fln:
+                fln.write('media')
+            cache = DataCache(os.path.join(tmp, 'cache.db'))
+            kwa = task('Two pass EBU', source=source, EBU='loudnorm=I=-16',
+                       audiomap=['0:a:0', '0'],
+                       args=['-filter:a: loudnorm -vn -f null', '-c copy'])
+            job = FFmpegJob(kwa, 1, 1, ffmpeg_cmd_args(APPDATA))
+            self.assertFalse(job.load_summary(cache))
+            job.save_summary(cache)  # not measured, nothing to save
+            self.assertFalse(job.load_summary(cache))
+            job.summary = dict.fromkeys(job.summary, '-1.0')
+            job.save_summary(cache)
+
+            again = FFmpegJob(kwa, 1, 1, ffmpeg_cmd_args(APPDATA))
+            self.assertTrue(again.load_summary(cache))
+            self.assertIn('measured_I=-1.0', again.second_pass().cmdline)
+            other = FFmpegJob({**kwa, 'audiomap': ['0:a:1', '0']}, 1, 1,
+                              ffmpeg_cmd_args(APPDATA))
+            self.assertFalse(other.load_summary(cache))
+            with open(source, 'a', encoding='utf-8') as fln:
+                fln.write('changed')
+            self.assertFalse(FFmpegJob(kwa, 1, 1, ffmpeg_cmd_args(APPDATA)
+                                       ).load_summary(cache))
+
+    def test_loudness_with_video_analysis_is_not_cached(self):
+        job = FFmpegJob(task('Two pass EBU', EBU='loudnorm',
+                             audiomap=['0', '0'],
+                             args=['-pass 1 -filter:a: loudnorm', '-pass 2']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        self.assertIsNone(job.loudness_key())
+
+    def test_single_decoding_analysis(self):
+        args = (f'-c:v libx264 -pass 1 -an -sn -dn -f matroska {NUL} '
+                f'-map 0:a:0 -filter:a: loudnorm -vn -sn -dn -f null')
+        job = FFmpegJob(task('Two pass EBU', EBU='loudnorm',
+                             audiomap=['0:a:0', '0'],
+                             args=[args, '-c:v libx264 -pass 2']),
+                        1, 1, ffmpeg_cmd_args(APPDATA))
+        argv = job.first.argv
+        self.assertEqual(argv.count(NUL), 2)
+        self.assertLess(argv.index('-pass'), argv.index(NUL))
+        self.assertGreater(argv.index('loudnorm'), argv.index(NUL))
+        self.assertIsNone(job.loudness_key())
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            FFmpegJob(task('Three pass'), 1, 1, ffmpeg_cmd_args(APPDATA))
+        self.assertIsNone(get_raw_cmdline_args(APPDATA,
+                                               **task('Three pass')))
+
+    def test_raw_cmdline_args(self):
+        cmds = get_raw_cmdline_args(APPDATA, **task('Two pass EBU',
+                                                    EBU='loudnorm',
+                                                    audiomap=['0', '0']))
+        self.assertEqual(len(cmds), 2)
+        self.assertIn('measured_I=<?>', cmds[1])
+
+    def test_build_jobs(self):
+        tasks = [task('Two pass', destination=f'{n}.mp4')
+                 for n in range(5000)]
+        start = time.perf_counter()
+        jobs = build_jobs(APPDATA, tasks, workdirs=True)
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(jobs[-1].count, 5000)
+        self.assertTrue(os.path.isabs(jobs[0].second_pass().argv[-1]))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the data_cache.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.data_cache import (DataCache,
+                                              FrameCache,
+                                              file_signature,
+                                              frame_key,
+                                              make_key,
+                                              metadata_cache,
+                                              )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestDataCache(unittest.TestCase):
+    """Test case for the DataCache class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dbname = os.path.join(self.tmpdir.name, 'cache.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hits_and_misses(self):
+        cache = DataCache(self.dbname, maxsize=100)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 'value')
+        self.assertEqual(cache.get('a'), 'value')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1,
+                                         'entries': 1, 'size': 5})
+
+    def test_persistence(self):
+        DataCache(self.dbname, maxsize=100).put('a', 'value')
+        cache = DataCache(self.dbname, maxsize=100)
+        self.assertEqual(cache.get('a'), 'value')
+        self.assertEqual(cache.stats()['size'], 5)
+
+    def test_lru_eviction(self):
+        cache = DataCache(self.dbname, maxsize=10)
+        cache.put('a', 'aaaa')
+        cache.put('b', 'bbbb')
+        cache.get('a')  # now 'b' is the least recently used
+        cache.put('c', 'cccc')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'aaaa')
+        self.assertEqual(cache.get('c'), 'cccc')
+        self.assertEqual(cache.stats()['size'], 8)
+
+    def test_too_large_value(self):
+        cache = DataCache(self.dbname, maxsize=3)
+        cache.put('a', 'aaaa')
+        self.assertIsNone(cache.get('a'))
+
+    def test_clear(self):
+        cache = DataCache(self.dbname, maxsize=100)
+        cache.put('a', 'value')
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'misses': 0,
+                                         'entries': 0, 'size': 0})
+
+    def test_corrupted_file(self):
+        with open(self.dbname, 'w', encoding='utf-8') as fln:
+            fln.write('not a database' * 100)
+        cache = DataCache(self.dbname, maxsize=100)
+        cache.put('a', 'value')
+        self.assertEqual(cache.get('a'), 'value')
+
+    def test_cache_not_opened(self):
+        appdata = {'cachedir': os.path.join(self.tmpdir.name, 'none'),
+                   'logdir': self.tmpdir.name, 'metadata_cache_size': 1}
+        self.assertIsNone(metadata_cache(appdata))
+        self.assertFalse(os.path.exists(appdata['cachedir']))
+
+    def test_frame_cache(self):
+        cache = FrameCache(DataCache(self.dbname, maxsize=100), memsize=8)
+        cache.put('a', b'\x89PNG1')
+        cache.put('b', b'\x89PNG2')
+        self.assertEqual(list(cache.memory), ['b'])  # 'a' only on disk
+        self.assertEqual(cache.get('a'), b'\x89PNG1')
+        self.assertEqual(list(cache.memory), ['a'])
+        self.assertEqual(cache.disk.stats()['size'], 10)
+        self.assertEqual(FrameCache(DataCache(self.dbname)).get('b'),
+                         b'\x89PNG2')
+        frame = os.path.join(self.tmpdir.name, 'frame.png')
+        self.assertTrue(cache.restore('b', frame))
+        cache.store('c', frame)
+        self.assertEqual(cache.get('c'), b'\x89PNG2')
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+        self.assertFalse(cache.restore('b', frame))
+
+
+class TestFileSignature(unittest.TestCase):
+    """Test case for the file_signature and make_key functions."""
+
+    def test_signature_changes(self):
+        with tempfile.NamedTemporaryFile('w', delete=False) as fname:
+            fname.write('abc')
+        try:
+            sig = file_signature(fname.name)
+            self.assertEqual(sig[1], 3)
+            with open(fname.name, 'a', encoding='utf-8') as fout:
+                fout.write('d')
+            self.assertNotEqual(make_key(*sig),
+                                make_key(*file_signature(fname.name)))
+        finally:
+            os.remove(fname.name)
+
+    def test_missing_file(self):
+        self.assertIsNone(file_signature('/not/existing/file.mkv'))
+        self.assertIsNone(frame_key('/not/existing/file.mkv', '-ss 5'))
+
+    def test_frame_key(self):
+        with tempfile.NamedTemporaryFile('w', delete=False) as fname:
+            fname.write('abc')
+        try:
+            self.assertEqual(frame_key(fname.name, '-ss 5  -i a'),
+                             frame_key(fname.name, '-ss 5 -i a'))
+            self.assertNotEqual(frame_key(fname.name, '-ss 5'),
+                                frame_key(fname.name, '-ss 6'))
+        finally:
+            os.remove(fname.name)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the ffmpeg.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import platform
+import tempfile
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    import wx
+    from videomass.vdms_threads.ffmpeg import FFmpeg
+except ImportError:  # wxPython and pypubsub are required
+    wx = None
+
+FAKE_FFMPEG = """#!/bin/sh
+timeout 30 head -c 1 > /dev/null
+exit 255
+"""  # silent on stderr until it reads `q`, as with -progress pipe:1
+
+
+@unittest.skipIf(wx is None, "requires wxPython and pypubsub")
+@unittest.skipIf(platform.system() == 'Windows', "requires sh")
+class TestFFmpegStop(unittest.TestCase):
+    """Test case for stopping the FFmpeg thread."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        ffmpeg = os.path.join(self.tmp.name, 'ffmpeg')
+        with open(ffmpeg, 'w', encoding='utf-8') as fln:
+            fln.write(FAKE_FFMPEG)
+        os.chmod(ffmpeg, 0o755)
+        self.app = wx.App()
+        self.app.appset = {'ffmpeg_cmd': ffmpeg,
+                           'ffmpeg_loglev': '-loglevel info',
+                           'ffmpeg_progress_pipe': True,
+                           'encoding': 'utf-8',
+                           'max_parallel_jobs': 1,
+                           'chunked_encoding': 0,
+                           'cachedir': self.tmp.name,
+                           'metadata_cache_size': 0,
+                           }
+        self.kwa = {'type': 'One pass', 'args': ['-c copy', ''],
+                    'source': os.path.join(self.tmp.name, 'a.mkv'),
+                    'destination': os.path.join(self.tmp.name, 'a.mp4'),
+                    'start-time': '', 'end-time': '', 'pre-input-1': '',
+                    'pre-input-2': '', 'volume': '', 'duration': 1000,
+                    }
+
+    def tearDown(self):
+        self.app.Destroy()
+        self.tmp.cleanup()
+
+    def test_stop_on_progress_pipe(self):
+        thread = FFmpeg(os.path.join(self.tmp.name, 'test.log'), [self.kwa])
+        time.sleep(0.5)  # let FFmpeg start
+        start = time.time()
+        thread.stop()
+        thread.join(20)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.time() - start, 5)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
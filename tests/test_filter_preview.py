@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the filter_preview.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.filter_preview import (split_png,
+                                                       split_ppm,
+                                                       FilterPreview,
+                                                       PNG_END,
+                                                       )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFilterPreview(unittest.TestCase):
+    """Test case for the live filters preview."""
+
+    def test_split_png(self):
+        first = b'\x89PNG\r\n\x1a\nfirst' + PNG_END
+        second = b'\x89PNG\r\n\x1a\nsecond' + PNG_END
+        self.assertEqual(split_png(first + second), [first, second])
+        self.assertEqual(split_png(first + b'\x89PNG'), [first])
+        self.assertEqual(split_png(b''), [])
+
+    def test_split_ppm(self):
+        frame = b'P6\n2 1\n255\n' + bytes(6)
+        self.assertEqual(split_ppm(frame * 3), [frame] * 3)
+        self.assertEqual(split_ppm(frame + frame[:-1]), [frame])
+        deep = b'P6\n1 1\n65535\n' + bytes(6)
+        self.assertEqual(split_ppm(deep), [deep])
+
+    def test_adapt(self):
+        appdata = {'ffmpeg_cmd': sys.executable, 'ffmpeg-default-args': '',
+                   'ffmpeg_loglev': '', 'encoding': 'utf-8'}
+        preview = FilterPreview(appdata, budget=0.5)
+        preview.frames = [b''] * 5
+        preview.count = 5
+        preview.adapt(1.0)
+        self.assertEqual(preview.count, 2)
+        preview.adapt(1.0)
+        preview.adapt(1.0)
+        self.assertEqual(preview.count, 1)
+        preview.adapt(0.01)
+        preview.adapt(0.01)
+        preview.adapt(0.01)
+        self.assertEqual(preview.count, 5)
+        preview.adapt(0.3)  # within the budget
+        self.assertEqual(preview.count, 5)
+        preview.close()
+        self.assertEqual(preview.frames, [])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the frame_grabber.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import threading
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.frame_grabber import FrameGrabber
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFrameGrabber(unittest.TestCase):
+    """Test case for the background frame grabber."""
+
+    def setUp(self):
+        """
+        The Python interpreter plays the FFmpeg role, the
+        output file name is passed as its last argument.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.logfile = os.path.join(self.tmp.name, 'generic_task.log')
+        appdata = {'ffmpeg_cmd': sys.executable, 'ffmpeg-default-args': '',
+                   'ffmpeg_loglev': '-c', 'encoding': 'utf-8',
+                   'frame_cache_size': 1, 'cachedir': self.tmp.name}
+        self.grabber = FrameGrabber(appdata)
+        self.results = []
+        self.done = threading.Event()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def callback(self, error, output):
+        self.results.append((error, output))
+        self.done.set()
+
+    def request(self, owner, code, output='out.png', source=None):
+        self.grabber.request(owner, f'"{code}"', output, self.callback,
+                             self.logfile, source)
+
+    def test_supersede(self):
+        start = time.time()
+        self.request('crop', 'import time; time.sleep(30)', 'first.png')
+        time.sleep(0.5)  # let the first one start
+        self.request('crop', 'pass', 'second.png')
+        self.assertTrue(self.done.wait(20))
+        time.sleep(0.2)
+        self.assertEqual(self.results, [(None, 'second.png')])
+        self.assertLess(time.time() - start, 20)
+
+    def test_error_and_cancel(self):
+        self.request('scale', 'import sys; sys.exit(1)')
+        self.assertTrue(self.done.wait(20))
+        self.assertTrue(self.results[0][0].startswith('[FFMPEG]'))
+        self.done.clear()
+        self.request('eq', 'import time; time.sleep(30)')
+        time.sleep(0.5)
+        self.grabber.cancel('eq')
+        self.request('crop', 'pass')
+        self.assertTrue(self.done.wait(20))
+        self.assertEqual(len(self.results), 2)
+
+    def test_cached_frame(self):
+        output = os.path.join(self.tmp.name, 'frame.png')
+        calls = os.path.join(self.tmp.name, 'calls')
+        source = os.path.join(self.tmp.name, 'movie.mkv')
+        with open(source, 'w', encoding='utf-8') as fln:
+            fln.write('movie')
+        code = (f"import sys; open(sys.argv[-1], 'w').write('png'); "
+                f"open(r'{calls}', 'a').write('x')")
+        for _ in range(2):
+            self.done.clear()
+            self.request('crop', code, output, source=source)
+            self.assertTrue(self.done.wait(20))
+        self.assertEqual(self.results, [(None, output)] * 2)
+        with open(calls, encoding='utf-8') as fln:
+            self.assertEqual(fln.read(), 'x')  # the second one is cached
+
+    def test_pipe(self):
+        self.request('crop', "import sys; sys.stdout.buffer.write(b'PNG')",
+                     None)
+        self.assertTrue(self.done.wait(20))
+        self.assertEqual(self.results, [(None, b'PNG')])
+        self.done.clear()
+        self.request('crop', 'pass', None)  # no data
+        self.assertTrue(self.done.wait(20))
+        self.assertTrue(self.results[1][0].startswith('[FFMPEG]'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
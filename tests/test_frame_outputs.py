@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the frame_outputs.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.frame_outputs import (FrameOutput,
+                                                      frame_outputs_args,
+                                                      seek_batches,
+                                                      )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestFrameOutputs(unittest.TestCase):
+    """Test case for the multi-output frame extraction."""
+
+    def test_single_output(self):
+        out = FrameOutput('Thumbnails', '/out/a_%d.jpg', 0.2,
+                          'scale=w=320:h=-1', '-pix_fmt yuvj420p')
+        self.assertEqual(frame_outputs_args([out]),
+                         '-filter_complex "[0:v:0]fps=0.2,scale=w=320:h=-1'
+                         '[o0]" -map "[o0]" -pix_fmt yuvj420p '
+                         '-y "/out/a_%d.jpg"')
+
+    def test_split_outputs(self):
+        outputs = [FrameOutput('Thumbnails', '/out/a_%d.png', 1,
+                               'scale=w=320:h=-1'),
+                   FrameOutput('Full-size frames', '/out/a_full_%d.png')]
+        self.assertEqual(frame_outputs_args(outputs),
+                         '-filter_complex "[0:v:0]split=2[v0][v1];'
+                         '[v0]fps=1,scale=w=320:h=-1[o0];[v1]null[o1]" '
+                         '-map "[o0]" -y "/out/a_%d.png" '
+                         '-map "[o1]" -y "/out/a_full_%d.png"')
+
+    def test_count(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('a_1.jpg', 'a_2.jpg', 'a_full_1.jpg', 'a_x.jpg'):
+                with open(os.path.join(tmp, name), 'w',
+                          encoding='utf-8') as fln:
+                    fln.write('')
+            thumbs = FrameOutput('T', os.path.join(tmp, 'a_%d.jpg'))
+            full = FrameOutput('F', os.path.join(tmp, 'a_full_%d.jpg'))
+            gif = FrameOutput('G', os.path.join(tmp, 'a.gif'))
+            self.assertEqual([thumbs.count(), full.count(), gif.count()],
+                             [2, 1, 0])
+
+    def test_seek_batches(self):
+        thumbs = FrameOutput('Thumbnails', '/out/a_%d.jpg', 0.5,
+                             'scale=w=320:h=-1')
+        batches = seek_batches('/in/a.mkv', thumbs, 10, start=60, batch=3)
+        self.assertEqual([num for args, num in batches], [3, 2])
+        self.assertEqual(batches[1][0],
+                         '-skip_frame nokey -noaccurate_seek -ss 66.000 '
+                         '-i "/in/a.mkv" '
+                         '-skip_frame nokey -noaccurate_seek -ss 68.000 '
+                         '-i "/in/a.mkv" '
+                         '-map 0:v:0 -frames:v 1 -vf "scale=w=320:h=-1" '
+                         '-y "/out/a_4.jpg" '
+                         '-map 1:v:0 -frames:v 1 -vf "scale=w=320:h=-1" '
+                         '-y "/out/a_5.jpg"')
+        args = seek_batches('a.mkv', FrameOutput('T', 'a_%d.jpg', 1), 0.2)
+        self.assertEqual(args, [('-skip_frame nokey -noaccurate_seek '
+                                 '-ss 0.000 -i "a.mkv" -map 0:v:0 '
+                                 '-frames:v 1 -y "a_1.jpg"', 1)])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the headless.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.queue_state import QueueState
+    from videomass.vdms_sys.headless import (load_queue,
+                                             output_pathname,
+                                             BatchRunner,
+                                             EXIT_OK,
+                                             EXIT_FAILED,
+                                             )
+except ImportError as error:
+    sys.exit(error)
+
+FAKE_FFMPEG = """#!/bin/sh
+eval last=\\${$#}
+echo "fake output" > "$last"
+echo "Input #0, fake" >&2
+echo "frame=1 fps=25 q=1.0 size=1kB time=00:00:01.00 speed=1x" >&2
+exit $FAKE_EXIT
+"""
+WX_FREE = ('videomass.vdms_sys.headless',
+           'videomass.vdms_io.data_cache',
+           'videomass.vdms_io.image_header',
+           'videomass.vdms_io.queue_state',
+           'videomass.vdms_io.stream_signature',
+           'videomass.vdms_threads.chunked_encoding',
+           'videomass.vdms_threads.cmd_builders',
+           'videomass.vdms_threads.filter_preview',
+           'videomass.vdms_threads.frame_grabber',
+           'videomass.vdms_threads.frame_outputs',
+           'videomass.vdms_threads.progress_channel',
+           'videomass.vdms_threads.scheduler',
+           'videomass.vdms_threads.volume_estimate',
+           'videomass.vdms_threads.waveform_peaks',
+           )  # modules used by the batch mode or tested without wxPython
+
+
+class TestHeadless(unittest.TestCase):
+    """Test case for the command line batch mode."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.appdata = {'ffmpeg_cmd': os.path.join(self.tmp.name, 'ffmpeg'),
+                        'ffmpeg_loglev': '-loglevel info',
+                        'ffmpeg_progress_pipe': False,
+                        'encoding': 'utf-8',
+                        'cachedir': self.tmp.name,
+                        'metadata_cache_size': 1,
+                        }
+        os.makedirs(os.path.join(self.tmp.name, 'tmp'))
+        with open(self.appdata['ffmpeg_cmd'], 'w', encoding='utf-8') as fln:
+            fln.write(FAKE_FFMPEG)
+        os.chmod(self.appdata['ffmpeg_cmd'], 0o755)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def job(self, name):
+        name = os.path.join(self.tmp.name, name)
+        return {'type': 'One pass', 'args': ['-c copy', ''],
+                'source': f'{name}.mkv', 'destination': f'{name}.mp4',
+                'duration': 2000, 'start-time': '', 'end-time': '',
+                'extension': 'mp4', 'logname': 'test.log',
+                'preset name': 'test'}
+
+    def test_modules_without_wx(self):
+        code = ("import sys; sys.modules['wx'] = None; "  # import wx fails
+                + '; '.join(f'import {mod}' for mod in WX_FREE))
+        proc = subprocess.run([sys.executable, '-c', code],
+                              cwd=os.path.dirname(os.path.dirname(PATH)),
+                              capture_output=True, text=True, check=False)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+    def test_output_pathname(self):
+        self.assertEqual(output_pathname('/a/b.mkv', '/out', '_x', 'mp4'),
+                         '/out/b.mp4')
+        self.assertEqual(output_pathname('/a/b.mkv', '', '_x', ''),
+                         '/a/b_x.mkv')
+
+    def test_load_queue_duplicated_destinations(self):
+        queue = os.path.join(self.tmp.name, 'queue.json')
+        with open(queue, 'w', encoding='utf-8') as fln:
+            json.dump([self.job('a'), self.job('a')], fln)
+        with self.assertRaises(ValueError):
+            load_queue(queue)
+
+    @unittest.skipIf(platform.system() == 'Windows', "requires sh")
+    def test_run_events_and_exit_code(self):
+        logfile = os.path.join(self.tmp.name, 'test.log')
+        self.addCleanup(os.environ.pop, 'FAKE_EXIT', None)
+        for code, expected in (('0', EXIT_OK), ('1', EXIT_FAILED)):
+            os.environ['FAKE_EXIT'] = code
+            stream = io.StringIO()
+            runner = BatchRunner(self.appdata,
+                                 [self.job('a'), self.job('b')],
+                                 logfile, maxjobs=2, stream=stream)
+            self.assertEqual(runner.run(), expected)
+            events = [json.loads(line) for line in
+                      stream.getvalue().splitlines()]
+            self.assertEqual(events[0]['event'], 'start')
+            self.assertEqual(events[-1]['exit_code'], expected)
+            progress = [evt for evt in events if evt['event'] == 'progress']
+            self.assertEqual(progress[0]['percent'], 50.0)
+
+    @unittest.skipIf(platform.system() == 'Windows', "requires sh")
+    def test_run_records_queue_state(self):
+        os.environ['FAKE_EXIT'] = '0'
+        self.addCleanup(os.environ.pop, 'FAKE_EXIT', None)
+        state = QueueState(os.path.join(self.tmp.name, 'queue.state'))
+        jobs = [self.job('a')]
+        runner = BatchRunner(self.appdata, jobs,
+                             os.path.join(self.tmp.name, 'test.log'),
+                             stream=io.StringIO(), state=state)
+        self.assertEqual(runner.run(), EXIT_OK)
+        self.assertEqual(state.get(jobs[0]), 'done')
+        self.assertEqual(state.pending(jobs), [])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
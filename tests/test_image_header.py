@@ -0,0 +1,87 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the image_header.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import struct
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.image_header import (read_image_header,
+                                                image_probe,
+                                                pretty_size,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+EXIF = (b'Exif\x00\x00MM\x00\x2a\x00\x00\x00\x08\x00\x01'
+        b'\x01\x12\x00\x03\x00\x00\x00\x01\x00\x06\x00\x00\x00\x00\x00\x00')
+JPEG = (b'\xff\xd8'
+        + b'\xff\xe1' + struct.pack('>H', len(EXIF) + 2) + EXIF
+        + b'\xff\xdb\x00\x04\x00\x00'  # quantization table
+        + b'\xff\xc0\x00\x11\x08' + struct.pack('>HH', 480, 640)
+        + b'\x03' + b'\x00' * 9 + b'\xff\xd9')
+PNG = (b'\x89PNG\r\n\x1a\n\x00\x00\x00\x0dIHDR'
+       + struct.pack('>II', 800, 600) + b'\x08\x02\x00\x00\x00')
+BMP = (b'BM' + b'\x00' * 12 + struct.pack('<Iii', 40, 320, -200)
+       + b'\x00' * 28)
+WEBP = (b'RIFF\x00\x00\x00\x00WEBPVP8X\x0a\x00\x00\x00\x00\x00\x00\x00'
+        + (1919).to_bytes(3, 'little') + (1079).to_bytes(3, 'little'))
+
+
+class TestImageHeader(unittest.TestCase):
+    """Test case for the image header reader."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        filename = os.path.join(self.tmp.name, name)
+        with open(filename, 'wb') as fln:
+            fln.write(data)
+        return filename
+
+    def test_formats(self):
+        for name, data, expected in (
+                ('a.jpg', JPEG, ('jpeg', 640, 480, 6)),
+                ('a.png', PNG, ('png', 800, 600, 1)),
+                ('a.bmp', BMP, ('bmp', 320, 200, 1)),
+                ('a.webp', WEBP, ('webp', 1920, 1080, 1))):
+            header = read_image_header(self.write(name, data))
+            self.assertEqual(tuple(header.values()), expected, name)
+
+    def test_unsupported_or_broken(self):
+        self.assertIsNone(read_image_header(self.write('a.gif',
+                                                       b'GIF89a' * 8)))
+        self.assertIsNone(read_image_header(self.write('b.jpg', JPEG[:40])))
+        self.assertIsNone(image_probe(os.path.join(self.tmp.name, 'no.png')))
+
+    def test_image_probe(self):
+        probe = image_probe(self.write('a.jpg', JPEG))
+        stream = probe['streams'][0]
+        self.assertEqual((stream['codec_type'], stream['width'],
+                          stream['height']), ('video', 640, 480))
+        self.assertEqual(stream['side_data_list'][0]['rotation'], -90)
+        self.assertIn('sequence', probe['format']['format_long_name'])
+        self.assertEqual(probe['format']['size'], f'{len(JPEG)} byte')
+
+    def test_pretty_size(self):
+        self.assertEqual(pretty_size(1536), '1.500000 Kibyte')
+        self.assertEqual(pretty_size(3 * 1024 ** 2), '3.000000 Mibyte')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the make_filelog.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.make_filelog import (LogWriter,
+                                                make_log_template,
+                                                tolog,
+                                                flush_logs,
+                                                )
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestLogWriter(unittest.TestCase):
+    """Test case for the LogWriter class."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.logfile = os.path.join(self.tmpdir.name, 'test.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read(self):
+        with open(self.logfile, encoding='utf-8') as log:
+            return log.read()
+
+    def test_buffered_until_flush(self):
+        writer = LogWriter(interval=60)
+        writer.write(self.logfile, 'one\n')
+        writer.write(self.logfile, 'two\n')
+        self.assertFalse(os.path.exists(self.logfile))
+        writer.flush()
+        self.assertEqual(self.read(), 'one\ntwo\n')
+
+    def test_maxbuffer(self):
+        writer = LogWriter(interval=60, maxbuffer=10)
+        writer.write(self.logfile, 'a' * 6)
+        writer.write(self.logfile, 'b' * 6)  # exceeds, flush now
+        self.assertEqual(self.read(), 'a' * 6 + 'b' * 6)
+
+    def test_tolog_after_template(self):
+        logfile = make_log_template('test.log', self.tmpdir.name, mode='w')
+        tolog('message', logfile)
+        flush_logs(logfile)
+        self.assertTrue(self.read().endswith('\nmessage\n'))
+        make_log_template('test.log', self.tmpdir.name, mode='w')
+        self.assertNotIn('message', self.read())
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
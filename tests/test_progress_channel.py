@@ -0,0 +1,94 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the progress_channel.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.progress_channel import (ProgressChannel,
+                                                         parse_progress,
+                                                         read_progress_blocks)
+except ImportError as error:
+    sys.exit(error)
+
+STATS = ('frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02 '
+         'bitrate= 435.0kbits/s speed=5.15x  \n')
+
+
+class TestParseProgress(unittest.TestCase):
+    """Test case for the parse_progress function."""
+
+    def test_stats_line(self):
+        progress = parse_progress(STATS)
+        self.assertEqual(progress['frame'], '1178')
+        self.assertEqual(progress['size'], '2072kB')
+        self.assertEqual(progress['speed'], '5.15x')
+        self.assertEqual(progress['msec'], 39020)
+
+    def test_other_lines(self):
+        self.assertIsNone(parse_progress('Press [q] to stop\n'))
+
+
+class TestReadProgressBlocks(unittest.TestCase):
+    """Test case for the read_progress_blocks function."""
+
+    def test_blocks(self):
+        stream = ['frame=25\n', 'fps=0.00\n', 'bitrate=N/A\n',
+                  'total_size=2048\n', 'out_time_us=1000000\n',
+                  'out_time=00:00:01.000000\n', 'speed=2.5x\n',
+                  'progress=continue\n',
+                  'frame=50\n', 'out_time_us=N/A\n', 'progress=end\n']
+        first, last = list(read_progress_blocks(stream))
+        self.assertEqual(first['frame'], '25')
+        self.assertEqual(first['size'], '2kB')
+        self.assertEqual(first['speed'], '2.5x')
+        self.assertEqual(first['msec'], 1000)
+        self.assertEqual(last['frame'], '50')
+        self.assertEqual(last['msec'], 0)
+
+
+class TestProgressChannel(unittest.TestCase):
+    """Test case for the ProgressChannel class."""
+
+    def setUp(self):
+        self.now = 0.0
+        self.posted = []
+        self.channel = ProgressChannel(self.post, rate=10,
+                                       clock=lambda: self.now)
+
+    def post(self, progress, lines):
+        self.posted.append((progress, lines))
+
+    def test_rate_cap(self):
+        for num in range(1000):  # 1000 lines in one second
+            self.now = num / 1000
+            self.channel.feed(STATS if num % 2 else f'line {num}\n')
+        self.channel.flush()
+        self.assertLessEqual(self.channel.events, 10 + 1)
+        lines = sum(len(lines) for progress, lines in self.posted)
+        self.assertEqual(lines, 500)  # no message lost
+
+    def test_flush_sends_pending(self):
+        self.channel.feed('first\n')  # sent immediately
+        self.channel.feed('second\n')
+        self.channel.feed(STATS)
+        self.assertEqual(len(self.posted), 1)
+        self.channel.flush()
+        self.assertEqual(self.posted[-1][1], ['second\n'])
+        self.assertEqual(self.posted[-1][0]['msec'], 39020)
+        self.channel.flush()  # nothing pending
+        self.assertEqual(len(self.posted), 2)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
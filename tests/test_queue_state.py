@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the queue_state.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import json
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.queue_state import QueueState
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestQueueState(unittest.TestCase):
+    """Test case for the QueueState class."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.statefile = os.path.join(self.tmp.name, 'queue.state')
+        self.queue = []
+        for name in ('a', 'b', 'c'):
+            src = os.path.join(self.tmp.name, f'{name}.mkv')
+            with open(src, 'w', encoding='utf-8') as fln:
+                fln.write(name)
+            self.queue.append({'type': 'One pass', 'args': ['-c copy', ''],
+                               'source': src,
+                               'destination': os.path.join(self.tmp.name,
+                                                           f'{name}.mp4')})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def encode(self, state, kwa, status='DONE'):
+        state.start(kwa)
+        with open(kwa['destination'], 'w', encoding='utf-8') as fln:
+            fln.write('output')
+        state.finish(kwa, status)
+
+    def test_resume_after_crash(self):
+        state = QueueState(self.statefile)
+        self.encode(state, self.queue[0])
+        state.start(self.queue[1])  # crash while running
+
+        state = QueueState(self.statefile)  # restart
+        self.assertEqual(state.get(self.queue[0]), 'done')
+        self.assertEqual(state.get(self.queue[1]), 'running')
+        self.assertEqual(state.get(self.queue[2]), 'pending')
+        self.assertEqual(state.pending(self.queue), self.queue[1:])
+
+    def test_item_data(self):
+        state = QueueState(self.statefile)
+        self.encode(state, self.queue[0])
+        with open(self.statefile, 'r', encoding='utf-8') as fln:
+            item = json.load(fln)[os.path.abspath(
+                self.queue[0]['destination'])]
+        self.assertEqual(item['size'], 6)
+        self.assertGreaterEqual(item['walltime'], 0)
+
+    def test_changed_output_is_not_complete(self):
+        state = QueueState(self.statefile)
+        self.encode(state, self.queue[0])
+        self.assertTrue(state.is_complete(self.queue[0]))
+        with open(self.queue[0]['destination'], 'a', encoding='utf-8') as fln:
+            fln.write('truncated?')
+        self.assertFalse(state.is_complete(self.queue[0]))
+
+    def test_changed_task_is_not_complete(self):
+        state = QueueState(self.statefile)
+        self.encode(state, self.queue[0])
+        edited = {**self.queue[0], 'args': ['-c:v libx264', '']}
+        self.assertFalse(state.is_complete(edited))
+
+    def test_failed_and_stopped(self):
+        state = QueueState(self.statefile)
+        self.encode(state, self.queue[0], 'FAILED')
+        self.encode(state, self.queue[1], 'STOP')
+        self.assertEqual(state.get(self.queue[0]), 'failed')
+        self.assertEqual(state.get(self.queue[1]), 'pending')
+        self.assertEqual(state.pending(self.queue), self.queue)
+
+    def test_prune_and_clear(self):
+        state = QueueState(self.statefile)
+        for kwa in self.queue:
+            self.encode(state, kwa)
+        state.prune(self.queue[:1])
+        self.assertEqual(QueueState(self.statefile).pending(self.queue),
+                         self.queue[1:])
+        state.clear()
+        self.assertFalse(os.path.exists(self.statefile))
+
+    def test_write_error(self):
+        state = QueueState(os.path.join(self.tmp.name, 'none', 'q.state'))
+        self.assertTrue(state.start(self.queue[0]).startswith(
+            '[VIDEOMASS]: ERROR'))
+        self.assertEqual(state.get(self.queue[0]), 'running')
+        self.assertIsNone(QueueState(self.statefile).start(self.queue[0]))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
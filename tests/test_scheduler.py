@@ -0,0 +1,82 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the scheduler.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import subprocess
+import threading
+import time
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.scheduler import JobScheduler
+except ImportError as error:
+    sys.exit(error)
+
+
+class TestJobScheduler(unittest.TestCase):
+    """Test case for the JobScheduler class."""
+
+    def test_results_in_input_order(self):
+        sched = JobScheduler(maxjobs=3)
+
+        def job(count, item):
+            time.sleep(0.05 / count)  # later jobs end first
+            return (count, item * 2)
+
+        self.assertEqual(sched.run(job, [1, 2, 3, 4]),
+                         [(1, 2), (2, 4), (3, 6), (4, 8)])
+
+    def test_max_parallel_jobs(self):
+        sched = JobScheduler(maxjobs=2)
+        lock = threading.Lock()
+        running = [0, 0]  # current, peak
+
+        def job(count, item):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        sched.run(job, range(6))
+        self.assertEqual(running[1], 2)
+
+    def test_stop_skips_queued_jobs(self):
+        sched = JobScheduler(maxjobs=1)
+
+        def job(count, item):
+            sched.stop()
+            return count
+
+        self.assertEqual(sched.run(job, range(3)), [1, None, None])
+
+    def test_stop_shares_the_timeout(self):
+        sched = JobScheduler(maxjobs=3, timeout=1)
+        procs = [subprocess.Popen([sys.executable, '-c',
+                                   'import time; time.sleep(30)'],
+                                  stdin=subprocess.PIPE,
+                                  universal_newlines=True)
+                 for _ in range(3)]  # they ignore `q`
+        for proc in procs:
+            sched.register(proc)
+        start = time.time()
+        sched.stop()
+        self.assertLess(time.time() - start, 2.5)
+        for proc in procs:
+            self.assertIsNotNone(proc.wait(5))
+            proc.stdin.close()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
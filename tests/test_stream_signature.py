@@ -0,0 +1,87 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the stream_signature.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_io.stream_signature import (sample_rate_hz,
+                                                    signature,
+                                                    compare_signatures,
+                                                    normalizable,
+                                                    normalize_args,
+                                                    )
+except ImportError as error:
+    sys.exit(error)
+
+
+def probe(vcodec='h264', width=1920, rate='48.000000 KHz', audio=True):
+    """Returns ffprobe data with a video and an audio stream"""
+    streams = [{'index': 0, 'codec_type': 'video', 'codec_name': vcodec,
+                'width': width, 'height': 1080, 'pix_fmt': 'yuv420p',
+                'r_frame_rate': '25/1', 'time_base': '1/12800'},
+               {'index': 1, 'codec_type': 'subtitle', 'codec_name': 'srt'}]
+    if audio:
+        streams.append({'index': 2, 'codec_type': 'audio',
+                        'codec_name': 'aac', 'sample_rate': rate,
+                        'channels': 2, 'time_base': '1/48000'})
+    return {'streams': streams, 'format': {}}
+
+
+class TestStreamSignature(unittest.TestCase):
+    """Test case for the concat stream signatures."""
+
+    def test_sample_rate_hz(self):
+        self.assertEqual(sample_rate_hz('44.100000 KHz'), 44100)
+        self.assertEqual(sample_rate_hz('48000'), 48000)
+
+    def test_signature_is_stored(self):
+        data = probe()
+        sign = signature(data)
+        self.assertIs(data['signature'], sign)
+        self.assertEqual([stream[0] for stream in sign['streams']],
+                         ['video', 'audio'])
+        self.assertEqual(sign['digest'], signature(probe(rate='48000'))
+                         ['digest'])
+
+    def test_time_base_not_compared(self):
+        other = probe()
+        other['streams'][0]['time_base'] = '1/90000'
+        self.assertEqual(compare_signatures([probe(), other]), (0, []))
+
+    def test_compare_signatures(self):
+        data = [probe(width=1280), probe(), probe(), probe(vcodec='hevc')]
+        self.assertEqual(compare_signatures(data), (1, [0, 3]))
+        self.assertEqual(compare_signatures([probe(), probe()]), (0, []))
+        self.assertEqual(compare_signatures([{'streams': []}, probe()]),
+                         (None, []))
+
+    def test_normalize(self):
+        self.assertFalse(normalizable(probe(audio=False), probe()))
+        self.assertTrue(normalizable(probe(vcodec='vp9'), probe()))
+        args = normalize_args(probe(vcodec='vp9', width=1280), probe(),
+                              'mp4')
+        self.assertEqual(args,
+                         '-map 0:0 -c:0 libx264 '
+                         '-filter:0 "scale=1920:1080:'
+                         'force_original_aspect_ratio=decrease,'
+                         'pad=1920:1080:(ow-iw)/2:(oh-ih)/2" '
+                         '-pix_fmt:0 yuv420p -r:0 25/1 '
+                         '-video_track_timescale 12800 '
+                         '-map 0:2 -c:1 aac -ar:1 48000 -ac:1 2')
+        self.assertNotIn('timescale', normalize_args(probe(), probe(),
+                                                     'mkv'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@
 
 import sys
 import os.path
+import tempfile
 import unittest
 
 PATH = os.path.realpath(os.path.abspath(__file__))
@@ -15,6 +16,7 @@ try:
                                             to_bytes,
                                             time_to_integer,
                                             integer_to_time,
+                                            write_concat_list,
                                             )
 except ImportError as error:
     sys.exit(error)
@@ -100,6 +102,28 @@ class TestTimeHuman(unittest.TestCase):
                                          mills=False), '02:30:50')
 
 
+class TestWriteConcatList(unittest.TestCase):
+    """Test case for the write_concat_list function."""
+
+    def test_write_concat_list(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            listfile = os.path.join(tmp, 'list.txt')
+            write_concat_list(['/a/b.mp4', "/a/it's.mp4"], listfile)
+            with open(listfile, 'r', encoding='utf-8') as fln:
+                self.assertEqual(fln.read(), "file '/a/b.mp4'\n"
+                                             "file '/a/it'\\''s.mp4'")
+
+    def test_write_concat_list_of_images(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            listfile = os.path.join(tmp, 'list.txt')
+            write_concat_list(['/a/1.jpg', '/a/2.jpg'], listfile, 5)
+            with open(listfile, 'r', encoding='utf-8') as fln:
+                self.assertEqual(fln.read().splitlines(),
+                                 ["file '/a/1.jpg'", 'duration 5',
+                                  "file '/a/2.jpg'", 'duration 5',
+                                  "file '/a/2.jpg'"])
+
+
 def main():
     unittest.main()
 
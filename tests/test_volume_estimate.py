@@ -0,0 +1,72 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the volume_estimate.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.volume_estimate import (sample_windows,
+                                                        sample_args,
+                                                        parse_windows,
+                                                        estimate_volume,
+                                                        )
+except ImportError as error:
+    sys.exit(error)
+
+REPORT = ['[Parsed_volumedetect_1 @ 0x55d1] n_samples: 882000',
+          '[Parsed_volumedetect_1 @ 0x55d1] mean_volume: -30.0 dB',
+          '[Parsed_volumedetect_1 @ 0x55d1] max_volume: -3.5 dB',
+          '[Parsed_volumedetect_0 @ 0x55d0] mean_volume: -20.0 dB',
+          '[Parsed_volumedetect_0 @ 0x55d0] max_volume: -1.0 dB',
+          '[Parsed_volumedetect_2 @ 0x55d2] mean_volume: -inf dB',
+          '[Parsed_volumedetect_2 @ 0x55d2] max_volume: -inf dB',
+          ]
+
+
+class TestVolumeEstimate(unittest.TestCase):
+    """Test case for the fast volume estimate."""
+
+    def test_sample_windows(self):
+        self.assertEqual(sample_windows(400, nwin=4, length=10),
+                         [45.0, 145.0, 245.0, 345.0])
+        self.assertEqual(sample_windows(400, 60, nwin=2, length=10),
+                         [155.0, 355.0])
+        self.assertEqual(sample_windows(100, nwin=4, length=10), [])
+
+    def test_sample_args(self):
+        args = sample_args('/a/b.mkv', [5.0, 25.0], '-map 0:a:1')
+        self.assertEqual(args, '-ss 5.0 -t 10 -i "/a/b.mkv" '
+                               '-ss 25.0 -t 10 -i "/a/b.mkv" '
+                               '-filter_complex "[0:a:1]volumedetect[a0];'
+                               '[1:a:1]volumedetect[a1]" '
+                               '-map "[a0]" -map "[a1]"')
+        self.assertIn('[0:a:0]volumedetect', sample_args('b.mkv', [5.0]))
+
+    def test_parse_windows(self):
+        self.assertEqual(parse_windows(REPORT), [(-1.0, -20.0),
+                                                 (-3.5, -30.0),
+                                                 (float('-inf'),
+                                                  float('-inf'))])
+
+    def test_estimate_volume(self):
+        maxv, meanv, bound = estimate_volume(parse_windows(REPORT))
+        self.assertEqual(maxv, '-1.0 dB')
+        # energy average of -20, -30 dB and silence
+        self.assertEqual(meanv, '-24.4 dB')
+        self.assertEqual(bound, 9.8)
+        self.assertEqual(estimate_volume([(-2.0, -18.0)]),
+                         ('-2.0 dB', '-18.0 dB', 0.0))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+# Porpose: Contains test cases for the waveform_peaks.py object.
+# Rev: 18.Oct.2026
+
+import sys
+import os.path
+import struct
+import tempfile
+import unittest
+
+PATH = os.path.realpath(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(PATH)))
+
+try:
+    from videomass.vdms_threads.waveform_peaks import (pcm_peaks,
+                                                       peak_columns,
+                                                       WaveformPeaks,
+                                                       CHUNK,
+                                                       )
+except ImportError as error:
+    sys.exit(error)
+
+
+def pcm(*values):
+    """Returns `CHUNK` samples of each value as s16le bytes"""
+    return b''.join(struct.pack('<h', val) * CHUNK for val in values)
+
+
+class TestWaveformPeaks(unittest.TestCase):
+    """Test case for the timeline waveform peaks."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, 'audio.wav')
+        with open(self.source, 'wb') as fln:
+            fln.write(b'RIFF')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, code):
+        """
+        Read the peaks by the Python interpreter in place of
+        FFmpeg, `code` writes the samples to the standard output.
+        """
+        appdata = {'ffmpeg_cmd': sys.executable, 'ffmpeg-default-args': '',
+                   'ffmpeg_loglev': f'-c "{code}"', 'encoding': 'utf-8',
+                   'metadata_cache_size': 1, 'cachedir': self.tmp.name}
+        results = []
+        thread = WaveformPeaks(appdata, self.source,
+                               lambda *args: results.append(args),
+                               logfile=os.path.join(self.tmp.name, 'log'))
+        thread.join(20)
+        return results
+
+    def test_pcm_peaks(self):
+        self.assertEqual(pcm_peaks(pcm(1000, -32768, 0)), bytes([7, 255, 0]))
+        self.assertEqual(pcm_peaks(pcm(256)[:-1]), bytes([2]))
+
+    def test_peak_columns(self):
+        peaks = bytes([0, 255, 51, 102])
+        self.assertEqual(peak_columns(peaks, 2), [1.0, 0.4])
+        self.assertEqual(peak_columns(peaks, 8)[:2], [0.0, 0.0])
+        self.assertEqual(peak_columns(peaks, 1, start=0.5), [0.4])
+        self.assertEqual(peak_columns(b'', 10), [])
+
+    def test_read_and_cache(self):
+        data = pcm(1000, -32768)
+        results = self.read(f"import sys; sys.stdout.buffer.write({data!r})")
+        self.assertEqual(results, [(None, bytes([7, 255]))])
+        results = self.read("import sys; sys.exit(1)")  # cached
+        self.assertEqual(results, [(None, bytes([7, 255]))])
+        os.utime(self.source, (0, 0))  # the file changed
+        results = self.read("import sys; sys.exit(1)")
+        self.assertTrue(results[0][0].startswith('[FFMPEG]'))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
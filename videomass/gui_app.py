@@ -37,6 +37,7 @@ from videomass.vdms_sys.argparser import arguments
 from videomass.vdms_sys.configurator import DataSource
 from videomass.vdms_sys import app_const as appC
 from videomass.vdms_utils.utils import del_filecontents
+from videomass.vdms_io.make_filelog import flush_logs
 # from videomass.vdms_sys.external_package import importer_init_file
 
 # add translation macro to builtin similar to what gettext does
@@ -183,6 +184,7 @@ class Videomass(wx.App):
                     elif os.path.isdir:
                         rmtree(fcache)
 
+        flush_logs()  # write the buffered log messages before clearing
         if self.appset['clearlogfiles']:
             logdir = self.appset['logdir']
             if os.path.exists(logdir):
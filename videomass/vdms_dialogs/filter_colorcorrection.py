@@ -25,13 +25,15 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import io
 import webbrowser
+from functools import partial
 import wx
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io.make_filelog import make_log_template
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_grabber import frame_grabber
 from videomass.vdms_io.io_tools import show_msg_notify
 
 
@@ -47,10 +49,7 @@ class ColorEQ(wx.Dialog):
     OS = get.appset['ostype']
     LOGDIR = get.appset['logdir']
     TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'ColorEQ')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    TMPEDIT = os.path.join(TMPROOT, 'tmpedit')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
-    os.makedirs(TMPEDIT, mode=0o777, exist_ok=True)
+    os.makedirs(TMPROOT, mode=0o777, exist_ok=True)
     # BACKGROUND = '#1b0413'
 
     def __init__(self, parent, colorset, iconreset, **kwa):
@@ -64,8 +63,6 @@ class ColorEQ(wx.Dialog):
         """
         self.filename = kwa['filename']
         name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.framesrc = os.path.join(ColorEQ.TMPSRC, f'{name}.png')
-        self.frameedit = os.path.join(ColorEQ.TMPEDIT, f'{name}.png')
         self.fileclock = os.path.join(ColorEQ.TMPROOT, f'{name}.clock')
         # resizing values preserving aspect ratio for monitors
         thr = 150 if kwa['height'] > kwa['width'] else 270
@@ -78,6 +75,8 @@ class ColorEQ(wx.Dialog):
         tcheck = clockset(kwa['duration'], self.fileclock)
         self.clock = tcheck['duration']
         self.mills = tcheck['millis']
+        self.logfile = None
+        self.grabber = frame_grabber(wx.GetApp().appset, wx.CallAfter)
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
         sizerBase = wx.BoxSizer(wx.VERTICAL)
@@ -265,55 +264,73 @@ class ColorEQ(wx.Dialog):
 
         if colorset:  # previus values
             self.set_default(colorset)
-        self.process(self.framesrc)
-        self.loader_initial_source()
+        self.process('source', callback=self.loader_initial_source)
         self.equalize_image(self.concat_filter())
     # -----------------------------------------------------------------------#
 
-    def process(self, pathtosave, equalizer=''):
+    def process(self, target, equalizer='', callback=None):
         """
         Generate a new frame at the clock position using
-        ffmpeg `eq` filter.
-        """
-        logfile = make_log_template('generic_task.log',
-                                    ColorEQ.LOGDIR,
-                                    mode="w",
-                                    )
+        ffmpeg `eq` filter. The frame of the `target` panel
+        ('source' or 'edit') is grabbed in background by the
+        shared `FrameGrabber` and read from pipe already scaled
+        to the panel size, then `callback` is called with
+        the frame data.
+        """
+        self.logfile = make_log_template('generic_task.log',
+                                         ColorEQ.LOGDIR,
+                                         mode="w",
+                                         )
         if not self.mills:
             sseg = ''
         else:
             sseg = f'-ss {self.clock}'
-        eql = '' if not equalizer else f'-vf "{equalizer}"'
-        arg = (f'{sseg} -i "{self.filename}" -f image2 '
-               f'-update 1 -frames:v 1 {eql} "{pathtosave}"')
-        thread = FFmpegGenericTask(arg, 'ColorEQ', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
+        eql = '' if not equalizer else f',{equalizer}'
+        arg = (f'{sseg} -i "{self.filename}" -frames:v 1 '
+               f'-vf "scale={self.w_ratio}:{self.h_ratio}{eql}"')
+        self.grabber.request((self, target), arg, None,
+                             partial(self.on_frame, callback), self.logfile,
+                             source=self.filename)
+    # -----------------------------------------------------------------------#
+
+    def on_frame(self, callback, error, data):
+        """
+        Callback of the `FrameGrabber`.
+        """
         if error:
             show_msg_notify(self.GetParent(),
-                            logname=os.path.basename(logfile))
-            return error
-        return None
+                            logname=os.path.basename(self.logfile))
+            if self.mills:
+                self.btn_load.Enable()
+            return
+        if callback:
+            callback(data)
+    # -----------------------------------------------------------------------#
+
+    def make_bitmap(self, data):
+        """
+        Returns a bitmap of the panels size from the
+        PNG frame `data` (bytes).
+        """
+        img = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_PNG)
+        if (img.GetWidth(), img.GetHeight()) != (self.w_ratio, self.h_ratio):
+            img = img.Scale(self.w_ratio, self.h_ratio,
+                            wx.IMAGE_QUALITY_NORMAL)
+        return img.ConvertToBitmap()
     # -----------------------------------------------------------------------#
 
-    def loader_initial_source(self):
+    def loader_initial_source(self, data):
         """
         Loads initial StaticBitmaps on panels 1 (source).
         """
-        img = wx.Image(self.framesrc, wx.BITMAP_TYPE_ANY)
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
-        bitmap = img.ConvertToBitmap()
-        wx.StaticBitmap(self.panel_img1, wx.ID_ANY, bitmap)
+        wx.StaticBitmap(self.panel_img1, wx.ID_ANY, self.make_bitmap(data))
     # -----------------------------------------------------------------------#
 
-    def loader_initial_edit(self):
+    def loader_initial_edit(self, data):
         """
         Loads initial StaticBitmaps on panels 2 (edit)
         """
-        img = wx.Image(self.frameedit, wx.BITMAP_TYPE_ANY)
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
-        bitmap = img.ConvertToBitmap()
-        wx.StaticBitmap(self.panel_img2, wx.ID_ANY, bitmap)
+        wx.StaticBitmap(self.panel_img2, wx.ID_ANY, self.make_bitmap(data))
     # -----------------------------------------------------------------------#
 
     def set_default(self, colorset):
@@ -350,10 +367,7 @@ class ColorEQ(wx.Dialog):
         """
         Sends the equalization values to the process
         """
-        error = self.process(self.frameedit, equalizer=equalizer)
-        if error:
-            return
-        self.loader_initial_edit()
+        self.process('edit', equalizer, self.loader_initial_edit)
     # -----------------------------------------------------------------------#
 
     def concat_filter(self):
@@ -388,23 +402,19 @@ class ColorEQ(wx.Dialog):
         """
         seek = self.sld_time.GetValue()
         self.clock = integer_to_time(seek, False)  # to 24-hour
-        error = self.process(self.framesrc)
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
-            return
-        self.loader_initial_source()
-
-        error = self.process(self.frameedit, self.concat_filter())
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
-            return
-        self.loader_initial_edit()
+        self.btn_load.Disable()
+        self.process('source', callback=self.on_source_at_time)
+        self.process('edit', self.concat_filter(), self.loader_initial_edit)
+    # -----------------------------------------------------------------------#
 
+    def on_source_at_time(self, data):
+        """
+        Loads the source frame reloaded at a given time clock
+        point and saves the clock.
+        """
+        self.loader_initial_source(data)
         with open(self.fileclock, "w", encoding='utf-8') as atime:
             atime.write(self.clock)
-        self.btn_load.Disable()
     # -----------------------------------------------------------------------#
 
     def on_contrast(self, event):
@@ -485,6 +495,8 @@ class ColorEQ(wx.Dialog):
         Close this dialog without saving anything.
         Don't use self.Destroy() here, it is used by the caller
         """
+        self.grabber.cancel((self, 'source'))
+        self.grabber.cancel((self, 'edit'))
         event.Skip()
     # -----------------------------------------------------------------------#
 
@@ -493,6 +505,8 @@ class ColorEQ(wx.Dialog):
         Before destroying the dialog getvalue() will be called.
         Don't use self.Destroy() here, it is used by the caller
         """
+        self.grabber.cancel((self, 'source'))
+        self.grabber.cancel((self, 'edit'))
         event.Skip()
     # -----------------------------------------------------------------------#
 
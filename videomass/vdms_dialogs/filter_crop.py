@@ -25,12 +25,13 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import io
 import webbrowser
 import wx
 import wx.lib.statbmp
 import wx.lib.colourselect as csel
 from pubsub import pub
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_grabber import frame_grabber
 from videomass.vdms_io.io_tools import show_msg_notify
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
@@ -38,14 +39,15 @@ from videomass.vdms_utils.utils import clockset
 from videomass.vdms_io.make_filelog import make_log_template
 
 
-def make_bitmap(width, height, fname):
+def make_bitmap(width, height, data):
     """
-    Resize the image to the given size and convert it to a
-    bitmap object.
+    Load the PNG image `data` (bytes), resize it to the given
+    size if needed and convert it to a bitmap object.
     Returns a wx.Bitmap object
     """
-    img = wx.Image(fname)
-    img = img.Scale(int(width), int(height), wx.IMAGE_QUALITY_NORMAL)
+    img = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_PNG)
+    if (img.GetWidth(), img.GetHeight()) != (int(width), int(height)):
+        img = img.Scale(int(width), int(height), wx.IMAGE_QUALITY_NORMAL)
     bmp = img.ConvertToBitmap()
     return bmp
 
@@ -180,8 +182,7 @@ class Crop(wx.Dialog):
     OS = get.appset['ostype']
     LOGDIR = get.appset['logdir']
     TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Crop')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
+    os.makedirs(TMPROOT, mode=0o777, exist_ok=True)
     BACKGROUND = '#1b0413'
 
     def __init__(self, parent, *args, **kwa):
@@ -214,11 +215,11 @@ class Crop(wx.Dialog):
         self.w_scaled = round((self.width / self.height) * self.h_scaled)
         self.filename = kwa['filename']  # selected filename on file list
         name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.frame = os.path.join(f'{Crop.TMPSRC}', f'{name}.png')  # image
         self.fileclock = os.path.join(Crop.TMPROOT, f'{name}.clock')
         tcheck = clockset(kwa['duration'], self.fileclock)
         self.clock = tcheck['duration']
         self.mills = tcheck['millis']
+        self.grabber = frame_grabber(wx.GetApp().appset, wx.CallAfter)
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
         sizerBase = wx.BoxSizer(wx.VERTICAL)
         self.panelrect = wx.Panel(self, wx.ID_ANY,
@@ -320,14 +321,10 @@ class Crop(wx.Dialog):
         gridbtns.Add(boxaff, 0, wx.ALL | wx.ALIGN_RIGHT | wx.RIGHT, border=5)
         sizerBase.Add(gridbtns, 0, wx.EXPAND)
 
-        # instance to Actor widget
-        if os.path.exists(self.frame):
-            bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
-            self.bob = Actor(self.panelrect, bmp, 1, "")
-        else:  # make a temporary empty bitmap
-            bmp = wx.Bitmap(self.w_scaled, self.h_scaled)
-            self.bob = Actor(self.panelrect, bmp, 1, "")
-            self.make_frame_from_file(None)
+        # instance to Actor widget with a temporary empty bitmap
+        bmp = wx.Bitmap(self.w_scaled, self.h_scaled)
+        self.bob = Actor(self.panelrect, bmp, 1, "")
+        self.make_frame_from_file(None)
 
         # ----------------------Properties-----------------------#
         self.panelrect.SetBackgroundColour(wx.Colour(Crop.BACKGROUND))
@@ -405,13 +402,15 @@ class Crop(wx.Dialog):
     def make_frame_from_file(self, event):
         """
         This method is responsible for making available a
-        new frame from a given time position of a video file,
-        converting it into a bitmap object and displaying it
-        by the `bob` actor. Note, milliseconds must not be
-        greater than the max time nor less than the min time
-        (see the `seek` callback above)
-        """
-        logfile = make_log_template('generic_task.log', Crop.LOGDIR, mode="w")
+        new frame from a given time position of a video file.
+        The frame is grabbed in background by the shared
+        `FrameGrabber` and read from pipe already scaled to
+        the preview size, see `on_frame`. Note, milliseconds must
+        not be greater than the max time nor less than the min
+        time (see the `seek` callback above)
+        """
+        self.logfile = make_log_template('generic_task.log', Crop.LOGDIR,
+                                         mode="w")
         if not self.mills:
             sseg = ''
         else:
@@ -419,20 +418,28 @@ class Crop(wx.Dialog):
             self.clock = integer_to_time(seek, False)  # to 24-HH
             sseg = f'-ss {self.clock}'
 
-        arg = (f'{sseg} -i "{self.filename}" -f image2 '
-               f'-update 1 -frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Crop', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
+        arg = (f'{sseg} -i "{self.filename}" -frames:v 1 '
+               f'-vf scale={self.w_scaled}:{self.h_scaled}')
+        self.btn_load.Disable()
+        self.grabber.request(self, arg, None, self.on_frame,
+                             self.logfile, source=self.filename)
+    # ------------------------------------------------------------------#
+
+    def on_frame(self, error, data):
+        """
+        Callback of the `FrameGrabber`, converts the new
+        frame data into a bitmap object and displays it
+        by the `bob` actor.
+        """
         if error:
             show_msg_notify(self.GetParent(),
-                            logname=os.path.basename(logfile))
+                            logname=os.path.basename(self.logfile))
+            self.btn_load.Enable()
             return
-        if sseg:
+        if self.mills:
             with open(self.fileclock, "w", encoding='utf-8') as atime:
                 atime.write(self.clock)
-        self.btn_load.Disable()
-        bmp = make_bitmap(self.w_scaled, self.h_scaled, self.frame)
+        bmp = make_bitmap(self.w_scaled, self.h_scaled, data)
         self.bob.setbitmap(bmp)
     # ------------------------------------------------------------------#
 
@@ -548,6 +555,7 @@ class Crop(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -555,6 +563,7 @@ class Crop(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
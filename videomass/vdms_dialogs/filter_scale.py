@@ -25,12 +25,12 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-import time
 import webbrowser
+from functools import partial
 import wx
 from videomass.vdms_io import io_tools
 from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_grabber import frame_grabber
 from videomass.vdms_io.io_tools import show_msg_notify
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
@@ -69,6 +69,8 @@ class Scale(wx.Dialog):
         name = os.path.splitext(os.path.basename(self.filename))[0]
         self.frame = os.path.join(f'{Scale.TMPSRC}', f'{name}.png')  # image
         self.mills = time_to_integer(kwa['duration'].split('.')[0])
+        self.logfile = None
+        self.grabber = frame_grabber(Scale.appdata, wx.CallAfter)
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
         sizerBase = wx.BoxSizer(wx.VERTICAL)
@@ -283,10 +285,7 @@ class Scale(wx.Dialog):
 
         scaledata = {"scale": args[0], "sedar": args[1], "setsar": args[2]}
         concat = self.concat_filter(scaledata)
-        error = self.process(concat)
-        if error:
-            wx.MessageBox(f'{error}', _('Videomass - Error!'),
-                          wx.ICON_ERROR, self)
+        self.process(concat)
 
     def keep_aspect_ratio_on(self):
         """
@@ -335,16 +334,18 @@ class Scale(wx.Dialog):
         concat = ''.join([f'{x},' for x in orderf if x])[:-1]
         return concat
 
-    def process(self, concat):
+    def process(self, concat, view=False):
         """
         Generate a new frame at the clock position using the scale
         filter. Note that the trim start point on this process is
         set to the total length of the movie divided by two.
+        The frame is grabbed in background by the shared
+        `FrameGrabber` and opened if `view` is True.
         """
-        logfile = make_log_template('generic_task.log',
-                                    Scale.LOGDIR,
-                                    mode="w",
-                                    )
+        self.logfile = make_log_template('generic_task.log',
+                                         Scale.LOGDIR,
+                                         mode="w",
+                                         )
         if not self.mills:
             sseg = ''
         else:
@@ -352,14 +353,23 @@ class Scale(wx.Dialog):
             sseg = f'-ss {stime}'
         scale = '' if not concat else f'-vf "{concat}"'
         arg = (f'{sseg} -i "{self.filename}" -f image2 -update 1 '
-               f'-frames:v 1 {scale} "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Scale', logfile)
-        error = thread.status
+               f'-frames:v 1 {scale}')
+        self.grabber.request(self, arg, self.frame,
+                             partial(self.on_frame, view), self.logfile,
+                             source=self.filename)
+    # ------------------------------------------------------------------#
+
+    def on_frame(self, view, error, frame):
+        """
+        Callback of the `FrameGrabber`, open the new frame
+        with default OS image viewer if `view` is True.
+        """
         if error:
             show_msg_notify(self.GetParent(),
-                            logname=os.path.basename(logfile))
-            return error
-        return None
+                            logname=os.path.basename(self.logfile))
+            return
+        if view and os.path.exists(frame) and os.path.isfile(frame):
+            io_tools.openpath(frame)
     # ----------------------Event handler (callback)---------------------#
 
     def on_readme(self, event):
@@ -392,13 +402,7 @@ class Scale(wx.Dialog):
         Open the image file (frame) with default OS image viewer.
         """
         concat = self.concat_filter(self.getvalue())
-        error = self.process(concat)
-        if error:
-            return
-
-        if os.path.exists(self.frame) and os.path.isfile(self.frame):
-            time.sleep(0.5)  # to ensure correct size in default image viewer
-            io_tools.openpath(self.frame)
+        self.process(concat, view=True)
     # ------------------------------------------------------------------#
 
     def on_constrain(self, event):
@@ -472,6 +476,7 @@ class Scale(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -479,6 +484,7 @@ class Scale(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -36,6 +36,7 @@ from videomass.vdms_threads.generic_task import FFmpegGenericTask
 from videomass.vdms_io.io_tools import show_msg_notify
 from videomass.vdms_dialogs.widget_utils import PopupDialog
 from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.data_cache import frame_cache, frame_key
 
 
 class VidstabSet(wx.Dialog):
@@ -458,9 +459,25 @@ class VidstabSet(wx.Dialog):
             self.btn_snap.Enable()
     # ------------------------------------------------------------------#
 
+    def clip_key(self, args):
+        """
+        Returns the preview frames cache and the key of
+        the clip made by `args` at the current time position
+        and duration, (None, None) if the cache is disabled.
+        """
+        cache = frame_cache(VidstabSet.appdata)
+        if not cache:
+            return None, None
+        key = frame_key(self.filename, f'{self.sld_time.GetValue()} '
+                        f'{self.spin_dur.GetValue()} {args}')
+        return (cache, key) if key else (None, None)
+    # ------------------------------------------------------------------#
+
     def on_load_at_time(self, event):
         """
-        Reloads processes at a given time clock point
+        Reloads processes at a given time clock point.
+        Clips already made with the same settings are
+        read from the preview frames cache.
         """
         data = self.getvalue()
         detect = f'-vf {data[0]}'
@@ -469,26 +486,34 @@ class VidstabSet(wx.Dialog):
                                          VidstabSet.LOGDIR,
                                          mode="w",
                                          )
-        error = self.process(self.filename, args=detect, mode='detect')
-        if error:
-            return
-
-        error = self.process(self.filename,
-                             self.framesrc,
-                             args=trasform,
-                             mode='trasform',
-                             )
-        if error:
-            return
+        cache, key = self.clip_key(f'{detect} {trasform}')
+        if not (key and cache.restore(key, self.framesrc)):
+            error = self.process(self.filename, args=detect, mode='detect')
+            if error:
+                return
 
-        if self.ckbx_duo.IsChecked():
             error = self.process(self.filename,
-                                 self.frameduo,
-                                 args='',
-                                 mode='makeduo',
+                                 self.framesrc,
+                                 args=trasform,
+                                 mode='trasform',
                                  )
             if error:
                 return
+            if key:
+                cache.store(key, self.framesrc)
+
+        if self.ckbx_duo.IsChecked():
+            cache, key = self.clip_key(f'{detect} {trasform} hstack')
+            if not (key and cache.restore(key, self.frameduo)):
+                error = self.process(self.filename,
+                                     self.frameduo,
+                                     args='',
+                                     mode='makeduo',
+                                     )
+                if error:
+                    return
+                if key:
+                    cache.store(key, self.frameduo)
             io_tools.openpath(self.frameduo)
             return
 
@@ -25,10 +25,11 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
+import io
 import webbrowser
 from math import pi as pigreco
 import wx
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.frame_grabber import frame_grabber
 from videomass.vdms_io.io_tools import show_msg_notify
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
@@ -43,9 +44,6 @@ class Transpose(wx.Dialog):
     get = wx.GetApp()
     appdata = get.appset
     LOGDIR = appdata['logdir']
-    TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Transpose')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
     BACKGROUND = '#1b0413'
 
     def __init__(self, parent, *args, **kwa):
@@ -68,11 +66,11 @@ class Transpose(wx.Dialog):
         self.center = (int((self.w_ratio / 2)), int((self.h_ratio / 2)))
         self.transpose = {'degrees': ['', 0]}
         self.video = kwa['filename']
-        name = os.path.splitext(os.path.basename(self.video))[0]
-        self.frame = os.path.join(Transpose.TMPSRC, f'{name}.png')
         self.stbitmap = None
         self.bmp = None
         self.mills = time_to_integer(kwa['duration'].split('.')[0])
+        self.logfile = None
+        self.grabber = frame_grabber(Transpose.appdata, wx.CallAfter)
 
         wx.Dialog.__init__(self, parent, -1, style=wx.DEFAULT_DIALOG_STYLE)
         self.panelimg = wx.Panel(self, wx.ID_ANY, size=(270, 270),)
@@ -131,7 +129,7 @@ class Transpose(wx.Dialog):
         sizerBase.Fit(self)
         self.Layout()
 
-        self.image_loader()
+        self.process()
         if args[0]:  # transpose
             self.statictxt.SetLabel(args[1])
 
@@ -161,44 +159,43 @@ class Transpose(wx.Dialog):
         """
         Generate a new frame. Note that the trim start point
         on this process is set to the total length of the
-        movie divided by two.
+        movie divided by two. The frame is grabbed in background
+        by the shared `FrameGrabber` and read from pipe already
+        scaled to the preview size, see `image_loader`.
         """
-        logfile = make_log_template('generic_task.log',
-                                    Transpose.LOGDIR,
-                                    mode="w",
-                                    )
+        self.logfile = make_log_template('generic_task.log',
+                                         Transpose.LOGDIR,
+                                         mode="w",
+                                         )
         if not self.mills:
             sseg = ''
         else:
             stime = integer_to_time(int(self.mills / 2), False)
             sseg = f'-ss {stime}'
-        arg = (f'{sseg} -i "{self.video}" -f image2 '
-               f'-update 1 -frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Transpose', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
-        if error:
-            show_msg_notify(self.GetParent(),
-                            logname=os.path.basename(logfile))
-            return error
-        return None
+        arg = (f'{sseg} -i "{self.video}" -frames:v 1 '
+               f'-vf scale={self.w_ratio}:{self.h_ratio}')
+        self.grabber.request(self, arg, None, self.image_loader,
+                             self.logfile, source=self.video)
     # ------------------------------------------------------------------------#
 
-    def image_loader(self):
+    def image_loader(self, error, data):
         """
-        Loads initial StaticBitmap on panel
+        Loads initial StaticBitmap on panel, this is the
+        callback of the `FrameGrabber`.
         """
-        error = self.process()
         if error:
+            show_msg_notify(self.GetParent(),
+                            logname=os.path.basename(self.logfile))
             return
 
-        bitmap = wx.Bitmap(self.frame)
-        img = bitmap.ConvertToImage()
-        img = img.Scale(self.w_ratio, self.h_ratio, wx.IMAGE_QUALITY_NORMAL)
+        img = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_PNG)
+        if (img.GetWidth(), img.GetHeight()) != (self.w_ratio, self.h_ratio):
+            img = img.Scale(self.w_ratio, self.h_ratio,
+                            wx.IMAGE_QUALITY_NORMAL)
         self.bmp = img.ConvertToBitmap()
         self.stbitmap = wx.StaticBitmap(self.panelimg, wx.ID_ANY, self.bmp)
         self.panelimg.Layout()
-        self.on_reset(self)  # make default position
+        self.rotate90(0)  # current position
     # ------------------------------------------------------------------#
 
     def rotate90(self, degrees):
@@ -207,6 +204,8 @@ class Transpose(wx.Dialog):
         """
         self.current_angle += degrees
         # neg. value rot. clockwise:
+        if not self.bmp:  # frame not loaded yet
+            return
         val = float(self.current_angle * -pigreco / 180)
         image = self.bmp.ConvertToImage()
         image = image.Scale(self.w_ratio, self.h_ratio,
@@ -321,6 +320,7 @@ class Transpose(wx.Dialog):
         """
         Close this dialog without saving anything
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
@@ -328,6 +328,7 @@ class Transpose(wx.Dialog):
         """
         Don't use self.Destroy() in this dialog
         """
+        self.grabber.cancel(self)
         event.Skip()
     # ------------------------------------------------------------------#
 
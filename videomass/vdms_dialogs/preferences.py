@@ -28,7 +28,8 @@ import os
 import sys
 import webbrowser
 import wx
-from videomass.vdms_utils.utils import detect_binaries
+from videomass.vdms_utils.utils import detect_binaries, format_bytes
+from videomass.vdms_io.data_cache import metadata_cache
 from videomass.vdms_io import io_tools
 from videomass.vdms_sys.settings_manager import ConfigManager
 from videomass.vdms_sys.app_const import supLang
@@ -390,6 +391,139 @@ class SetUp(wx.Dialog):
         tabSix.SetSizer(sizerLog)
         notebook.AddPage(tabSix, _("FFmpeg logging levels"))
 
+        # -----tab 7
+        tabSeven = wx.Panel(notebook, wx.ID_ANY)
+        sizerperf = wx.BoxSizer(wx.VERTICAL)
+        sizerperf.Add((0, 10))
+        msg = _("Parallel processing")
+        labperf = wx.StaticText(tabSeven, wx.ID_ANY, msg)
+        sizerperf.Add(labperf, 0, wx.ALL | wx.EXPAND, 5)
+        msg = (_("Number of files to encode at the same time during batch "
+                 "and queue processing.\nMany encoders are already "
+                 "multi-threaded: values greater than 1 are useful on "
+                 "multi-core machines, with many short files or with\n"
+                 "encoders that do not use all the available cores. "
+                 "Set to 1 to encode one file at a time."))
+        labperfdescr = wx.StaticText(tabSeven, wx.ID_ANY, (msg))
+        sizerperf.Add(labperfdescr, 0, wx.ALL, 5)
+        sizerjobs = wx.BoxSizer(wx.HORIZONTAL)
+        labjobs = wx.StaticText(tabSeven, wx.ID_ANY,
+                                _('Maximum parallel jobs:'))
+        sizerjobs.Add(labjobs, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_jobs = wx.SpinCtrl(tabSeven, wx.ID_ANY,
+                                     min=1, max=max(os.cpu_count() or 1, 1),
+                                     initial=self.appdata['max_parallel_jobs'],
+                                     size=(-1, -1),
+                                     )
+        sizerjobs.Add(self.spin_jobs, 0, wx.ALL, 5)
+        sizerperf.Add(sizerjobs, 0, wx.LEFT, 5)
+        sizerperf.Add((0, 10))
+        msg = _("Number of files to analyze at the same time when "
+                "importing files and when\ndetecting the audio volume "
+                "levels.")
+        labprobedescr = wx.StaticText(tabSeven, wx.ID_ANY, (msg))
+        sizerperf.Add(labprobedescr, 0, wx.ALL, 5)
+        sizerprobe = wx.BoxSizer(wx.HORIZONTAL)
+        labprobe = wx.StaticText(tabSeven, wx.ID_ANY,
+                                 _('Maximum concurrent file analyses:'))
+        sizerprobe.Add(labprobe, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_probe = wx.SpinCtrl(tabSeven, wx.ID_ANY, min=1, max=32,
+                                      initial=self.appdata[
+                                          'max_probe_workers'],
+                                      size=(-1, -1),
+                                      )
+        sizerprobe.Add(self.spin_probe, 0, wx.ALL, 5)
+        sizerperf.Add(sizerprobe, 0, wx.LEFT, 5)
+        sizeranalysis = wx.BoxSizer(wx.HORIZONTAL)
+        labanalysis = wx.StaticText(tabSeven, wx.ID_ANY,
+                                    _('Maximum concurrent audio volume '
+                                      'analyses:'))
+        sizeranalysis.Add(labanalysis, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_analysis = wx.SpinCtrl(tabSeven, wx.ID_ANY, min=1,
+                                         max=max(os.cpu_count() or 1, 1),
+                                         initial=self.appdata[
+                                             'max_analysis_workers'],
+                                         size=(-1, -1),
+                                         )
+        sizeranalysis.Add(self.spin_analysis, 0, wx.ALL, 5)
+        sizerperf.Add(sizeranalysis, 0, wx.LEFT, 5)
+        sizerimages = wx.BoxSizer(wx.HORIZONTAL)
+        labimages = wx.StaticText(tabSeven, wx.ID_ANY,
+                                  _('Maximum concurrent image processes '
+                                    '(slideshows, keyframe seeking):'))
+        sizerimages.Add(labimages, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_images = wx.SpinCtrl(tabSeven, wx.ID_ANY, min=1,
+                                       max=max(os.cpu_count() or 1, 1),
+                                       initial=self.appdata[
+                                           'max_image_workers'],
+                                       size=(-1, -1),
+                                       )
+        sizerimages.Add(self.spin_images, 0, wx.ALL, 5)
+        sizerperf.Add(sizerimages, 0, wx.LEFT, 5)
+        sizerperf.Add((0, 10))
+        msg = _("Media properties, audio measurements and filter preview "
+                "frames already read are kept in\ncaches, so that files not "
+                "changed since the last time are not analyzed or decoded\n"
+                "again. Set a size to 0 to disable its cache.")
+        labcachedescr = wx.StaticText(tabSeven, wx.ID_ANY, (msg))
+        sizerperf.Add(labcachedescr, 0, wx.ALL, 5)
+        sizermetacache = wx.BoxSizer(wx.HORIZONTAL)
+        labmetacache = wx.StaticText(tabSeven, wx.ID_ANY,
+                                     _('Cache size (MiB):'))
+        sizermetacache.Add(labmetacache, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_metacache = wx.SpinCtrl(tabSeven, wx.ID_ANY,
+                                          min=0, max=4096,
+                                          initial=self.appdata[
+                                              'metadata_cache_size'],
+                                          size=(-1, -1),
+                                          )
+        sizermetacache.Add(self.spin_metacache, 0, wx.ALL, 5)
+        self.btn_metacache = wx.Button(tabSeven, wx.ID_CLEAR, "")
+        sizermetacache.Add(self.btn_metacache, 0, wx.ALL, 5)
+        sizerperf.Add(sizermetacache, 0, wx.LEFT, 5)
+        self.lab_cachestats = wx.StaticText(tabSeven, wx.ID_ANY, "")
+        sizerperf.Add(self.lab_cachestats, 0, wx.ALL, 5)
+        sizerframecache = wx.BoxSizer(wx.HORIZONTAL)
+        labframecache = wx.StaticText(tabSeven, wx.ID_ANY,
+                                      _('Filter preview frames cache size '
+                                        '(MiB):'))
+        sizerframecache.Add(labframecache, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_framecache = wx.SpinCtrl(tabSeven, wx.ID_ANY,
+                                           min=0, max=4096,
+                                           initial=self.appdata[
+                                               'frame_cache_size'],
+                                           size=(-1, -1),
+                                           )
+        sizerframecache.Add(self.spin_framecache, 0, wx.ALL, 5)
+        sizerperf.Add(sizerframecache, 0, wx.LEFT, 5)
+        sizerperf.Add((0, 10))
+        msg = _("Read the encoding progress through a dedicated pipe "
+                "(-progress pipe:1 -nostats)")
+        self.ckbx_progpipe = wx.CheckBox(tabSeven, wx.ID_ANY, (msg))
+        self.ckbx_progpipe.SetValue(self.appdata['ffmpeg_progress_pipe'])
+        sizerperf.Add(self.ckbx_progpipe, 0, wx.ALL, 5)
+        sizerperf.Add((0, 10))
+        msg = (_("AV1 (libaom) and VP9 encodings of a single file can be "
+                 "split at keyframes into segments\nencoded at the same "
+                 "time, then joined without re-encoding. Only used when "
+                 "one file\nat a time is encoded. Set to 0 to disable."))
+        labchunkdescr = wx.StaticText(tabSeven, wx.ID_ANY, (msg))
+        sizerperf.Add(labchunkdescr, 0, wx.ALL, 5)
+        sizerchunk = wx.BoxSizer(wx.HORIZONTAL)
+        labchunk = wx.StaticText(tabSeven, wx.ID_ANY,
+                                 _('Segments encoded at the same time:'))
+        sizerchunk.Add(labchunk, 0, wx.LEFT | wx.TOP, 5)
+        self.spin_chunks = wx.SpinCtrl(tabSeven, wx.ID_ANY,
+                                       min=0, max=max(os.cpu_count() or 1, 1),
+                                       initial=self.appdata[
+                                           'chunked_encoding'],
+                                       size=(-1, -1),
+                                       )
+        sizerchunk.Add(self.spin_chunks, 0, wx.ALL, 5)
+        sizerperf.Add(sizerchunk, 0, wx.LEFT, 5)
+        tabSeven.SetSizer(sizerperf)
+        notebook.AddPage(tabSeven, _("Performance"))
+
         # ----- confirm buttons section
         grdBtn = wx.GridSizer(1, 2, 0, 0)
         grdhelp = wx.GridSizer(1, 1, 0, 0)
@@ -419,6 +553,10 @@ class SetUp(wx.Dialog):
             labrem.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labenctitle.SetFont(wx.Font(13, wx.SWISS, wx.NORMAL, wx.BOLD))
             labencgen.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labperf.SetFont(wx.Font(13, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labperfdescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labprobedescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labcachedescr.SetFont(wx.Font(11, wx.SWISS, wx.NORMAL, wx.NORMAL))
         else:
             lablang.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labdirtitle.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
@@ -433,6 +571,10 @@ class SetUp(wx.Dialog):
             labrem.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
             labenctitle.SetFont(wx.Font(10, wx.SWISS, wx.NORMAL, wx.BOLD))
             labencgen.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labperf.SetFont(wx.Font(10, wx.DEFAULT, wx.NORMAL, wx.BOLD))
+            labperfdescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labprobedescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
+            labcachedescr.SetFont(wx.Font(8, wx.SWISS, wx.NORMAL, wx.NORMAL))
 
         tip = (_("By assigning an additional suffix you could avoid "
                  "overwriting files"))
@@ -475,6 +617,18 @@ class SetUp(wx.Dialog):
         self.Bind(wx.EVT_CHECKBOX, self.clear_Cache, self.ckbx_cacheclr)
         self.Bind(wx.EVT_CHECKBOX, self.clear_logs, self.ckbx_logclr)
         self.Bind(wx.EVT_TEXT, self.on_char_encoding, self.txtctrl_charenc)
+        self.Bind(wx.EVT_SPINCTRL, self.on_parallel_jobs, self.spin_jobs)
+        self.Bind(wx.EVT_SPINCTRL, self.on_probe_workers, self.spin_probe)
+        self.Bind(wx.EVT_SPINCTRL, self.on_analysis_workers,
+                  self.spin_analysis)
+        self.Bind(wx.EVT_SPINCTRL, self.on_image_workers, self.spin_images)
+        self.Bind(wx.EVT_SPINCTRL, self.on_metadata_cache,
+                  self.spin_metacache)
+        self.Bind(wx.EVT_BUTTON, self.on_clear_metadata_cache,
+                  self.btn_metacache)
+        self.Bind(wx.EVT_SPINCTRL, self.on_frame_cache, self.spin_framecache)
+        self.Bind(wx.EVT_CHECKBOX, self.on_progress_pipe, self.ckbx_progpipe)
+        self.Bind(wx.EVT_SPINCTRL, self.on_chunked_encoding, self.spin_chunks)
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_BUTTON, self.on_cancel, btn_cancel)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btn_ok)
@@ -482,6 +636,7 @@ class SetUp(wx.Dialog):
 
         self.general_current_settings()
         self.ffmpeg_current_settings()
+        self.metadata_cache_stats()
 
     def general_current_settings(self):
         """
@@ -897,6 +1052,93 @@ class SetUp(wx.Dialog):
         self.settings['encoding'] = self.txtctrl_charenc.GetValue().strip()
     # --------------------------------------------------------------------#
 
+    def on_parallel_jobs(self, event):
+        """
+        Set the maximum number of FFmpeg jobs running at the same time
+        """
+        self.settings['max_parallel_jobs'] = self.spin_jobs.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_probe_workers(self, event):
+        """
+        Set the maximum number of ffprobe processes when importing files
+        """
+        self.settings['max_probe_workers'] = self.spin_probe.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_analysis_workers(self, event):
+        """
+        Set the maximum number of FFmpeg processes
+        when analyzing the audio volume of files
+        """
+        self.settings['max_analysis_workers'] = self.spin_analysis.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_image_workers(self, event):
+        """
+        Set the maximum number of FFmpeg processes
+        when preparing the images of a slideshow or
+        seeking the thumbnails of a movie
+        """
+        self.settings['max_image_workers'] = self.spin_images.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_metadata_cache(self, event):
+        """
+        Set the maximum size of the media properties cache
+        """
+        self.settings['metadata_cache_size'] = self.spin_metacache.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_frame_cache(self, event):
+        """
+        Set the maximum size of the filter preview frames cache
+        """
+        self.settings['frame_cache_size'] = self.spin_framecache.GetValue()
+    # --------------------------------------------------------------------#
+
+    def metadata_cache_stats(self):
+        """
+        Show the current usage of the media properties cache
+        """
+        cache = metadata_cache(self.appdata)
+        if cache is None:
+            self.lab_cachestats.SetLabel(_('The cache is disabled'))
+            self.btn_metacache.Disable()
+            return
+        stats = cache.stats()
+        self.lab_cachestats.SetLabel(
+            _('Entries: {0}   Size: {1}   Hits: {2}   Misses: {3}').format(
+                stats['entries'], format_bytes(stats['size']),
+                stats['hits'], stats['misses']))
+    # --------------------------------------------------------------------#
+
+    def on_clear_metadata_cache(self, event):
+        """
+        Remove all the entries of the media properties cache
+        """
+        cache = metadata_cache(self.appdata)
+        if cache is not None:
+            cache.clear()
+        self.metadata_cache_stats()
+    # --------------------------------------------------------------------#
+
+    def on_progress_pipe(self, event):
+        """
+        Enable or disable reading the FFmpeg progress from
+        the standard output.
+        """
+        self.settings['ffmpeg_progress_pipe'] = self.ckbx_progpipe.GetValue()
+    # --------------------------------------------------------------------#
+
+    def on_chunked_encoding(self, event):
+        """
+        Set the number of segments encoded at the same time
+        by chunked encodings, 0 disables them.
+        """
+        self.settings['chunked_encoding'] = self.spin_chunks.GetValue()
+    # --------------------------------------------------------------------#
+
     def on_help(self, event):
         """
         Open default web browser via Python Web-browser controller.
@@ -30,6 +30,7 @@ import wx.lib.scrolledpanel as scrolled
 from videomass.vdms_utils.queue_utils import load_json_file_queue
 from videomass.vdms_utils.queue_utils import write_json_file_queue
 from videomass.vdms_utils.queue_utils import extend_data_queue
+from videomass.vdms_utils.queue_utils import queue_state
 from videomass.vdms_dialogs.queue_edit import Edit_Queue_Item
 
 
@@ -55,6 +56,8 @@ class QueueManager(wx.Dialog):
         self.movetotrash = movetotrash
         self.emptylist = emptylist
         self.delqueuefile = removequeue
+        self.resume = False
+        self.state = queue_state()
         self.parent = parent
         wx.Dialog.__init__(self, parent, -1,
                            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
@@ -82,12 +85,8 @@ class QueueManager(wx.Dialog):
                                    | wx.LC_SINGLE_SEL
                                    )
         # self.quelist.SetMinSize((400, 500))
-        self.quelist.InsertColumn(0, _('Destination file name'), width=700)
-        index = 0
-        for items in self.datalist:  # populate listctrl:
-            desttitle = os.path.basename(items['destination'])
-            self.quelist.InsertItem(index, desttitle)
-            index += 1
+        self.quelist.InsertColumn(0, _('Destination file name'), width=560)
+        self.quelist.InsertColumn(1, _('State'), width=140)
 
         sizervert = wx.BoxSizer(wx.VERTICAL)
         sizerbase.Add(sizervert, 1, wx.EXPAND)
@@ -139,9 +138,11 @@ class QueueManager(wx.Dialog):
         self.ckbx_queue.SetValue(self.delqueuefile)
         sizeropt.Add(self.ckbx_queue, 0, wx.ALL, 5)
         btncancel = wx.Button(self, wx.ID_CANCEL, "")
+        self.btn_resume = wx.Button(self, wx.ID_ANY, _("Resume"))
         btnok = wx.Button(self, wx.ID_OK, _("Run"))
-        btngrid = wx.FlexGridSizer(1, 2, 0, 0)
+        btngrid = wx.FlexGridSizer(1, 3, 0, 0)
         btngrid.Add(btncancel, 0)
+        btngrid.Add(self.btn_resume, 0, wx.LEFT, 5)
         btngrid.Add(btnok, 0, wx.LEFT, 5)
         sizervert.Add(btngrid, flag=wx.ALL
                       | wx.ALIGN_RIGHT
@@ -150,6 +151,10 @@ class QueueManager(wx.Dialog):
         # ----------------------Properties----------------------#
         self.SetTitle(_('Videomass - Queue'))
         self.SetMinSize((820, 550))
+        self.btn_resume.SetToolTip(_('Run only the items not yet completed, '
+                                     'skipping those whose output files '
+                                     'are unchanged since completion.'))
+        self.populate_list()
 
         self.SetSizer(sizerbase)
         sizerbase.Fit(self)
@@ -167,6 +172,7 @@ class QueueManager(wx.Dialog):
         self.Bind(wx.EVT_BUTTON, self.on_save_queue, self.btn_expqueue)
         self.Bind(wx.EVT_BUTTON, self.on_load_queue, self.btn_impqueue)
         self.Bind(wx.EVT_BUTTON, self.on_cancel, btncancel)
+        self.Bind(wx.EVT_BUTTON, self.on_resume, self.btn_resume)
         self.Bind(wx.EVT_BUTTON, self.on_ok, btnok)
 
         if self.datalist:
@@ -174,6 +180,30 @@ class QueueManager(wx.Dialog):
             self.quelist.Select(0, on=1)  # default event selection
     # ------------------------- Callbacks --------------------------------
 
+    def populate_list(self):
+        """
+        Fill the list control with the destination file names
+        and the processing state of the queue items.
+        """
+        labels = {'pending': _('Pending'),
+                  'running': _('Interrupted'),
+                  'done': _('Outdated'),
+                  'failed': _('Failed'),
+                  }
+        self.quelist.DeleteAllItems()
+        completed = 0
+        for index, item in enumerate(self.datalist):
+            desttitle = os.path.basename(item['destination'])
+            self.quelist.InsertItem(index, desttitle)
+            if self.state.is_complete(item):
+                completed += 1
+                self.quelist.SetItem(index, 1, _('Done'))
+            else:
+                self.quelist.SetItem(index, 1,
+                                     labels[self.state.get(item)])
+        self.btn_resume.Enable(0 < completed < len(self.datalist))
+    # ----------------------------------------------------------------------
+
     def on_edit_item(self, event):
         """
         This allow to edit a selected item
@@ -203,13 +233,7 @@ class QueueManager(wx.Dialog):
         if not update:
             return
 
-        self.quelist.DeleteAllItems()
-        index = 0
-        for item in self.datalist:  # populate listctrl:
-            desttitle = os.path.basename(item['destination'])
-            self.quelist.InsertItem(index, desttitle)
-            index += 1
-
+        self.populate_list()
         write_json_file_queue(self.datalist)
 
         if not selidx == -1:
@@ -281,6 +305,8 @@ class QueueManager(wx.Dialog):
         self.on_deselect(None)
         queuebak = os.path.join(self.appdata["confdir"], 'queue.backup')
         os.remove(queuebak)
+        self.state.clear()
+        self.btn_resume.Disable()
         self.parent.queue_tool_counter()
     # ----------------------------------------------------------------------
 
@@ -366,6 +392,14 @@ class QueueManager(wx.Dialog):
         event.Skip()
     # ----------------------------------------------------------------------
 
+    def on_resume(self, event):
+        """
+        Confirm to process the items not yet completed only.
+        """
+        self.resume = True
+        self.EndModal(wx.ID_OK)
+    # ----------------------------------------------------------------------
+
     def on_ok(self, event):
         """
         get confirmation to proceed
@@ -380,4 +414,4 @@ class QueueManager(wx.Dialog):
         from the caller. See the caller for more info and usage.
         """
         return (self.datalist, self.movetotrash,
-                self.emptylist, self.delqueuefile)
+                self.emptylist, self.delqueuefile, self.resume)
@@ -53,9 +53,11 @@ class AudioVolNormal(wx.Dialog):
         BLUE = 'LIGHT STEEL BLUE'
         FOREGRD = 'BLACK'
 
-    def __init__(self, title, data, OS):
+    def __init__(self, title, data, OS, bounds=None):
         """
         data contains volume list per-track.
+        bounds contains the error bound in dB per-track of the
+        estimated volumes, None for full measurements.
         """
         get = wx.GetApp()  # get data from bootstrap
         vidicon = get.iconset['videomass']
@@ -85,6 +87,8 @@ class AudioVolNormal(wx.Dialog):
         normlist.InsertColumn(2, _('Mean volume dBFS'), width=150)
         normlist.InsertColumn(3, _('Offset dBFS'), width=100)
         normlist.InsertColumn(4, _('Result dBFS'), width=120)
+        if bounds and any(bnd is not None for bnd in bounds):
+            normlist.InsertColumn(5, _('Estimate'), width=120)
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.Add(normlist, 1, wx.EXPAND | wx.ALL, 5)
         descript = wx.StaticText(self.panel,
@@ -207,6 +211,11 @@ class AudioVolNormal(wx.Dialog):
                 else:
                     normlist.SetItem(index, 4, items[4])
                 index += 1
+
+        if normlist.GetColumnCount() > 5:
+            for index, bnd in enumerate(bounds):
+                if bnd is not None:
+                    normlist.SetItem(index, 5, f'±{bnd} dB')
     # --------------------------------------------------------------#
 
     def on_red(self, event):
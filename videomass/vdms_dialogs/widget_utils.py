@@ -77,6 +77,8 @@ class PopupDialog(wx.Dialog):
         If your thread has the `stop` method you can pass a running
         `thread` as default arg to interface with the auto-displayed
         Stop button (See `VolumeDetectThread` class as example model).
+        The thread can also show its progress under the message
+        by the "POPUP_PROGRESS_EVT" pubsub protocol.
 
     Usage:
             loadDlg = PopupDialog(parent, caption, message, thread)
@@ -102,8 +104,10 @@ class PopupDialog(wx.Dialog):
             ai.Start()
             boxh.Add(ai, 0, wx.LEFT | wx.ALIGN_CENTER_VERTICAL | wx.ALL, 10)
         # Add the message
-        message = wx.StaticText(self, -1, msg, style=wx.ALIGN_CENTRE_VERTICAL)
-        boxh.Add(message, 0, wx.EXPAND | wx.ALL, 10)
+        self.msg = msg
+        self.message = wx.StaticText(self, -1, msg,
+                                     style=wx.ALIGN_CENTRE_VERTICAL)
+        boxh.Add(self.message, 0, wx.EXPAND | wx.ALL, 10)
         boxv.Add(boxh, 0, wx.EXPAND)
         # Add an Info graphic
         bitmap = wx.Bitmap(48, 48)
@@ -128,6 +132,17 @@ class PopupDialog(wx.Dialog):
         self.Layout()
 
         pub.subscribe(self.getMessage, "RESULT_EVT")
+        pub.subscribe(self.on_progress, "POPUP_PROGRESS_EVT")
+    # ----------------------------------------------------------#
+
+    def on_progress(self, message):
+        """
+        Show the progress `message` of the thread
+        under the dialog message.
+        """
+        self.message.SetLabel(f'{self.msg}\n{message}')
+        self.Fit()
+        self.Layout()
     # ----------------------------------------------------------#
 
     def on_stop(self, event):
@@ -156,6 +171,7 @@ class PopupDialog(wx.Dialog):
         """
         # self.Destroy() # do not work
         # self.ai.Stop()
+        pub.unsubscribe(self.on_progress, "POPUP_PROGRESS_EVT")
         self.EndModal(1)
 
 
@@ -0,0 +1,408 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: data_cache.py
+Porpose: persistent key/value cache with LRU eviction
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from videomass.vdms_io.make_filelog import tolog
+
+CACHES = {}  # shared DataCache instances by filename
+FRAMECACHES = {}  # shared FrameCache instances by filename
+FAILED = set()  # caches which could not be opened, logged once
+LOCK = threading.Lock()
+
+
+def file_signature(filename):
+    """
+    Returns a list [abspath, size, mtime_ns] which identifies
+    the current state of the given file, `None` if the file
+    does not exist or is not accessible.
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [os.path.abspath(filename), stat.st_size, stat.st_mtime_ns]
+# ------------------------------------------------------------------------
+
+
+def make_key(*args):
+    """
+    Build a cache key string from any JSON serializable args.
+    """
+    return json.dumps(args, ensure_ascii=False, separators=(',', ':'))
+# ------------------------------------------------------------------------
+
+
+def measurement_key(kind, filename, *params):
+    """
+    Build the cache key of a `kind` of measurement (e.g.
+    'volumedetect' or 'loudnorm') of `filename`, where `params`
+    are the audio stream index, the time segment and the filter
+    args measured. Returns `None` if the file does not exist.
+    """
+    signature = file_signature(filename)
+    if not signature:
+        return None
+    return make_key(kind, *signature, *params)
+# ------------------------------------------------------------------------
+
+
+class DataCache:
+    """
+    A persistent key/value store of strings based on SQLite,
+    safe to use from multiple threads. When the total size of
+    the stored values exceeds `maxsize` bytes, the least recently
+    used entries are removed. Hits and misses are counted for
+    the current session.
+
+    Usage:
+        >>> cache = DataCache('/path/to/cache.db', maxsize=1048576)
+        >>> cache.put('key', 'value')
+        >>> cache.get('key')
+        'value'
+        >>> cache.stats()
+        {'hits': 1, 'misses': 0, 'entries': 1, 'size': 5}
+    """
+    def __init__(self, filename, maxsize=64 * 1024 * 1024):
+        """
+        filename: the database pathname, created if not exists.
+        maxsize: maximum size in bytes of all the stored values.
+        """
+        self.filename = filename
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        try:
+            self.conn = self.connect()
+        except sqlite3.OperationalError:  # locked, read-only, no dir
+            raise
+        except sqlite3.DatabaseError:  # corrupted file, start over
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+            self.conn = self.connect()
+        self.total = self.conn.execute('SELECT COALESCE(SUM(size), 0) '
+                                       'FROM entries').fetchone()[0]
+    # ------------------------------------------------------------------
+
+    def connect(self):
+        """
+        Open the database and create the table if needed.
+        """
+        conn = sqlite3.connect(self.filename, check_same_thread=False)
+        conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                     'key TEXT PRIMARY KEY, value TEXT, '
+                     'size INTEGER, atime REAL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS entries_atime '
+                     'ON entries (atime)')
+        conn.commit()
+        return conn
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """
+        Returns the value stored with `key`, `None` otherwise.
+        """
+        with self.lock:
+            try:
+                row = self.conn.execute('SELECT value FROM entries '
+                                        'WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.conn.execute('UPDATE entries SET atime = ? '
+                                  'WHERE key = ?', (time.time(), key))
+                self.conn.commit()
+            except sqlite3.Error:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+    # ------------------------------------------------------------------
+
+    def put(self, key, value):
+        """
+        Store a string or bytes `value` with `key`, evicting the
+        least recently used entries if the size limit is exceeded.
+        Values larger than the limit are not stored.
+        """
+        if isinstance(value, bytes):
+            size = len(value)
+        else:
+            size = len(value.encode('utf-8'))
+        if size > self.maxsize:
+            return
+        with self.lock:
+            try:
+                old = self.conn.execute('SELECT size FROM entries '
+                                        'WHERE key = ?', (key,)).fetchone()
+                self.conn.execute('INSERT OR REPLACE INTO entries '
+                                  'VALUES (?, ?, ?, ?)',
+                                  (key, value, size, time.time()))
+                self.total += size - (old[0] if old else 0)
+                if self.total > self.maxsize:
+                    self.evict()
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+    # ------------------------------------------------------------------
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the total
+        size is within the limit. Called with the lock held.
+        """
+        rows = self.conn.execute('SELECT key, size FROM entries '
+                                 'ORDER BY atime')
+        remove = []
+        for key, size in rows:
+            if self.total <= self.maxsize:
+                break
+            remove.append((key,))
+            self.total -= size
+        self.conn.executemany('DELETE FROM entries WHERE key = ?', remove)
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """
+        Remove all entries and reset the counters.
+        """
+        with self.lock:
+            self.conn.execute('DELETE FROM entries')
+            self.conn.commit()
+            self.total = 0
+            self.hits = self.misses = 0
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        """
+        Returns a dict with the hits and misses of the current
+        session, the number of entries and their total size.
+        """
+        with self.lock:
+            entries = self.conn.execute('SELECT COUNT(*) '
+                                        'FROM entries').fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': entries, 'size': self.total}
+# ------------------------------------------------------------------------
+
+
+def open_cache(filename, maxsize):
+    """
+    Returns the `DataCache` instance shared by all the
+    callers for `filename`, creating it if needed.
+    """
+    with LOCK:
+        cache = CACHES.get(filename)
+        if cache is None:
+            cache = DataCache(filename, maxsize)
+            CACHES[filename] = cache
+        cache.maxsize = maxsize
+        return cache
+# ------------------------------------------------------------------------
+
+
+def app_cache(appdata, dbname, maxsize):
+    """
+    Returns the shared `DataCache` named `dbname` in the
+    application cache directory, `None` if it can not be
+    opened, e.g. on a read-only or locked database. The
+    error is logged once on the `data_cache.log` file.
+    """
+    filename = os.path.join(appdata['cachedir'], dbname)
+    try:
+        return open_cache(filename, maxsize)
+    except (sqlite3.Error, OSError) as err:
+        with LOCK:
+            logged = filename in FAILED
+            FAILED.add(filename)
+        if not logged:
+            tolog(f'[VIDEOMASS]: ERROR: cannot open the cache '
+                  f'"{filename}": {err}',
+                  os.path.join(appdata['logdir'], 'data_cache.log'),
+                  sep=True, wdate=True)
+        return None
+# ------------------------------------------------------------------------
+
+
+def metadata_cache(appdata):
+    """
+    Returns the media metadata cache stored in the application
+    cache directory, `None` if the cache is disabled by setting
+    its size to 0 or can not be opened. Audio measurements are
+    stored here as well, see `measurement_key`.
+    """
+    maxsize = appdata['metadata_cache_size'] * 1024 * 1024  # MiB
+    if not maxsize:
+        return None
+    return app_cache(appdata, 'metadata.db', maxsize)
+# ------------------------------------------------------------------------
+
+
+class FrameCache:
+    """
+    A two levels cache of decoded preview frames (image file
+    data as bytes): the most recently used frames are kept in
+    memory up to `memsize` bytes, all the others are stored
+    on disk by a `DataCache`.
+
+    Usage:
+        >>> cache = FrameCache(DataCache('/path/to/frames.db'))
+        >>> key = frame_key('/path/to/movie.mkv', '-ss 00:01:00 ...')
+        >>> cache.put(key, pngdata)
+        >>> cache.get(key)
+        >>> cache.restore(key, '/tmp/frame.png')  # write it to file
+    """
+    def __init__(self, disk, memsize=16 * 1024 * 1024):
+        """
+        disk: the `DataCache` to store the frames on disk.
+        memsize: maximum size in bytes of the frames in memory.
+        """
+        self.disk = disk
+        self.memsize = memsize
+        self.memory = OrderedDict()
+        self.total = 0
+        self.lock = threading.Lock()
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """
+        Returns the frame data stored with `key`, `None`
+        otherwise.
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+        data = self.disk.get(key)
+        if data is not None:
+            self.remember(key, data)
+        return data
+    # ------------------------------------------------------------------
+
+    def put(self, key, data):
+        """
+        Store the frame `data` (bytes) with `key`.
+        """
+        self.remember(key, data)
+        self.disk.put(key, data)
+    # ------------------------------------------------------------------
+
+    def restore(self, key, filename):
+        """
+        Write the frame stored with `key` to `filename`,
+        returns True on success.
+        """
+        data = self.get(key)
+        if data is None:
+            return False
+        try:
+            with open(filename, 'wb') as fln:
+                fln.write(data)
+        except OSError:
+            return False
+        return True
+    # ------------------------------------------------------------------
+
+    def store(self, key, filename):
+        """
+        Store the content of the file `filename` with `key`.
+        """
+        try:
+            with open(filename, 'rb') as fln:
+                self.put(key, fln.read())
+        except OSError:
+            pass
+    # ------------------------------------------------------------------
+
+    def remember(self, key, data):
+        """
+        Keep `data` in memory, forgetting the least recently
+        used frames if the size limit is exceeded.
+        """
+        if len(data) > self.memsize:
+            return
+        with self.lock:
+            old = self.memory.pop(key, None)
+            self.total -= len(old) if old is not None else 0
+            self.memory[key] = data
+            self.total += len(data)
+            while self.total > self.memsize:
+                self.total -= len(self.memory.popitem(last=False)[1])
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """
+        Remove all the frames, in memory and on disk.
+        """
+        with self.lock:
+            self.memory.clear()
+            self.total = 0
+        self.disk.clear()
+# ------------------------------------------------------------------------
+
+
+def frame_key(filename, args):
+    """
+    Build the cache key of a preview frame of `filename`,
+    where `args` are the FFmpeg args which make the frame
+    (time position, filters and size). Returns `None` if
+    the file does not exist.
+    """
+    signature = file_signature(filename)
+    if not signature:
+        return None
+    return make_key('frame', *signature, ' '.join(args.split()))
+# ------------------------------------------------------------------------
+
+
+def frame_cache(appdata):
+    """
+    Returns the preview frames cache shared by the filter
+    dialogs, `None` if the cache is disabled by setting its
+    size to 0 or can not be opened. A quarter of the size is
+    kept in memory.
+    """
+    maxsize = appdata['frame_cache_size'] * 1024 * 1024  # MiB
+    if not maxsize:
+        return None
+    filename = os.path.join(appdata['cachedir'], 'frames.db')
+    disk = app_cache(appdata, 'frames.db', maxsize)
+    if disk is None:
+        return None
+    with LOCK:
+        cache = FRAMECACHES.get(filename)
+        if cache is None:
+            cache = FrameCache(disk)
+            FRAMECACHES[filename] = cache
+        cache.memsize = maxsize // 4
+        return cache
@@ -0,0 +1,191 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: image_header.py
+Porpose: read the size of images without running ffprobe
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+Importing thousands of images would run one ffprobe process per
+file just to get their size. The functions of this module read
+the width, height and EXIF orientation of JPEG, PNG, BMP and WebP
+images from the file header; other formats are left to ffprobe.
+"""
+import os
+import struct
+
+CODECS = {'jpeg': ('mjpeg', 'Motion JPEG'),
+          'png': ('png', 'PNG (Portable Network Graphics) image'),
+          'bmp': ('bmp', 'BMP (Windows and OS/2 bitmap)'),
+          'webp': ('webp', 'WebP'),
+          }
+ROTATION = {3: 180, 6: -90, 8: 90}  # EXIF orientation > display rotation
+
+
+def exif_orientation(exif):
+    """
+    Returns the orientation tag (1-8) of an EXIF
+    block, 1 (normal) if it is missing.
+    """
+    order = {b'II': '<', b'MM': '>'}.get(exif[:2])
+    if not order:
+        return 1
+    try:
+        ifd = struct.unpack(f'{order}I', exif[4:8])[0]
+        count = struct.unpack(f'{order}H', exif[ifd:ifd + 2])[0]
+        for num in range(count):
+            entry = ifd + 2 + num * 12
+            tag = struct.unpack(f'{order}H', exif[entry:entry + 2])[0]
+            if tag == 0x0112:
+                return struct.unpack(f'{order}H',
+                                     exif[entry + 8:entry + 10])[0]
+    except struct.error:
+        pass
+    return 1
+# ------------------------------------------------------------------------
+
+
+def jpeg_header(fln):
+    """
+    Scan the JPEG markers up to the start of frame,
+    returns a tuple (width, height, orientation).
+    """
+    orientation = 1
+    fln.seek(2)
+    while True:
+        byte = fln.read(1)
+        while byte and byte != b'\xff':
+            byte = fln.read(1)
+        while byte == b'\xff':  # fill bytes
+            byte = fln.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xd9, 0xda):  # end of image or start of scan
+            return None
+        if marker == 0x01 or 0xd0 <= marker <= 0xd7:  # no length
+            continue
+        data = fln.read(2)
+        if len(data) < 2:
+            return None
+        length = struct.unpack('>H', data)[0] - 2
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            data = fln.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>xHH', data)
+            return width, height, orientation
+        data = fln.read(length)
+        if marker == 0xe1 and data.startswith(b'Exif\x00\x00'):
+            orientation = exif_orientation(data[6:])
+# ------------------------------------------------------------------------
+
+
+def read_image_header(filename):
+    """
+    Returns a dict with the 'format', 'width', 'height' and
+    'orientation' of a JPEG, PNG, BMP or WebP image, `None`
+    for other formats or unreadable files.
+    """
+    try:
+        with open(filename, 'rb') as fln:
+            head = fln.read(32)
+            size = None
+            fmt = None
+            if head[:2] == b'\xff\xd8':
+                fmt, size = 'jpeg', jpeg_header(fln)
+            elif head[:8] == b'\x89PNG\r\n\x1a\n':
+                fmt, size = 'png', struct.unpack('>II', head[16:24]) + (1,)
+            elif head[:2] == b'BM' and len(head) >= 26:
+                fmt = 'bmp'
+                if struct.unpack('<I', head[14:18])[0] == 12:  # OS/2
+                    size = struct.unpack('<HH', head[18:22]) + (1,)
+                else:
+                    width, height = struct.unpack('<ii', head[18:26])
+                    size = width, abs(height), 1
+            elif head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                fmt = 'webp'
+                if head[12:16] == b'VP8 ':
+                    width, height = struct.unpack('<HH', head[26:30])
+                    size = width & 0x3fff, height & 0x3fff, 1
+                elif head[12:16] == b'VP8L':
+                    bits = struct.unpack('<I', head[21:25])[0]
+                    size = ((bits & 0x3fff) + 1,
+                            ((bits >> 14) & 0x3fff) + 1, 1)
+                elif head[12:16] == b'VP8X':
+                    size = (int.from_bytes(head[24:27], 'little') + 1,
+                            int.from_bytes(head[27:30], 'little') + 1, 1)
+    except (OSError, struct.error):
+        return None
+
+    if not size or not all(size[:2]):
+        return None
+    return dict(zip(('format', 'width', 'height', 'orientation'),
+                    (fmt,) + tuple(size)))
+# ------------------------------------------------------------------------
+
+
+def pretty_size(size):
+    """
+    Format `size` in bytes as `ffprobe -pretty` does.
+    """
+    if size < 1024:
+        return f'{size} byte'
+    for prefix in ('Ki', 'Mi', 'Gi'):
+        size /= 1024
+        if size < 1024:
+            break
+    return f'{size:f} {prefix}byte'
+# ------------------------------------------------------------------------
+
+
+def image_probe(filename):
+    """
+    Returns a subset of the data given by `ffprobe -show_format
+    -show_streams -pretty` for a single image, built from its
+    header, `None` if the format is not supported here.
+    """
+    header = read_image_header(filename)
+    if not header:
+        return None
+    codec_name, codec_long_name = CODECS[header['format']]
+    stream = {'index': 0,
+              'codec_name': codec_name,
+              'codec_long_name': codec_long_name,
+              'codec_type': 'video',
+              'width': header['width'],
+              'height': header['height'],
+              'coded_width': header['width'],
+              'coded_height': header['height'],
+              }
+    if header['orientation'] in ROTATION:
+        stream['side_data_list'] = [{'side_data_type': 'Display Matrix',
+                                     'rotation': ROTATION[
+                                         header['orientation']]}]
+    return {'streams': [stream],
+            'format': {'filename': filename,
+                       'nb_streams': 1,
+                       'format_name': 'image2',
+                       'format_long_name': 'image2 sequence',
+                       'duration': '0:00:00.040000',
+                       'size': pretty_size(os.path.getsize(filename)),
+                       }
+            }
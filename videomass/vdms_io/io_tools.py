@@ -90,10 +90,12 @@ def show_msg_notify(parent, warnlev: str = 'error', logname: str = 'log',
 # ----------------------------------------------------------------#
 
 
-def volume_detect_process(filelist, timeseq, audiomap, parent=None):
+def volume_detect_process(filelist, timeseq, audiomap, parent=None,
+                          durations=None):
     """
     Run thread to get audio peak level data
-    showing a pop-up message dialog.
+    showing a pop-up message dialog. Pass the `durations`
+    of the files to get a fast estimate of the long ones.
     """
     if timeseq:
         splseq = timeseq.split()
@@ -101,7 +103,7 @@ def volume_detect_process(filelist, timeseq, audiomap, parent=None):
     else:
         tseq = '', ''
 
-    thread = VolumeDetectThread(tseq, filelist, audiomap)
+    thread = VolumeDetectThread(tseq, filelist, audiomap, durations)
     dlgload = PopupDialog(parent,
                           _("Videomass - Loading..."),
                           _("Wait....\nAudio peak analysis."),
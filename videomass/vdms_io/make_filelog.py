@@ -27,12 +27,123 @@ This file is part of Videomass.
 
 import time
 import os
+import atexit
+import threading
+
+
+class LogWriter:
+    """
+    Buffered log writer shared by all the threads of the session.
+    Messages are kept in memory and appended to their log files
+    by a background thread every `interval` seconds, opening each
+    file once per flush instead of once per message. Files are
+    synced to disk every `syncinterval` seconds. If the buffered
+    data exceed `maxbuffer` characters, the writer flushes
+    immediately from the calling thread.
+
+    All pending data are written at interpreter exit; call the
+    `flush` method before reading or truncating a log file.
+
+    Usage:
+        >>> LOGWRITER.write('/path/to/file.log', 'message\n')
+        >>> LOGWRITER.flush()  # write everything now
+    """
+    def __init__(self, interval=0.5, syncinterval=5.0, maxbuffer=1048576):
+        """
+        interval: seconds between each background flush
+        syncinterval: seconds between each fsync of the log files
+        maxbuffer: maximum number of buffered characters
+        """
+        self.interval = interval
+        self.syncinterval = syncinterval
+        self.maxbuffer = maxbuffer
+        self.pending = {}  # {(logfile, txtenc): [str, ...]}
+        self.size = 0  # buffered characters
+        self.lock = threading.Lock()  # protects pending data
+        self.iolock = threading.Lock()  # serializes writes to disk
+        self.thread = None
+        self.lastsync = time.monotonic()
+        atexit.register(self.close)
+    # ------------------------------------------------------------------
+
+    def write(self, logfile, text, txtenc="utf-8"):
+        """
+        Append `text` to `logfile` asynchronously.
+        """
+        with self.lock:
+            self.pending.setdefault((logfile, txtenc), []).append(text)
+            self.size += len(text)
+            overflow = self.size > self.maxbuffer
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        if overflow:
+            self.flush()
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Background flush loop.
+        """
+        while True:
+            time.sleep(self.interval)
+            sync = time.monotonic() - self.lastsync >= self.syncinterval
+            self.flush(sync=sync)
+    # ------------------------------------------------------------------
+
+    def flush(self, logfile=None, sync=False):
+        """
+        Write the pending data of `logfile` (of all the log
+        files if `None`) now. With `sync=True` the data are
+        also synced to disk.
+        """
+        with self.iolock:
+            with self.lock:
+                if logfile is None:
+                    keys = list(self.pending)
+                else:
+                    keys = [key for key in self.pending if key[0] == logfile]
+                chunks = [(key, self.pending.pop(key)) for key in keys]
+                self.size -= sum(len(t) for key, texts in chunks
+                                 for t in texts)
+            for (fname, txtenc), texts in chunks:
+                try:
+                    with open(fname, "a", encoding=txtenc) as log:
+                        log.write(''.join(texts))
+                        if sync:
+                            log.flush()
+                            os.fsync(log.fileno())
+                except OSError:
+                    pass  # e.g. log directory removed meanwhile
+            if sync:
+                self.lastsync = time.monotonic()
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """
+        Write and sync all the pending data, see `atexit`.
+        """
+        self.flush(sync=True)
+# ----------------------------------------------------------------#
+
+
+LOGWRITER = LogWriter()
+
+
+def flush_logs(logfile=None):
+    """
+    Write the buffered log messages of the given `logfile`,
+    or of all the log files if `None`, to disk now.
+    """
+    LOGWRITER.flush(logfile, sync=True)
+# ----------------------------------------------------------------#
 
 
 def tolog(info, logfile, sep=False, wdate=False, txtenc="utf-8"):
     """
     This function writes log events as information messages
-    to a given `logfile` during the processes.
+    to a given `logfile` during the processes. Writing is
+    buffered, see `LogWriter` class.
     """
     if sep:
         line = '\n' + '-' * 80 + '\n'
@@ -47,8 +158,7 @@ def tolog(info, logfile, sep=False, wdate=False, txtenc="utf-8"):
 
     apnd = f'{line}{strdate}{info}\n'
 
-    with open(logfile, "a", encoding=txtenc) as log:
-        log.write(apnd)
+    LOGWRITER.write(logfile, apnd, txtenc)
 # ----------------------------------------------------------------#
 
 
@@ -66,6 +176,7 @@ def make_log_template(logname, logdir, mode="a", txtenc="utf-8"):
     sep = '=' * 80
     current_date = time.strftime("%c")  # date/time
     logfile = os.path.join(logdir, logname)
+    LOGWRITER.flush(logfile)  # keep the order of the previous messages
 
     with open(logfile, mode, encoding=txtenc) as log:
         log.write(f"""{sep}
@@ -0,0 +1,217 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: queue_state.py
+Porpose: persistent state of the queue items
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+from videomass.vdms_io.data_cache import file_signature, make_key
+
+STATES = ('pending', 'running', 'done', 'failed')
+
+
+def write_json_atomic(data, filename):
+    """
+    Write `data` as JSON to a temporary file which then
+    replaces `filename`, so that a crash never leaves a
+    truncated file.
+    """
+    dirname = os.path.dirname(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix='.tmp_', dir=dirname)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fln:
+            json.dump(data, fln, ensure_ascii=False, indent=4)
+            fln.flush()
+            os.fsync(fln.fileno())
+        os.replace(tmp, filename)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+# ------------------------------------------------------------------------
+
+
+class QueueState:
+    """
+    Keeps the state of each queue item ('pending', 'running',
+    'done' or 'failed') along with the output size and the wall
+    time of the processing, saving the JSON `filename` at each
+    change. Items are identified by their absolute destination
+    pathname.
+
+    An item is complete (see `is_complete`) if it is 'done', its
+    task dict and source file are unchanged and its output file
+    still has the same size and modification time recorded when
+    it was completed. Items left 'running' by a crash are never
+    complete.
+
+    Usage:
+        >>> state = QueueState('/path/to/queue.state')
+        >>> state.start(kwa)
+        >>> state.finish(kwa, 'DONE')
+        >>> state.pending(queuelist)  # items to process on resume
+    """
+    def __init__(self, filename):
+        """
+        filename: the JSON file pathname, created if not exists.
+        """
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.started = {}  # start time of the running items
+        try:
+            with open(filename, 'r', encoding='utf-8') as fln:
+                self.items = json.load(fln)
+        except (OSError, ValueError):
+            self.items = {}
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def item_key(kwa):
+        """
+        Returns the key of the task dict `kwa`.
+        """
+        return os.path.abspath(kwa['destination'])
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def task_key(kwa):
+        """
+        Returns a string which identifies the options
+        of the task dict `kwa`, see `is_complete`.
+        """
+        return make_key(*sorted((key, val) for key, val in kwa.items()
+                                if key not in ('source', 'destination')))
+    # ------------------------------------------------------------------
+
+    def save(self):
+        """
+        Write the state file. Called with the lock held.
+        Returns an error message on failure, None otherwise.
+        """
+        try:
+            write_json_atomic(self.items, self.filename)
+        except OSError as err:
+            return f'[VIDEOMASS]: ERROR: cannot write queue state: {err}'
+        return None
+    # ------------------------------------------------------------------
+
+    def get(self, kwa):
+        """
+        Returns the state of the task dict `kwa`,
+        'pending' if it was never processed.
+        """
+        with self.lock:
+            return self.items.get(self.item_key(kwa),
+                                  {}).get('state', 'pending')
+    # ------------------------------------------------------------------
+
+    def start(self, kwa):
+        """
+        Set the item `kwa` as 'running'. Returns the
+        error message of `save`, if any.
+        """
+        key = self.item_key(kwa)
+        with self.lock:
+            self.started[key] = time.monotonic()
+            self.items[key] = {'state': 'running',
+                               'task': self.task_key(kwa),
+                               'source': file_signature(kwa['source']),
+                               }
+            return self.save()
+    # ------------------------------------------------------------------
+
+    def finish(self, kwa, status):
+        """
+        Set the final state of the item `kwa` according to the
+        `status` of its job ('DONE', 'FAILED', 'ERROR' or 'STOP').
+        Stopped items get back to 'pending'. Returns the
+        error message of `save`, if any.
+        """
+        key = self.item_key(kwa)
+        with self.lock:
+            item = self.items.setdefault(key, {})
+            start = self.started.pop(key, None)
+            if start is not None:
+                item['walltime'] = round(time.monotonic() - start, 3)
+            if status == 'DONE':
+                output = file_signature(kwa['destination'])
+                item['state'] = 'done' if output else 'failed'
+                item['output'] = output
+                item['size'] = output[1] if output else None
+                item['finished'] = time.time()
+            elif status == 'STOP':
+                item['state'] = 'pending'
+            else:
+                item['state'] = 'failed'
+            return self.save()
+    # ------------------------------------------------------------------
+
+    def is_complete(self, kwa):
+        """
+        True if the item `kwa` has been completed and its
+        output is still valid.
+        """
+        with self.lock:
+            item = self.items.get(self.item_key(kwa), {})
+        if item.get('state') != 'done':
+            return False
+        if item.get('task') != self.task_key(kwa):
+            return False
+        if item.get('source') != file_signature(kwa['source']):
+            return False
+        return item.get('output') == file_signature(kwa['destination'])
+    # ------------------------------------------------------------------
+
+    def pending(self, queue):
+        """
+        Returns the items of the `queue` list which are
+        not complete, see `is_complete`.
+        """
+        return [kwa for kwa in queue if not self.is_complete(kwa)]
+    # ------------------------------------------------------------------
+
+    def prune(self, queue):
+        """
+        Forget the items which are no longer in the `queue` list.
+        Returns the error message of `save`, if any.
+        """
+        keys = {self.item_key(kwa) for kwa in queue}
+        with self.lock:
+            for key in list(self.items):
+                if key not in keys:
+                    del self.items[key]
+            return self.save()
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """
+        Forget all the items and remove the state file.
+        """
+        with self.lock:
+            self.items.clear()
+            if os.path.exists(self.filename):
+                os.remove(self.filename)
@@ -0,0 +1,153 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: stream_signature.py
+Porpose: compare the streams of files to concatenate
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+The concat demuxer copies the streams of each file as they are, so
+all the files must have the same codecs, sizes, sample rates, etc.
+These params are read once from the ffprobe data of each file and
+stored along with it as a signature with its digest, so that the
+files can be compared by their digest only.
+Files which differ from the most common signature but have the same
+kind of streams can be re-encoded to match it (see `normalize_args`).
+"""
+import hashlib
+import json
+from collections import Counter
+
+VIDEO_KEYS = ('codec_name', 'width', 'height', 'pix_fmt', 'r_frame_rate')
+AUDIO_KEYS = ('codec_name', 'sample_rate', 'channels')
+ENCODERS = {'h264': 'libx264', 'hevc': 'libx265', 'vp8': 'libvpx',
+            'vp9': 'libvpx-vp9', 'av1': 'libsvtav1', 'theora': 'libtheora',
+            'prores': 'prores_ks', 'mp3': 'libmp3lame', 'opus': 'libopus',
+            'vorbis': 'libvorbis',
+            }  # decoder name > encoder name, if they differ
+TIMESCALE_EXT = ('mp4', 'm4v', 'mov', '3gp')  # accept -video_track_timescale
+
+
+def sample_rate_hz(value):
+    """
+    Returns the sample rate in Hz of a ffprobe value,
+    both plain (e.g. '48000') or pretty (e.g. '48.000000 KHz').
+    """
+    num, *unit = str(value).split()
+    scale = {'KHz': 1000, 'MHz': 1000000}.get(unit[0] if unit else '', 1)
+    return round(float(num) * scale)
+# ------------------------------------------------------------------------
+
+
+def stream_signature(probe):
+    """
+    Returns the signature of the ffprobe data of a file, a dict
+    with the list of the concat relevant params of each video and
+    audio stream ('streams') and its hash ('digest').
+    """
+    streams = []
+    for stream in probe.get('streams', []):
+        kind = stream.get('codec_type')
+        if kind == 'video':
+            streams.append([kind] + [stream.get(key) for key in VIDEO_KEYS])
+        elif kind == 'audio':
+            params = [stream.get(key) for key in AUDIO_KEYS]
+            if params[1] is not None:
+                params[1] = sample_rate_hz(params[1])
+            streams.append([kind] + params)
+    digest = hashlib.sha1(json.dumps(streams).encode('utf-8')).hexdigest()
+    return {'streams': streams, 'digest': digest}
+# ------------------------------------------------------------------------
+
+
+def signature(probe):
+    """
+    Returns the signature stored in the ffprobe data `probe`,
+    it is computed and stored the first time only.
+    """
+    if 'signature' not in probe:
+        probe['signature'] = stream_signature(probe)
+    return probe['signature']
+# ------------------------------------------------------------------------
+
+
+def compare_signatures(data):
+    """
+    Compare the signatures of a list of ffprobe data. Returns a
+    tuple (reference, odd) where reference is the index of the
+    first file with the most common signature and odd is the
+    list of indexes of the files which differ from it. Returns
+    (None, []) if the files have no audio or video streams.
+    """
+    if not data or not all(signature(probe)['streams'] for probe in data):
+        return None, []
+    digests = [signature(probe)['digest'] for probe in data]
+    common = Counter(digests).most_common(1)[0][0]
+    odd = [num for num, digest in enumerate(digests) if digest != common]
+    return digests.index(common), odd
+# ------------------------------------------------------------------------
+
+
+def normalizable(probe, reference):
+    """
+    Returns True if the file of ffprobe data `probe` has the same
+    sequence of stream types as the `reference` ffprobe data, so
+    that it can be re-encoded to match it.
+    """
+    kinds = [stream[0] for stream in signature(probe)['streams']]
+    return kinds == [stream[0] for stream in signature(reference)['streams']]
+# ------------------------------------------------------------------------
+
+
+def normalize_args(probe, reference, ext=''):
+    """
+    Returns the FFmpeg output args to re-encode the video and audio
+    streams of `probe` as the streams of the `reference` ffprobe
+    data. Video frames are scaled to fit and padded. `ext` is the
+    output file extension, the MP4 family outputs also get the
+    video time base of the `reference` (it is not part of the
+    signatures, the concat demuxer copies streams of different
+    time bases).
+    """
+    indexes = [stream.get('index') for stream in probe.get('streams', [])
+               if stream.get('codec_type') in ('video', 'audio')]
+    timebase = next((stream.get('time_base') for stream
+                     in reference.get('streams', [])
+                     if stream.get('codec_type') == 'video'), None)
+    args = []
+    for out, (index, params) in enumerate(zip(indexes,
+                                              signature(reference)
+                                              ['streams'])):
+        codec = ENCODERS.get(params[1], params[1])
+        args.append(f'-map 0:{index} -c:{out} {codec}')
+        if params[0] == 'video':
+            width, height, pixfmt, rate = params[2:]
+            args.append(f'-filter:{out} "scale={width}:{height}:'
+                        f'force_original_aspect_ratio=decrease,'
+                        f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2" '
+                        f'-pix_fmt:{out} {pixfmt} -r:{out} {rate}')
+            if ext.lower() in TIMESCALE_EXT and timebase:
+                args.append(f'-video_track_timescale '
+                            f'{timebase.split("/")[-1]}')
+        else:
+            rate, channels = params[2:4]
+            args.append(f'-ar:{out} {rate} -ac:{out} {channels}')
+    return ' '.join(args)
@@ -32,6 +32,7 @@ from pubsub import pub
 from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_utils.queue_utils import load_json_file_queue
 from videomass.vdms_utils.queue_utils import write_json_file_queue
+from videomass.vdms_utils.queue_utils import queue_state
 from videomass.vdms_utils.queue_utils import extend_data_queue
 from videomass.vdms_dialogs import preferences
 from videomass.vdms_dialogs import set_timestamp
@@ -212,6 +213,7 @@ class MainFrame(wx.Frame):
                     self.queue_tool_counter()
             else:
                 os.remove(fque)
+                queue_state().clear()
 
     # ------------------------------------------------------------------#
 
@@ -745,9 +747,7 @@ class MainFrame(wx.Frame):
 
             self.switch_file_import(self)
             paths = filedlg.GetPaths()
-            for path in paths:
-                self.fileDnDTarget.flCtrl.dropUpdate(path)
-            self.fileDnDTarget.flCtrl.rejected_files()
+            self.fileDnDTarget.flCtrl.import_files(paths)
     # -------------------------------------------------------------------#
 
     def open_dest_encodings(self, event):
@@ -1634,9 +1634,19 @@ class MainFrame(wx.Frame):
                 if not self.queuelist:
                     self.toolbar.EnableTool(37, False)
                     return None
+                state = queue_state()
+                state.prune(self.queuelist)
+                datalist = self.queuelist
+                if data[4]:  # resume, skip completed items
+                    datalist = state.pending(self.queuelist)
+                    if not datalist:
+                        wx.MessageBox(_('All items in the queue have '
+                                        'already been completed.'),
+                                      'Videomass', wx.ICON_INFORMATION, self)
+                        return None
                 self.switch_to_processing('Queue Processing',
                                           'Queue Processing.log',
-                                          datalist=self.queuelist
+                                          datalist=datalist
                                           )
             else:
                 if not self.queuelist:
@@ -1652,6 +1662,7 @@ class MainFrame(wx.Frame):
         if self.removequeue and msg == 'Done':
             queuef = os.path.join(self.appdata["confdir"], 'queue.backup')
             os.remove(queuef)  # remove queue.backup
+            queue_state().clear()
             self.queuelist.clear()
             self.toolbar.EnableTool(37, False)
             self.queue_tool_counter()
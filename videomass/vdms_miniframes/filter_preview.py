@@ -0,0 +1,182 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: filter_preview.py
+Porpose: live preview of the video filters
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import io
+import wx
+from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_utils.utils import time_to_integer
+from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_threads.filter_preview import FilterPreview
+
+
+class LivePreview(wx.MiniFrame):
+    """
+    A floating window which shows the video filters enabled
+    on the A/V Conversions panel applied to a few frames of
+    the selected file. The preview is updated as soon as the
+    filters or the time position change, see `FilterPreview`.
+
+    """
+    get = wx.GetApp()
+    OS = get.appset['ostype']
+    LOGDIR = get.appset['logdir']
+    BACKGROUND = '#1b0413'
+    PW = 480  # preview width
+    PH = 270  # preview height
+
+    def __init__(self, parent):
+        """
+        self.filename: the source file of the preview
+        self.chain: the current video filters chain
+        self.mills: source duration in milliseconds
+        """
+        self.filename = None
+        self.chain = ''
+        self.mills = 0
+        self.logfile = None
+        self.engine = FilterPreview(LivePreview.get.appset, wx.CallAfter)
+
+        wx.MiniFrame.__init__(self, parent, -1, style=wx.CAPTION
+                              | wx.CLOSE_BOX | wx.SYSTEM_MENU
+                              | wx.FRAME_FLOAT_ON_PARENT
+                              )
+        panelbase = wx.Panel(self, wx.ID_ANY, style=wx.TAB_TRAVERSAL)
+        sizer_base = wx.BoxSizer(wx.VERTICAL)
+        self.panelimg = wx.Panel(panelbase, wx.ID_ANY,
+                                 size=(LivePreview.PW, LivePreview.PH))
+        self.panelimg.SetBackgroundColour(wx.Colour(LivePreview.BACKGROUND))
+        sizer_base.Add(self.panelimg, 0, wx.ALL | wx.CENTRE, 5)
+        self.stbitmap = wx.StaticBitmap(self.panelimg, wx.ID_ANY,
+                                        wx.Bitmap(LivePreview.PW,
+                                                  LivePreview.PH))
+        sizer_time = wx.BoxSizer(wx.HORIZONTAL)
+        sizer_base.Add(sizer_time, 0, wx.ALL | wx.CENTRE, 5)
+        self.sld_time = wx.Slider(panelbase, wx.ID_ANY, 0, 0, 1,
+                                  size=(300, -1), style=wx.SL_HORIZONTAL)
+        sizer_time.Add(self.sld_time, 0, wx.CENTRE, 0)
+        self.lab_time = wx.StaticText(panelbase, wx.ID_ANY, "00:00:00")
+        sizer_time.Add(self.lab_time, 0, wx.LEFT | wx.CENTRE, 20)
+        self.lab_status = wx.StaticText(panelbase, wx.ID_ANY, "")
+        sizer_base.Add(self.lab_status, 0, wx.ALL | wx.CENTRE, 5)
+
+        self.SetTitle(_("Live preview of the video filters"))
+        panelbase.SetSizer(sizer_base)
+        sizer_base.Fit(self)
+        self.Layout()
+
+        # ----------------------Binding (EVT)----------------------#
+        self.Bind(wx.EVT_SLIDER, self.on_seek, self.sld_time)
+        if LivePreview.OS == 'Darwin':
+            self.Bind(wx.EVT_SCROLL_THUMBRELEASE, self.on_seek_done,
+                      self.sld_time)
+        else:
+            self.Bind(wx.EVT_SCROLL_CHANGED, self.on_seek_done,
+                      self.sld_time)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+    # ------------------------------------------------------------------#
+
+    def set_source(self, filename, duration):
+        """
+        Set the source file and its `duration` as a
+        clock string (e.g. '00:10:00.000'), the time
+        position is moved to the middle of the file.
+        """
+        if filename == self.filename:
+            return
+        self.filename = filename
+        self.mills = time_to_integer(duration.split('.')[0])
+        self.sld_time.SetRange(0, max(self.mills, 1))
+        self.sld_time.SetValue(self.mills // 2)
+        self.sld_time.Enable(bool(self.mills))
+        self.lab_time.SetLabel(integer_to_time(self.mills // 2, False))
+    # ------------------------------------------------------------------#
+
+    def set_filters(self, chain):
+        """
+        Set the video filters `chain` (without `-vf`)
+        and update the preview.
+        """
+        self.chain = chain
+        self.render()
+    # ------------------------------------------------------------------#
+
+    def render(self):
+        """
+        Ask the `FilterPreview` to render the preview at the
+        current time position, see `on_preview`.
+        """
+        if not self.filename or not self.IsShown():
+            return
+        self.logfile = make_log_template('generic_task.log',
+                                         LivePreview.LOGDIR,
+                                         mode="w",
+                                         )
+        clock = integer_to_time(self.sld_time.GetValue(), False)
+        self.lab_status.SetLabel(_('Rendering...'))
+        self.engine.update(self.filename, clock, self.chain,
+                           (LivePreview.PW, LivePreview.PH),
+                           self.on_preview, self.logfile)
+    # ------------------------------------------------------------------#
+
+    def on_preview(self, error, frames, elapsed):
+        """
+        Callback of the `FilterPreview`, shows the last
+        filtered frame centered on the preview panel.
+        """
+        if error or not frames:
+            self.lab_status.SetLabel(_('Unable to preview these filters, '
+                                       'see the log file'))
+            return
+        img = wx.Image(io.BytesIO(frames[-1]), wx.BITMAP_TYPE_PNG)
+        self.stbitmap.SetBitmap(img.ConvertToBitmap())
+        self.stbitmap.SetPosition(((LivePreview.PW - img.GetWidth()) // 2,
+                                   (LivePreview.PH - img.GetHeight()) // 2))
+        self.lab_status.SetLabel(_('{0} frames filtered in {1} ms').format(
+            len(frames), round(elapsed * 1000)))
+    # ------------------------------------------------------------------#
+
+    def on_seek(self, event):
+        """
+        Update the clock label while moving the slider.
+        """
+        clock = integer_to_time(self.sld_time.GetValue(), False)
+        self.lab_time.SetLabel(clock)
+    # ------------------------------------------------------------------#
+
+    def on_seek_done(self, event):
+        """
+        Update the preview at the new time position.
+        """
+        self.render()
+    # ------------------------------------------------------------------#
+
+    def on_close(self, event):
+        """
+        Hide this frame and release the decoded frames.
+        """
+        self.engine.close()
+        self.filename = None
+        self.Hide()
@@ -34,7 +34,9 @@ from videomass.vdms_utils.utils import integer_to_time
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
 from videomass.vdms_io.make_filelog import make_log_template
-from videomass.vdms_threads.generic_task import FFmpegGenericTask
+from videomass.vdms_threads.waveform_peaks import (WaveformPeaks,
+                                                   peak_columns,
+                                                   )
 from videomass.vdms_io.io_tools import show_msg_notify
 from videomass.vdms_threads.ffplay_file import FilePlayback_GetOutput
 
@@ -161,9 +163,6 @@ class Float_TL(wx.MiniFrame):
     # COLORSCHEME = get.appset['colorscheme']
     OS = get.appset['ostype']
     LOGDIR = get.appset['logdir']
-    TMPROOT = os.path.join(get.appset['cachedir'], 'tmp', 'Waveforms')
-    TMPSRC = os.path.join(TMPROOT, 'tmpsrc')
-    os.makedirs(TMPSRC, mode=0o777, exist_ok=True)
 
     # Used Colours
     YELLOW = '#bd9f00'  # for warnings
@@ -224,7 +223,10 @@ class Float_TL(wx.MiniFrame):
         self.pointpx = [0, 0]  # mouse points (see on_move(), on_leftdown())
         self.sourcedur = _('No source duration:')
         self.filename = None  # selected filename on file list
-        self.frame = None  # waveform image located on cache dir
+        self.peaks = None  # audio peaks of the waveform, see on_peaks()
+        self.wavelines = None  # waveform lines drawn on the ruler
+        self.wavethread = None  # WaveformPeaks thread while reading
+        self.logfile = None
         self.invalidselection = False  # booleaan reference
         self.playpoint = 0  # `x` point pixel representation
 
@@ -357,29 +359,47 @@ class Float_TL(wx.MiniFrame):
         return (self.filename, self.parent.file_src.index(self.filename))
     # ------------------------------------------------------------------#
 
-    def make_frame_from_file(self):
+    def load_waveform(self):
         """
-        This method is responsible for making available
-        an audio waveform frame from a selected file.
-        Return None type if error, str(frame) as pathname otherwise.
+        Read the audio peaks of the selected file in background
+        to draw its waveform, see `on_peaks`. The peaks of the
+        files already read are taken from the metadata cache.
         """
-        logfile = make_log_template('generic_task.log', Float_TL.LOGDIR,
-                                    mode="w")
-        name = os.path.splitext(os.path.basename(self.filename))[0]
-        self.frame = os.path.join(f'{Float_TL.TMPSRC}', f'{name}.png')  # image
+        self.stop_waveform()
+        self.logfile = make_log_template('generic_task.log',
+                                         Float_TL.LOGDIR, mode="w")
+        thread = WaveformPeaks(Float_TL.get.appset, self.filename,
+                               lambda *args: self.on_peaks(thread, *args),
+                               wx.CallAfter, self.logfile)
+        self.wavethread = thread
+    # ------------------------------------------------------------------#
 
-        arg = (f'-i "{self.filename}" -filter_complex '
-               f'"showwavespic=s={Float_TL.RW + 10}x{Float_TL.PH}'
-               f':colors=white:split_channels=1" -update 1 '
-               f'-frames:v 1 "{self.frame}"')
-        thread = FFmpegGenericTask(arg, 'Timeline Waveform', logfile)
-        thread.join()  # wait end thread
-        error = thread.status
+    def on_peaks(self, thread, error, peaks):
+        """
+        Callback of the `WaveformPeaks` thread, draws the
+        waveform of the `peaks` on the ruler. The results of
+        a thread stopped in the meantime are discarded.
+        """
+        if thread is not self.wavethread:
+            return
+        self.wavethread = None
         if error:
-            self.frame = None
+            self.btn_wave.SetValue(False)
             show_msg_notify(self.GetParent(),
-                            logname=os.path.basename(logfile))
-        return self.frame
+                            logname=os.path.basename(self.logfile))
+            return
+        self.peaks, self.wavelines = peaks, None
+        self.onRedraw(wx.ClientDC(self.panelruler))
+    # ------------------------------------------------------------------#
+
+    def stop_waveform(self):
+        """
+        Stop reading the audio peaks and remove the waveform.
+        """
+        if self.wavethread:
+            self.wavethread.stop()
+            self.wavethread = None
+        self.peaks, self.wavelines = None, None
     # ------------------------------------------------------------------#
 
     def get_audio_stream(self, fileselected):
@@ -502,12 +522,9 @@ class Float_TL(wx.MiniFrame):
                 self.btn_wave.SetValue(False)
                 return
 
-            if not self.make_frame_from_file():
-                self.btn_wave.SetValue(False)
-                return
-        else:
-            self.frame = None
-
+            self.load_waveform()
+            return
+        self.stop_waveform()
         self.onRedraw(wx.ClientDC(self.panelruler))
     # ----------------------------------------------------------------------
 
@@ -588,8 +605,8 @@ class Float_TL(wx.MiniFrame):
                 self.panelbase.Enable()
                 self.overalltime = integer_to_time(self.milliseconds)
 
+        self.stop_waveform()
         self.btn_wave.SetValue(False)
-        self.frame = None
         self.on_trim_time_reset(None)
     # ------------------------------------------------------------------#
 
@@ -750,9 +767,8 @@ class Float_TL(wx.MiniFrame):
             self.invalidselection = False
             selcolor, textcolor = Float_TL.SELECTION, Float_TL.DURATION_START
 
-        if self.frame and Float_TL.OS != 'Windows':
-            bmp = wx.Image(self.frame, wx.BITMAP_TYPE_ANY).ConvertToBitmap()
-            dc.DrawBitmap(bmp, 0, 0, True)
+        if self.peaks and Float_TL.OS != 'Windows':
+            self.draw_waveform(dc)
 
         self.text_time_indicator(dc, textcolor, selcolor)
         self.ruler_notches(dc)
@@ -760,9 +776,24 @@ class Float_TL(wx.MiniFrame):
         if self.playpoint:
             self.move_play_cursor(dc)
 
-        if self.frame and Float_TL.OS == 'Windows':
-            bmp = wx.Image(self.frame, wx.BITMAP_TYPE_ANY).ConvertToBitmap()
-            dc.DrawBitmap(bmp, 0, 0, True)
+        if self.peaks and Float_TL.OS == 'Windows':
+            self.draw_waveform(dc)
+    # ------------------------------------------------------------------#
+
+    def draw_waveform(self, dc):
+        """
+        Draw the audio waveform as a vertical line for each
+        pixel of the ruler. The lines are computed from the
+        peaks once, then reused on each redraw.
+        """
+        if not self.wavelines:
+            middle = Float_TL.PH / 2
+            self.wavelines = [(x, round(middle - amp * middle),
+                               x, round(middle + amp * middle) + 1)
+                              for x, amp in enumerate(
+                                  peak_columns(self.peaks, Float_TL.RW))]
+        dc.SetPen(wx.Pen(wx.WHITE, 1))
+        dc.DrawLineList(self.wavelines)
     # ------------------------------------------------------------------#
 
     def text_time_indicator(self, dc, textcolor, selcolor):
@@ -185,12 +185,15 @@ class AudioEncoders(scrolled.ScrolledPanel):
         sizer_a_normaliz.Add(self.rdbx_normalize, 0, wx.ALL | wx.CENTRE, 5)
         sizer_a_normaliz.Add((0, 10), 0)
 
-        grid_peak = wx.FlexGridSizer(1, 4, 15, 4)
+        grid_peak = wx.FlexGridSizer(1, 5, 15, 4)
         sizer_a_normaliz.Add(grid_peak, 0, wx.ALL | wx.CENTRE, 5)
         self.btn_voldect = wx.Button(self, wx.ID_ANY,
                                      _("Volume detect"), size=(-1, -1))
         self.btn_voldect.SetBitmap(bmppeaklevel, wx.LEFT)
         grid_peak.Add(self.btn_voldect, 0, wx.ALIGN_CENTER_VERTICAL, 0)
+        self.ckbx_estimate = wx.CheckBox(self, wx.ID_ANY,
+                                         _("Fast estimate"))
+        grid_peak.Add(self.ckbx_estimate, 0, wx.ALIGN_CENTER_VERTICAL, 0)
         self.btn_stat = wx.Button(self, wx.ID_ANY,
                                   _("Volume Statistics"), size=(-1, -1))
         self.btn_stat.SetBitmap(bmpanalyzes, wx.LEFT)
@@ -264,6 +267,11 @@ class AudioEncoders(scrolled.ScrolledPanel):
         tip = (_('Gets maximum volume and average volume data in dBFS, then '
                  'calculates the offset amount for audio normalization.'))
         self.btn_voldect.SetToolTip(tip)
+        tip = (_('Analyzes only some short windows evenly spaced along '
+                 'long files, the volume statistics show the error bound '
+                 'of the estimated mean volume. Uncheck to run a full '
+                 'analysis.'))
+        self.ckbx_estimate.SetToolTip(tip)
         tip = (_('Limiter for the maximum peak level or the mean level '
                  '(when switch to RMS) in dBFS. From -99.0 to +0.0; default '
                  'for PEAK level is -1.0; default for RMS is -20.0'))
@@ -306,6 +314,7 @@ class AudioEncoders(scrolled.ScrolledPanel):
         self.Bind(wx.EVT_RADIOBOX, self.on_normalize, self.rdbx_normalize)
         self.Bind(wx.EVT_SPINCTRL, self.on_enter_gain, self.spin_target)
         self.Bind(wx.EVT_BUTTON, self.on_analyzes, self.btn_voldect)
+        self.Bind(wx.EVT_CHECKBOX, self.on_enter_gain, self.ckbx_estimate)
         self.Bind(wx.EVT_BUTTON, self.on_show_vol_statistics, self.btn_stat)
     # ------------------------------------------------------------------#
 
@@ -364,6 +373,7 @@ class AudioEncoders(scrolled.ScrolledPanel):
         self.opt["AudioMap"] = ["-map 0:a:?", ""]
         self.opt["PEAK"] = []
         self.opt["RMS"] = []
+        self.opt["VolEstimate"] = []
         self.opt["EBU"] = ["", ""]
         self.audio_default()
     # ------------------------------------------------------------------#
@@ -396,6 +406,7 @@ class AudioEncoders(scrolled.ScrolledPanel):
         """
         del self.opt["PEAK"][:]
         del self.opt["RMS"][:]
+        del self.opt["VolEstimate"][:]
         self.opt["EBU"] = ["", ""]
 
         if setoff == 'all':
@@ -403,25 +414,26 @@ class AudioEncoders(scrolled.ScrolledPanel):
             self.spin_i.Disable(), self.spin_lra.Disable()
             self.spin_tp.Disable(), self.btn_voldect.Disable()
             self.spin_target.Disable(), self.btn_stat.Disable()
-            self.spin_target.SetValue(-1.0)
+            self.spin_target.SetValue(-1.0), self.ckbx_estimate.Disable()
 
         elif setoff == 'ebu':
             self.btn_voldect.Disable(), self.spin_target.Disable()
             self.btn_stat.Disable(), self.spin_i.Enable()
             self.spin_lra.Enable(), self.spin_tp.Enable()
+            self.ckbx_estimate.Disable()
             self.opt["EBU"][0] = self.rdbx_normalize.GetStringSelection()
 
         elif setoff == 'rms':
             self.spin_i.Disable(), self.spin_lra.Disable()
             self.spin_tp.Disable(), self.btn_voldect.Enable()
             self.spin_target.Enable(), self.btn_stat.Disable()
-            self.spin_target.SetValue(-20.0)
+            self.spin_target.SetValue(-20.0), self.ckbx_estimate.Enable()
 
         elif setoff == 'peak':
             self.spin_i.Disable(), self.spin_lra.Disable()
             self.spin_tp.Disable(), self.btn_voldect.Enable()
             self.spin_target.Enable(), self.btn_stat.Disable()
-            self.spin_target.SetValue(-1.0)
+            self.spin_target.SetValue(-1.0), self.ckbx_estimate.Enable()
     # ------------------------------------------------------------------#
 
     def on_audio_preview(self, fileget):
@@ -782,8 +794,8 @@ class AudioEncoders(scrolled.ScrolledPanel):
 
     def on_enter_gain(self, event):
         """
-        when spin_amplitude is changed enable 'Volumedetect' to
-        update new incomming
+        when spin_amplitude or the fast estimate mode are changed
+        enable 'Volumedetect' to update new incomming
 
         """
         if not self.btn_voldect.IsEnabled():
@@ -798,6 +810,8 @@ class AudioEncoders(scrolled.ScrolledPanel):
         normalization in dBFS:
             - PEAK-based Analyzes, get the MAXIMUM peak level data.
             - RMS-based Analyzes, get the MEAN peak level data.
+        If "Fast estimate" is checked, long files are only
+        sampled, see `volume_estimate`.
         <https://superuser.com/questions/323119/how-can-i-normalize-audio-
         using-ffmpeg?utm_medium=organic>
         """
@@ -810,6 +824,9 @@ class AudioEncoders(scrolled.ScrolledPanel):
                                      self.maindata.time_seq,  # from -ss to -t
                                      self.opt["AudioIndex"],
                                      parent=self.GetParent(),
+                                     durations=(self.maindata.duration if
+                                                self.ckbx_estimate.GetValue()
+                                                else None),
                                      )
         if data[1]:  # see `volume_detect_process` in `io_tools`
             return
@@ -823,6 +840,8 @@ class AudioEncoders(scrolled.ScrolledPanel):
 
         del self.opt["PEAK"][:]
         del self.opt["RMS"][:]
+        self.opt["VolEstimate"] = [vol[2] if len(vol) > 2 else None
+                                   for vol in data[0]]
 
         gain = self.spin_target.GetValue()
         for filename, vol in zip(self.maindata.file_src, data[0]):
@@ -857,9 +876,7 @@ class AudioEncoders(scrolled.ScrolledPanel):
             self.on_analyzes(self)
 
         lev = self.opt["RMS"] if not self.opt["PEAK"] else self.opt["PEAK"]
-        self.maindata.audivolnormalize = AudioVolNormal(title,
-                                                        lev,
-                                                        self.appdata['ostype'],
-                                                        )
+        self.maindata.audivolnormalize = AudioVolNormal(
+            title, lev, self.appdata['ostype'], self.opt["VolEstimate"])
         self.maindata.audivolnormalize.Show()
     # ------------------------------------------------------------------#
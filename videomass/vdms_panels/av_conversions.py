@@ -42,9 +42,10 @@ from videomass.vdms_dialogs.filter_deinterlace import Deinterlace
 from videomass.vdms_dialogs.filter_scale import Scale
 from videomass.vdms_dialogs.filter_stab import VidstabSet
 from videomass.vdms_dialogs.filter_colorcorrection import ColorEQ
+from videomass.vdms_miniframes.filter_preview import LivePreview
 from videomass.vdms_dialogs.singlechoicedlg import SingleChoice
 from videomass.vdms_dialogs.avconv_cmd_line import Raw_Cmd_Line
-from videomass.vdms_threads.ffmpeg import get_raw_cmdline_args
+from videomass.vdms_threads.cmd_builders import get_raw_cmdline_args, NUL
 from . video_encoders.video_no_enc import Video_No_Enc
 from . video_encoders.mpeg4 import Mpeg_4
 from . video_encoders.av1_aom import AV1_Aom
@@ -107,9 +108,11 @@ class AV_Conv(wx.Panel):
         self.appdata = get.appset
         icons = get.iconset
         self.videopanel = None
+        self.livepreview = None  # LivePreview miniframe, see on_live_preview
 
         if 'wx.svg' in sys.modules:  # only available in wx version 4.1 to up
             bmpplay = get_bmp(icons['preview'], ((16, 16)))
+            bmplive = get_bmp(icons['playback'], ((16, 16)))
             self.bmpreset = get_bmp(icons['clear'], ((16, 16)))
             bmpresize = get_bmp(icons['scale'], ((16, 16)))
             bmpcrop = get_bmp(icons['crop'], ((16, 16)))
@@ -122,6 +125,7 @@ class AV_Conv(wx.Panel):
             bmpcmd = get_bmp(icons['cmdshow'], ((16, 16)))
         else:
             bmpplay = wx.Bitmap(icons['preview'], wx.BITMAP_TYPE_ANY)
+            bmplive = wx.Bitmap(icons['playback'], wx.BITMAP_TYPE_ANY)
             self.bmpreset = wx.Bitmap(icons['clear'], wx.BITMAP_TYPE_ANY)
             bmpresize = wx.Bitmap(icons['scale'], wx.BITMAP_TYPE_ANY)
             bmpcrop = wx.Bitmap(icons['crop'], wx.BITMAP_TYPE_ANY)
@@ -247,6 +251,10 @@ class AV_Conv(wx.Panel):
         self.btn_preview.SetBitmap(bmpplay, wx.LEFT)
         sizer_Vfilter.Add(self.btn_preview, 0, wx.ALL | wx.CENTRE, 5)
         self.btn_preview.Disable()
+        self.btn_livepreview = wx.Button(self.filterVpanel, wx.ID_ANY,
+                                         "", size=(40, -1))
+        self.btn_livepreview.SetBitmap(bmplive, wx.LEFT)
+        sizer_Vfilter.Add(self.btn_livepreview, 0, wx.ALL | wx.CENTRE, 5)
         self.btn_reset = wx.Button(self.filterVpanel, wx.ID_ANY,
                                    "", size=(40, -1))
         self.btn_reset.SetBitmap(self.bmpreset, wx.LEFT)
@@ -353,6 +361,8 @@ class AV_Conv(wx.Panel):
                  'normalization.'))
         self.cmb_Media.SetToolTip(tip)
         self.btn_preview.SetToolTip(_('Preview video filters'))
+        self.btn_livepreview.SetToolTip(_('Live preview of the video '
+                                          'filters on a few frames'))
         self.btn_reset.SetToolTip(_('Disable active filters'))
         self.btn_videosize.SetToolTip(_("Resize"))
         self.btn_crop.SetToolTip(_("Crop"))
@@ -380,6 +390,7 @@ class AV_Conv(wx.Panel):
         self.Bind(wx.EVT_BUTTON, self.on_Set_stabilizer, self.btn_vidstab)
         self.Bind(wx.EVT_BUTTON, self.on_Set_coloreq, self.btn_coloreq)
         self.Bind(wx.EVT_BUTTON, self.on_video_preview, self.btn_preview)
+        self.Bind(wx.EVT_BUTTON, self.on_live_preview, self.btn_livepreview)
         self.Bind(wx.EVT_BUTTON, self.on_vfilters_clear, self.btn_reset)
         self.Bind(wx.EVT_BUTTON, self.on_audio_preview,
                   self.audioenc.btn_audio_preview)
@@ -405,6 +416,8 @@ class AV_Conv(wx.Panel):
             self.audioenc.normalize_default()
         if self.opt["VFilters"]:
             self.on_vfilters_clear(self)
+        if self.livepreview and self.livepreview.IsShown():
+            self.livepreview.Close()
     # -------------------------------------------------------------------#
 
     def vencoder_panel_set(self, default=False):
@@ -552,6 +565,38 @@ class AV_Conv(wx.Panel):
             return
     # ------------------------------------------------------------------#
 
+    def on_live_preview(self, event):
+        """
+        Show the live preview of the video filters on
+        the selected file, see `update_live_preview`.
+        """
+        kwa = self.get_video_stream()
+        if not kwa:
+            return
+        if not self.livepreview:
+            self.livepreview = LivePreview(self)
+        self.livepreview.set_source(kwa['filename'], kwa['duration'])
+        self.livepreview.Show()
+        self.update_live_preview()
+    # ------------------------------------------------------------------#
+
+    def update_live_preview(self):
+        """
+        Send the enabled video filters to the live preview,
+        if shown. The stabilizer filters are left out, they
+        need the motion detection pass of the whole segment.
+        """
+        if not self.livepreview or not self.livepreview.IsShown():
+            return
+        orderf = (self.opt['Deinterlace'], self.opt['Interlace'],
+                  self.opt["Denoiser"], self.opt['Crop'], self.opt['Scale'],
+                  self.opt["Setdar"], self.opt["Setsar"],
+                  self.opt['Orientation'][0], self.opt["ColorEQ"],
+                  )  # same order as `chain_all_video_filters`
+        self.livepreview.set_filters(','.join(flt for flt in orderf
+                                              if flt))
+    # ------------------------------------------------------------------#
+
     def on_audio_preview(self, event):
         """
         Button event for button preview on `self.audioenc`.
@@ -584,6 +629,7 @@ class AV_Conv(wx.Panel):
             self.btn_coloreq.SetBackgroundColour(wx.NullColour)
             self.btn_preview.Disable()
             self.btn_reset.Disable()
+            self.update_live_preview()
     # ------------------------------------------------------------------#
 
     def file_selection(self):
@@ -656,6 +702,7 @@ class AV_Conv(wx.Panel):
         else:
             self.opt["VFilters"] = ""
             self.btn_preview.Disable(), self.btn_reset.Disable()
+        self.update_live_preview()
     # ------------------------------------------------------------------#
 
     def on_Set_scale(self, event):
@@ -998,11 +1045,14 @@ class AV_Conv(wx.Panel):
         if self.opt["EBU"][0] == 'EBU R128 (High-Quality)':
 
             if self.opt["Passes"] == '2':
+                # single decoding with two outputs: the video analysis
+                # (vidstabdetect and first pass stats) and loudnorm
                 cmd1 = (f'{self.opt["CmdVideoParams"]} '
                         f'-filter:v {self.opt["Vidstabdetect"]} '
-                        f'{self.opt["passlogfile1"]} {self.opt["AudioIndex"]} '
-                        f'-filter:a: {self.opt["EBU"][1]} -sn -dn '
-                        f'-f {AV_Conv.MUXERS[self.opt["OutputFormat"]]}'
+                        f'{self.opt["passlogfile1"]} -an -sn -dn '
+                        f'-f {AV_Conv.MUXERS[self.opt["OutputFormat"]]} '
+                        f'{NUL} {self.opt["AudioIndex"]} '
+                        f'-filter:a: {self.opt["EBU"][1]} -vn -sn -dn -f null'
                         )
                 cmd2 = (f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]} '
                         f'{self.opt["passlogfile2"]} '
@@ -1124,10 +1174,13 @@ class AV_Conv(wx.Panel):
                       }
         elif self.opt["Passes"] == "2":
 
+            # single decoding with two outputs: the video
+            # first pass stats and the loudnorm measurement
             cmd_1 = (f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]} '
-                     f'{self.opt["passlogfile1"]} {self.opt["AudioIndex"]} '
-                     f'-filter:a: {self.opt["EBU"][1]} '
-                     f'-sn -dn -f {AV_Conv.MUXERS[self.opt["OutputFormat"]]}'
+                     f'{self.opt["passlogfile1"]} -an -sn -dn '
+                     f'-f {AV_Conv.MUXERS[self.opt["OutputFormat"]]} {NUL} '
+                     f'{self.opt["AudioIndex"]} '
+                     f'-filter:a: {self.opt["EBU"][1]} -vn -sn -dn -f null'
                      )
             cmd_2 = (f'{self.opt["CmdVideoParams"]} {self.opt["VFilters"]} '
                      f'{self.opt["passlogfile2"]} '
@@ -1291,7 +1344,7 @@ class AV_Conv(wx.Panel):
         else:
             kwargs["volume"] = ''
 
-        cmd = get_raw_cmdline_args(**kwargs)
+        cmd = get_raw_cmdline_args(self.appdata, **kwargs)
 
         displaycmd = Raw_Cmd_Line(self, *cmd)
         displaycmd.ShowModal()
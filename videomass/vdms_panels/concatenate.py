@@ -28,8 +28,13 @@ import os
 import wx
 import wx.lib.agw.hyperlink as hpl
 from videomass.vdms_dialogs.widget_utils import NormalTransientPopup
-from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_utils.utils import integer_to_time, write_concat_list
 from videomass.vdms_io.checkup import check_files
+from videomass.vdms_io.stream_signature import (signature,
+                                                compare_signatures,
+                                                normalizable,
+                                                normalize_args,
+                                                )
 from videomass.vdms_dialogs.epilogue import Formula
 
 
@@ -38,37 +43,27 @@ def compare_media_param(data):
     This function expects json data from FFprobe to checks
     that the indexed streams of each item in the list have
     the same codec, video size and audio sample rate in order
-    to ensure correct file concatenation.
+    to ensure correct file concatenation, by comparing their
+    stream signatures (see `stream_signature`).
     Returns an error message if any error found,
-    Returns None otherwise.
+    Returns a tuple (None, media type, reference index, odd
+    indexes) otherwise, where odd are the indexes of the files
+    to re-encode as the reference file before concatenation.
     """
     if len(data) == 1:
         return ('error',
                 _('At least two files are required to perform concatenation.'))
-    com = {}
-    mediatype = []
-    for streams in data:
-        name = streams.get('format').get('filename')
-        com[name] = {}
-        for items in streams.get('streams'):
-            mediatype.append(items.get('codec_type'))
-            if items.get('codec_type') == 'video':
-                com[name][items.get('index')] = [items.get('codec_name')]
-                size = f"{items.get('width')}x{items.get('height')}"
-                com[name][items.get('index')].append(size)
-            if items.get('codec_type') == 'audio':
-                com[name][items.get('index')] = [items.get('codec_name')]
-                com[name][items.get('index')].append(items.get('sample_rate'))
-    if not com:
+    reference, odd = compare_signatures(data)
+    if reference is None:
         return ('error', _('Invalid data found'))
 
-    totest = list(com.values())[0]
-    if not all(val == totest for val in com.values()):
+    if not all(normalizable(data[num], data[reference]) for num in odd):
         return ('error',
                 _('The files do not have the same "codec_types", '
                   'same "sample_rate" or same "width" or "height". '
                   'Unable to proceed.'))
-    return None, mediatype[0]
+    mediatype = signature(data[0])['streams'][0][0]
+    return None, mediatype, reference, odd
 # -------------------------------------------------------------------------
 
 
@@ -93,7 +88,10 @@ class Conc_Demuxer(wx.Panel):
               "codecs and same\n  width/height, but can be wrapped in "
               "different container formats."
               "\n\n- Audio files must have exactly the same formats, "
-              "same codecs with equal sample rate.")
+              "same codecs with equal sample rate."
+              "\n\n- Files with the same kind of streams but different "
+              "codecs or params are\n  re-encoded as most of the other "
+              "files before the concatenation.")
 
     # ----------------------------------------------------------------#
 
@@ -104,11 +102,13 @@ class Conc_Demuxer(wx.Panel):
         get = wx.GetApp()  # get data from bootstrap
         self.appdata = get.appset
         self.cachedir = self.appdata['cachedir']
+        self.ftext = os.path.join(self.cachedir, 'tmp', 'flist.txt')
         self.parent = parent  # parent is the MainFrame
         self.args = ''
         self.duration = None
         self.ext = None
         self.mediatype = None
+        self.normalize = []
 
         wx.Panel.__init__(self, parent, -1, style=wx.BORDER_THEME)
 
@@ -179,7 +179,6 @@ class Conc_Demuxer(wx.Panel):
 
         """
         fsource = self.parent.file_src
-        ftext = os.path.join(self.cachedir, 'tmp', 'flist.txt')
 
         diff = compare_media_param(self.parent.data_files)
         if diff[0] == 'error':
@@ -188,17 +187,15 @@ class Conc_Demuxer(wx.Panel):
             return
 
         self.mediatype = diff[1]
-        textstr = []
         self.ext = os.path.splitext(self.parent.file_src[0])[1].split('.')[1]
+        data = self.parent.data_files
+        self.normalize = [(num, normalize_args(data[num], data[diff[2]],
+                                               self.ext)) for num in diff[3]]
         self.duration = sum(self.parent.duration)
-        for f in self.parent.file_src:
-            escaped = f.replace(r"'", r"'\''")  # need escaping some chars
-            textstr.append(f"file '{escaped}'")
-        self.args = (f'"{ftext}" -map 0:v? -map_chapters 0 '
+        self.args = (f'"{self.ftext}" -map 0:v? -map_chapters 0 '
                      f'-map 0:s? -map 0:a? -map_metadata 0 -c copy')
 
-        with open(ftext, 'w', encoding='utf-8') as txt:
-            txt.write('\n'.join(textstr))
+        write_concat_list(fsource, self.ftext)
 
         checking = check_files((fsource[0],),
                                self.appdata['outputdir'],
@@ -226,9 +223,10 @@ class Conc_Demuxer(wx.Panel):
                   'nmax': len(filesrc), 'duration': self.duration,
                   'start-time': '', 'end-time': '',
                   'preset name': 'Concatenate media files',
+                  'normalize': self.normalize, 'listfile': self.ftext,
                   }
         keyval = self.update_dict(newfile, os.path.dirname(newfile))
-        ending = Formula(self, (700, 170),
+        ending = Formula(self, (700, 190),
                          self.parent.movetotrash,
                          self.parent.emptylist,
                          **keyval,
@@ -250,10 +248,11 @@ class Conc_Demuxer(wx.Panel):
         dur = integer_to_time(self.duration)
         dest = os.path.join(destdir, newfile)
 
-        keys = (_("Items to concatenate\nFile destination\nOutput Format"
+        keys = (_("Items to concatenate\nItems to re-encode\n"
+                  "File destination\nOutput Format"
                   "\nOutput multimedia type\nDuration"
                   ))
-        vals = (f"{lenfile}\n{dest}\n{self.ext}\n"
+        vals = (f"{lenfile}\n{len(self.normalize)}\n{dest}\n{self.ext}\n"
                 f"{self.mediatype}\n{dur}")
 
         return {'key': keys, 'val': vals}
@@ -29,7 +29,7 @@ import re
 import wx
 from pubsub import pub
 from videomass.vdms_threads.ffplay_file import FilePlay
-from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.probe_files import ProbeFiles
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import to_bytes
 from videomass.vdms_dialogs.renamer import Renamer
@@ -116,74 +116,144 @@ class MyListCtrl(wx.ListCtrl):
         self.duration = self.parent.duration
         self.outputnames = self.parent.outputnames
         self.errors = {}
+        self.importer = None  # ProbeFiles thread, if running
+        self.progdlg = None  # wx.ProgressDialog during import
+        self.imported = 0  # files probed so far
         wx.ListCtrl.__init__(self,
                              parent,
                              style=wx.LC_REPORT
                              | wx.LC_SINGLE_SEL,
                              )
+        pub.subscribe(self.on_probe_result, "PROBE_RESULT_EVT")
+        pub.subscribe(self.on_probe_end, "PROBE_END_EVT")
     # ----------------------------------------------------------------------#
 
-    def dropUpdate(self, path, newname=None):
+    def check_path(self, path, accepted=()):
         """
-        Update list-control during drag and drop.
-        Note that the optional 'newname' argument is given by
-        the 'on_col_click' method in the 'FileDnD' class to preserve
-        the related renames in column 5 of wx.ListCtrl.
-
+        Checks whether the given path can be added to the file list.
+        The `accepted` arg are the paths already accepted during the
+        same import. Return True if accepted, False otherwise; in
+        the latter case the reason is added to `self.errors`.
         """
-        self.index = self.GetItemCount()
         warn = fullpathname_sanitize(path)  # check for fullname sanitize
         if warn:
             self.errors[f'"{path}"'] = warn
+            return False
+
+        if path in self.file_src or path in accepted:
+            mess = _("Duplicate file, it has already been added to the list.")
+            self.errors[f'"{path}"'] = mess
+            return False
+
+        return True
+    # ----------------------------------------------------------------------#
+
+    def import_files(self, paths):
+        """
+        Adds the given paths to the list-control. Media properties
+        are obtained by a background thread using concurrent ffprobe
+        processes, so that the GUI stays responsive even with
+        thousands of files. Rows are inserted in the same order as
+        `paths` as soon as the results arrive. Rejected files are
+        shown at the end by `rejected_files` method.
+        """
+        accepted = []
+        for path in paths:
+            if self.check_path(path, accepted):
+                accepted.append(path)
+
+        if not accepted:
+            self.rejected_files()
             return
 
-        if not [x for x in self.data if x['format']['filename'] == path]:
-            probe = ffprobe(path, cmd=self.appdata['ffprobe_cmd'],
-                            txtenc=self.appdata['encoding'],
-                            hide_banner=None, pretty=None)
-            if probe[1]:
-                self.errors[f'"{path}"'] = probe[1]
-                return
+        self.imported = 0
+        self.progdlg = wx.ProgressDialog(_('Import files'),
+                                         _('Getting media properties...'),
+                                         maximum=len(accepted),
+                                         parent=self.GetTopLevelParent(),
+                                         style=wx.PD_CAN_ABORT
+                                         | wx.PD_APP_MODAL
+                                         | wx.PD_AUTO_HIDE
+                                         | wx.PD_ELAPSED_TIME
+                                         | wx.PD_REMAINING_TIME
+                                         )
+        self.importer = ProbeFiles(accepted,
+                                   self.appdata['max_probe_workers'])
+    # ----------------------------------------------------------------------#
 
-            probe = probe[0]
-            self.InsertItem(self.index, str(self.index + 1))
-            self.SetItem(self.index, 1, path)
+    def on_probe_result(self, path, probe, error):
+        """
+        Receive messages from `ProbeFiles` thread by pubsub
+        "PROBE_RESULT_EVT" protocol.
+        """
+        if error:
+            self.errors[f'"{path}"'] = error
+        elif probe:
+            self.add_probed_item(path, probe)
 
-            if 'duration' not in probe['format'].keys():
-                self.SetItem(self.index, 2, 'N/A')
-                # NOTE these are my custom adds to probe data
-                probe['format']['time'] = '00:00:00.000'
-                probe['format']['duration'] = 0
+        self.imported += 1
+        if self.progdlg:
+            cont = self.progdlg.Update(self.imported,
+                                       os.path.basename(path))[0]
+            if not cont:
+                self.importer.stop()
+    # ----------------------------------------------------------------------#
 
-            else:
-                tdur = probe['format']['duration'].split(':')
-                sec, msec = tdur[2].split('.')[0], tdur[2].split('.')[1]
-                tdur = f'{tdur[0]}h : {tdur[1]}m : {sec} : {msec}'
-                self.SetItem(self.index, 2, tdur)
-                probe['format']['time'] = probe.get('format').pop('duration')
-                time = time_to_integer(probe.get('format')['time'])
-                probe['format']['duration'] = time
-
-            media = probe['streams'][0]['codec_type']
-            formatname = probe['format']['format_long_name']
-            self.SetItem(self.index, 3, f'{media}: {formatname}')
-            self.SetItem(self.index, 4, probe['format']['size'])
-            if newname:
-                self.SetItem(self.index, 5, newname)
-                self.outputnames.append(newname)
-            else:
-                fname = os.path.splitext(os.path.basename(path))[0]
-                self.SetItem(self.index, 5, fname)
-                self.outputnames.append(fname)
-            self.index += 1
-            self.data.append(probe)
-            self.file_src.append(path)
-            self.duration.append(probe['format']['duration'])
-            # self.parent.statusbar_msg('', None)
+    def on_probe_end(self, stopped):
+        """
+        Receive messages from `ProbeFiles` thread by pubsub
+        "PROBE_END_EVT" protocol.
+        """
+        self.importer.join()
+        self.importer = None
+        if self.progdlg:
+            self.progdlg.Destroy()
+            self.progdlg = None
+        if self.GetItemCount():
             self.parent.changes_in_progress()
+        self.rejected_files()
+    # ----------------------------------------------------------------------#
+
+    def add_probed_item(self, path, probe):
+        """
+        Adds a new row to the list-control using the `probe`
+        data given by ffprobe.
+        """
+        if 'duration' not in probe['format'].keys():
+            tdur = 'N/A'
+            # NOTE these are my custom adds to probe data
+            probe['format']['time'] = '00:00:00.000'
+            probe['format']['duration'] = 0
+
         else:
-            mess = _("Duplicate file, it has already been added to the list.")
-            self.errors[f'"{path}"'] = mess
+            tdur = probe['format']['duration'].split(':')
+            sec, msec = tdur[2].split('.')[0], tdur[2].split('.')[1]
+            tdur = f'{tdur[0]}h : {tdur[1]}m : {sec} : {msec}'
+            probe['format']['time'] = probe.get('format').pop('duration')
+            time = time_to_integer(probe.get('format')['time'])
+            probe['format']['duration'] = time
+
+        media = probe['streams'][0]['codec_type']
+        formatname = probe['format']['format_long_name']
+        fname = os.path.splitext(os.path.basename(path))[0]
+        self.insert_row((path, tdur, f'{media}: {formatname}',
+                         probe['format']['size'], fname), probe)
+    # ----------------------------------------------------------------------#
+
+    def insert_row(self, columns, probe):
+        """
+        Appends a row to the list-control along with its data.
+        `columns` are the texts of the columns from 1 to 5.
+        """
+        self.index = self.GetItemCount()
+        self.InsertItem(self.index, str(self.index + 1))
+        for col, text in enumerate(columns, 1):
+            self.SetItem(self.index, col, text)
+        self.index += 1
+        self.data.append(probe)
+        self.file_src.append(columns[0])
+        self.duration.append(probe['format']['duration'])
+        self.outputnames.append(columns[4])
     # ----------------------------------------------------------------------#
 
     def rejected_files(self):
@@ -220,9 +290,9 @@ class FileDrop(wx.FileDropTarget):
         When files are dropped, write where they were dropped and then
         the file paths themselves
         """
-        for filepath in filenames:
-            self.window.dropUpdate(filepath)  # update list control
-        self.window.rejected_files()  # call parent.rejected_files at end
+        if self.window.importer:  # an import is already in progress
+            return False
+        self.window.import_files(filenames)  # update list control
 
         return True
     # ----------------------------------------------------------------------#
@@ -421,7 +491,8 @@ class FileDnD(wx.Panel):
         (from ascending to descending and back to ascending).
         For this feature is required to delete all items from
         listctrl and data list before re-loading the same
-        items with the new sorted order using `dropUpdate` method.
+        items with the new sorted order using `insert_row` method.
+        The media properties already obtained are reused.
 
         if plane to use wx.EVT_LIST_COL_RIGHT_CLICK event:
             `if event.GetEventType() == wx.EVT_LIST_COL_RIGHT_CLICK.typeId:`
@@ -435,23 +506,23 @@ class FileDnD(wx.Panel):
                 return
 
             for x in range(count):
-                curritems.append((self.flCtrl.GetItemText(x, col=1),
-                                  self.flCtrl.GetItemText(x, col=2),
-                                  self.flCtrl.GetItemText(x, col=3),
-                                  self.flCtrl.GetItemText(x, col=4),
-                                  self.flCtrl.GetItemText(x, col=5),
-                                  ))
+                curritems.append(((self.flCtrl.GetItemText(x, col=1),
+                                   self.flCtrl.GetItemText(x, col=2),
+                                   self.flCtrl.GetItemText(x, col=3),
+                                   self.flCtrl.GetItemText(x, col=4),
+                                   self.flCtrl.GetItemText(x, col=5),
+                                   ), self.data[x]))
             if event.GetColumn() == 1:
-                curritems.sort(key=lambda item: item[0])
+                curritems.sort(key=lambda item: item[0][0])
             elif event.GetColumn() == 2:
-                curritems.sort(key=lambda item: item[1])
+                curritems.sort(key=lambda item: item[0][1])
             elif event.GetColumn() == 3:
-                curritems.sort(key=lambda item: item[2])
+                curritems.sort(key=lambda item: item[0][2])
             elif event.GetColumn() == 4:
                 curritems.sort(key=lambda item:
-                               to_bytes(''.join(item[3].split())))
+                               to_bytes(''.join(item[0][3].split())))
             elif event.GetColumn() == 5:
-                curritems.sort(key=lambda item: item[4])
+                curritems.sort(key=lambda item: item[0][4])
 
             self.delete_all(None, setstate=False)  # no event, no setstate here
 
@@ -465,8 +536,9 @@ class FileDnD(wx.Panel):
             if self.sortingstate == 'descending':
                 curritems.reverse()
 
-            for data in curritems:
-                self.flCtrl.dropUpdate(data[0], data[4])
+            for columns, probe in curritems:
+                self.flCtrl.insert_row(columns, probe)
+            self.changes_in_progress()
     # ----------------------------------------------------------------------
 
     def changes_in_progress(self, setfocus=True):
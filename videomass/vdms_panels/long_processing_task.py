@@ -30,12 +30,17 @@ from shutil import move
 from pubsub import pub
 import wx
 from videomass.vdms_dialogs.widget_utils import notification_area
-from videomass.vdms_io.make_filelog import make_log_template
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            flush_logs,
+                                            LOGWRITER,
+                                            )
 from videomass.vdms_threads.ffmpeg import FFmpeg
 from videomass.vdms_threads.image_extractor import PicturesFromVideo
 from videomass.vdms_threads.concat_demuxer import ConcatDemuxer
 from videomass.vdms_threads.slideshow import SlideshowMaker
-from videomass.vdms_utils.utils import (time_to_integer, integer_to_time)
+from videomass.vdms_threads.progress_channel import parse_progress
+from videomass.vdms_utils.utils import integer_to_time
+from videomass.vdms_utils.queue_utils import queue_state
 from videomass.vdms_io import io_tools
 
 
@@ -68,36 +73,6 @@ def delete_file_source(flist, trashdir):
                 move(name, dest)
 
 
-def pairwise(iterable):
-    """
-    Return a zip object from iterable.
-    This function is used by the update_display method.
-    ----
-    USE:
-
-    after splitting ffmpeg's progress strings such as:
-    output = "frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02
-              bitrate= 435.0kbits/s speed=5.15x  "
-    in a list as:
-    iterable = ['frame', '1178', 'fps', '155', 'q', '29.0', 'size', '2072kB',
-                'time', '00:00:39.02', 'bitrate', '435.0kbits/s', speed',
-                '5.15x']
-    1)
-        for x, y in pairwise(iterable):
-            x, y
-    2)
-        dict(pairwise(iterable))
-
-    Return: a zip object pairs from list iterable object.
-
-    <https://stackoverflow.com/questions/5389507/iterating-over-every-
-    two-elements-in-a-list>
-    """
-    itobj = iter(iterable)  # list_iterator object
-    return zip(itobj, itobj)  # zip object pairs from list iterable object
-# ----------------------------------------------------------------------#
-
-
 class LogOut(wx.Panel):
     """
     displays a text control for the output logging, a progress bar
@@ -141,6 +116,7 @@ class LogOut(wx.Panel):
         self.logfile = None  # log pathname, None otherwise
         self.result = []  # result of the final process
         self.count = 0  # keeps track of the counts (see `update_count`)
+        self.jobs = {}  # progress of parallel jobs {jobid: msec}
         self.clr = self.appdata['colorscheme']
 
         wx.Panel.__init__(self, parent=parent)
@@ -157,6 +133,15 @@ class LogOut(wx.Panel):
                                   | wx.TE_READONLY
                                   | wx.TE_RICH2
                                   )
+        self.joblist = wx.ListCtrl(self, wx.ID_ANY, size=(-1, 130),
+                                   style=wx.LC_REPORT | wx.SUNKEN_BORDER
+                                   | wx.LC_SINGLE_SEL,
+                                   )
+        self.joblist.InsertColumn(0, '#', width=40)
+        self.joblist.InsertColumn(1, _('File'), width=450)
+        self.joblist.InsertColumn(2, _('Progress'), width=100)
+        self.joblist.InsertColumn(3, _('Status'), width=150)
+        self.joblist.Hide()
         self.barprog = wx.Gauge(self, wx.ID_ANY, range=0)
         self.labprog = wx.StaticText(self, label="")
         self.labffmpeg = wx.StaticText(self, label="")
@@ -165,6 +150,7 @@ class LogOut(wx.Panel):
         sizer.Add(lbl, 0, wx.ALL, 5)
         sizer.Add(self.txtout, 1, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.btn_viewlog, 0, wx.ALL, 5)
+        sizer.Add(self.joblist, 0, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.barprog, 0, wx.EXPAND | wx.ALL, 5)
         sizer.Add(self.labprog, 0, wx.ALL, 5)
         sizer.Add(self.labffmpeg, 0, wx.ALL, 5)
@@ -180,8 +166,12 @@ class LogOut(wx.Panel):
         self.Bind(wx.EVT_BUTTON, self.view_log, self.btn_viewlog)
 
         pub.subscribe(self.update_display, "UPDATE_EVT")
+        pub.subscribe(self.update_progress, "PROGRESS_EVT")
         pub.subscribe(self.update_count, "COUNT_EVT")
         pub.subscribe(self.end_proc, "END_EVT")
+        pub.subscribe(self.start_jobs, "JOBS_START_EVT")
+        pub.subscribe(self.update_job, "JOB_UPDATE_EVT")
+        pub.subscribe(self.update_job_count, "JOB_COUNT_EVT")
     # ----------------------------------------------------------------------
 
     def view_log(self, event):
@@ -189,6 +179,7 @@ class LogOut(wx.Panel):
         Opens the log file corresponding to the last executed process.
         """
         if self.logfile:
+            flush_logs(self.logfile)
             fname = str(self.logfile)
             if os.path.exists(fname) and os.path.isfile(fname):
                 io_tools.openpath(fname)
@@ -208,15 +199,21 @@ class LogOut(wx.Panel):
         self.labprog.SetLabel('')
         self.labffmpeg.SetLabel('')
         self.btn_viewlog.Disable()
+        if self.joblist.IsShown():
+            self.joblist.Hide()
+            self.Layout()
 
         self.logfile = make_log_template(args[1],
                                          self.appdata['logdir'],
                                          mode,  # w or a
                                          )
         if args[0] in ('One pass', 'Two pass', 'Two pass EBU',
-                       'Two pass VIDSTAB', 'Queue Processing'):
+                       'Two pass VIDSTAB'):
             self.thread_type = FFmpeg(self.logfile, data)
 
+        elif args[0] == 'Queue Processing':
+            self.thread_type = FFmpeg(self.logfile, data, queue_state())
+
         elif args[0] == 'video_to_sequence':
             self.with_eta = False
             self.thread_type = PicturesFromVideo(self.logfile, **data)
@@ -230,31 +227,39 @@ class LogOut(wx.Panel):
             self.thread_type = ConcatDemuxer(self.logfile, **data)
     # ----------------------------------------------------------------------
 
-    def append_messages(self, output):
+    def append_messages(self, lines):
         """
         Append all others lines on the textctrl and log file.
         Since not all ffmpeg messages are errors, sometimes
         it happens to see more output marked with yellow color.
+        Consecutive lines with the same color are appended at once.
         """
-        with open(self.logfile, "a", encoding='utf-8') as logerr:
-            logerr.write(f"[FFMPEG]: {output}")
+        LOGWRITER.write(self.logfile,
+                        ''.join([f"[FFMPEG]: {line}" for line in lines]))
 
-        if [x for x in ('info', 'Info') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['INFO']))
-            self.txtout.AppendText(f'{output}')
+        runs = []  # [[color, text], ...]
+        for output in lines:
+            if [x for x in ('info', 'Info') if x in output]:
+                color = self.clr['INFO']
 
-        elif [x for x in ('Failed', 'failed', 'Error', 'error')
-                if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR0']))
-            self.txtout.AppendText(f'{output}')
+            elif [x for x in ('Failed', 'failed', 'Error', 'error')
+                    if x in output]:
+                color = self.clr['ERR0']
 
-        elif [x for x in ('warning', 'Warning', 'warn') if x in output]:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['WARN']))
-            self.txtout.AppendText(f'{output}')
+            elif [x for x in ('warning', 'Warning', 'warn') if x in output]:
+                color = self.clr['WARN']
 
-        else:
-            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT3']))
-            self.txtout.AppendText(f'{output}')
+            else:
+                color = self.clr['TXT3']
+
+            if runs and runs[-1][0] == color:
+                runs[-1][1] += output
+            else:
+                runs.append([color, output])
+
+        for color, text in runs:
+            self.txtout.SetDefaultStyle(wx.TextAttr(color))
+            self.txtout.AppendText(text)
     # ----------------------------------------------------------------------
 
     def update_display(self, output, duration, status):
@@ -274,42 +279,60 @@ class LogOut(wx.Panel):
             self.result.append('failed')
             return  # must be return here
 
-        if 'time=' in output:  # ...in processing
-            i = output.index('time=') + 5
-            pos = output[i:].split()[0]
-            msec = time_to_integer(pos)
+        progress = parse_progress(output)
+        if progress:  # ...in processing
+            self.show_progress(progress, duration)
+        else:
+            self.append_messages([output])
+    # ----------------------------------------------------------------------
 
-            if msec > duration:
-                self.barprog.SetValue(duration)
-            elif msec == 0:
-                self.barprog.SetValue(self.barprog.GetValue())
-            else:
-                self.barprog.SetValue(msec)
-
-            percentage = round((msec / duration) * 100 if
-                               duration != 0 else 100)
-            out = [a for a in "=".join(output.split()).split('=') if a]
-            ffprog = []
-            for key, val in pairwise(out):
-                ffprog.append(f"{key}: {val}")
-            if self.with_eta:
-                if 'speed=' in output:
-                    speed = output.split('speed=')[-1].strip().split('x')[0]
-                    if speed in ('N/A', '0') or 'N/A' in speed:
-                        eta = "   ETA: N/A"
-                    else:  # is float
-                        rem = (duration - msec) / float(speed)
-                        remaining = integer_to_time(round(rem))
-                        eta = f"   ETA: {remaining}"
-                else:
-                    eta = "   ETA: N/A"
-            else:
-                eta = ""
-            self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
-            self.labffmpeg.SetLabel(' | '.join(ffprog))
+    def update_progress(self, progress, lines, duration):
+        """
+        Receive messages from thread by pubsub PROGRESS_EVT protocol,
+        see `ProgressChannel` class. `progress` is the last progress
+        dict or `None`, `lines` is a list of all the other messages
+        received since the previous event.
+        """
+        if lines:
+            self.append_messages(lines)
+        if progress:
+            self.show_progress(progress, duration)
+    # ----------------------------------------------------------------------
+
+    def show_progress(self, progress, duration):
+        """
+        Set the bar progress value and the percentage and ETA
+        labels from the given `progress` dict.
+        """
+        msec = progress['msec']
 
+        if msec > duration:
+            self.barprog.SetValue(duration)
+        elif msec == 0:
+            self.barprog.SetValue(self.barprog.GetValue())
+        else:
+            self.barprog.SetValue(msec)
+
+        percentage = round((msec / duration) * 100 if
+                           duration != 0 else 100)
+        ffprog = [f"{key}: {val}" for key, val in progress.items()
+                  if key != 'msec']
+        if self.with_eta:
+            speed = progress.get('speed', 'N/A').split('x')[0]
+            try:
+                speed = float(speed)
+            except ValueError:
+                speed = 0
+            if speed > 0:
+                rem = (duration - msec) / speed
+                remaining = integer_to_time(round(rem))
+                eta = f"   ETA: {remaining}"
+            else:
+                eta = "   ETA: N/A"
         else:
-            self.append_messages(output)
+            eta = ""
+        self.labprog.SetLabel(f'Processing: {str(int(percentage))}% {eta}')
+        self.labffmpeg.SetLabel(' | '.join(ffprog))
     # ----------------------------------------------------------------------
 
     def update_count(self, count, duration, end):
@@ -343,10 +366,98 @@ class LogOut(wx.Panel):
         self.count += 1
     # ----------------------------------------------------------------------
 
+    def start_jobs(self, jobs, maxjobs):
+        """
+        Receive messages from thread by pubsub JOBS_START_EVT
+        protocol when multiple jobs are run at the same time.
+        `jobs` is a list of (source, duration) tuples, where
+        duration is the sum of all the passes in milliseconds.
+        """
+        self.joblist.DeleteAllItems()
+        self.jobs = {num: [0, dur] for num, (_src, dur) in
+                     enumerate(jobs, 1)}
+        for num, (src, _dur) in enumerate(jobs, 1):
+            index = self.joblist.InsertItem(num - 1, str(num))
+            self.joblist.SetItem(index, 1, os.path.basename(src))
+            self.joblist.SetItem(index, 2, '0%')
+            self.joblist.SetItem(index, 3, _('Queued'))
+        self.joblist.Show()
+        self.Layout()
+        self.barprog.SetRange(max(1, sum(d for _s, d in jobs)))
+        self.barprog.SetValue(0)
+        self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
+        self.txtout.AppendText(_('\nRunning {0} files, {1} at a time\n'
+                                 ).format(len(jobs), maxjobs))
+        self.with_eta = False
+    # ----------------------------------------------------------------------
+
+    def update_job(self, jobid, progress, offset):
+        """
+        Receive progress messages of a single job by pubsub
+        JOB_UPDATE_EVT protocol. The `offset` is the progress
+        in milliseconds reached by the previous passes.
+        """
+        msec = progress['msec']
+        if not msec:
+            return
+        total = self.jobs[jobid][1]
+        self.jobs[jobid][0] = min(offset + msec, total)
+        percentage = round(self.jobs[jobid][0] / total * 100 if
+                           total else 100)
+        self.joblist.SetItem(jobid - 1, 2, f'{percentage}%')
+        self.update_jobs_progress()
+    # ----------------------------------------------------------------------
+
+    def update_jobs_progress(self):
+        """
+        Set the overall progress of the parallel jobs.
+        """
+        done = sum(p for p, d in self.jobs.values())
+        total = sum(d for p, d in self.jobs.values())
+        self.barprog.SetValue(min(done, self.barprog.GetRange()))
+        percentage = round(done / total * 100 if total else 100)
+        running = self.joblist.GetItemCount() - [
+            self.joblist.GetItemText(i, 3) for i in
+            range(self.joblist.GetItemCount())].count(_('Queued'))
+        self.labprog.SetLabel(_('Processing: {0}%   Jobs started: {1}/{2}'
+                                ).format(percentage, running, len(self.jobs)))
+    # ----------------------------------------------------------------------
+
+    def update_job_count(self, jobid, count, offset, end):
+        """
+        Receive messages from thread by pubsub JOB_COUNT_EVT protocol
+        when a job starts a pass ('CONTINUE') or is terminated
+        ('DONE', 'FAILED', 'STOP' or 'ERROR'). At the end of the job,
+        `count` contains all its log messages.
+        """
+        if end == 'CONTINUE':
+            self.joblist.SetItem(jobid - 1, 3, count.split('\n')[0])
+            self.update_jobs_progress()
+            return
+
+        status = {'DONE': _('Done'), 'FAILED': _('Failed'),
+                  'STOP': _('Stopped'), 'ERROR': _('Error')}
+        self.joblist.SetItem(jobid - 1, 3, status[end])
+        self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
+        self.txtout.AppendText(f'\n{count}')
+        if end == 'DONE':
+            self.jobs[jobid][0] = self.jobs[jobid][1]
+            self.joblist.SetItem(jobid - 1, 2, '100%')
+            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['SUCCESS']))
+            self.txtout.AppendText(f"{LogOut.MSG_done}\n")
+        elif end != 'STOP':
+            self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['ERR1']))
+            self.txtout.AppendText(f"{LogOut.MSG_failed}\n")
+            self.result.append('failed')
+        self.count += 1
+        self.update_jobs_progress()
+    # ----------------------------------------------------------------------
+
     def end_proc(self, filetotrash):
         """
         At the end of the process
         """
+        flush_logs(self.logfile)
         if self.error:
             self.txtout.SetDefaultStyle(wx.TextAttr(self.clr['TXT0']))
             self.txtout.AppendText(f"{LogOut.MSG_fatalerror}")
@@ -398,6 +509,7 @@ class LogOut(wx.Panel):
         self.parent.statusbar_msg(_("Please wait... interruption in progress"),
                                   LogOut.YELLOW, LogOut.BLACK)
         self.thread_type.join()
+        flush_logs(self.logfile)
         self.parent.statusbar_msg(_("...Interrupted"), None)
         self.abort = True
         # event.Skip()
@@ -412,6 +524,7 @@ class LogOut(wx.Panel):
         self.error = False
         self.result.clear()
         self.count = 0
+        self.jobs.clear()
         self.with_eta = True  # restoring time remaining display
         self.btn_viewlog.Enable()
     # ----------------------------------------------------------------------
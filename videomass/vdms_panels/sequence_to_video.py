@@ -33,6 +33,7 @@ from videomass.vdms_utils.get_bmpfromsvg import get_bmp
 from videomass.vdms_dialogs.epilogue import Formula
 from videomass.vdms_dialogs.filter_scale import Scale
 from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_io.data_cache import metadata_cache
 from videomass.vdms_utils.utils import trailing_name_with_prog_digit
 from videomass.vdms_utils.utils import time_to_integer
 from videomass.vdms_utils.utils import integer_to_time
@@ -99,7 +100,7 @@ class SequenceToVideo(wx.Panel):
         self.opt = {"Scale": "", "Setdar": "", "Setsar": "",
                     "RESIZE": "", "ADuration": 0, "AudioMerging": "",
                     "Map": "-map 0:v?", "Shortest": ["", "Disabled"],
-                    "Interval": "", "Clock": "00:00:00:000",
+                    "Interval": "", "Clock": "00:00:00:000", "Loop": False,
                     "Preinput": "1/0", "Fps": ["fps=10,", "10"],
                     }
 
@@ -471,7 +472,8 @@ class SequenceToVideo(wx.Panel):
                 return
             pathname = fdlg.GetPath()
 
-        probe = ffprobe(pathname, self.ffprobe_cmd, hide_banner=None)
+        probe = ffprobe(pathname, self.ffprobe_cmd,
+                        cache=metadata_cache(self.appdata), hide_banner=None)
 
         if probe[1]:  # some error
             msg = _("Invalid file: '{}'\n\n{}").format(pathname, probe[1])
@@ -515,6 +517,7 @@ class SequenceToVideo(wx.Panel):
         framerate = '-framerate 1/1' if not sec else f'-framerate 1/{sec}'
         self.opt["Preinput"] = f'{loop} {framerate}'
         self.opt["Interval"] = sec
+        self.opt["Loop"] = bool(loop)
 
         if self.txt_addparams.IsEnabled():
             addparam = self.txt_addparams.GetValue()
@@ -547,6 +550,7 @@ class SequenceToVideo(wx.Panel):
 
         self.opt["Preinput"] = f'-loop 1 -t {self.opt["Clock"]}'
         self.opt["Interval"] = sec
+        self.opt["Loop"] = True
 
         if self.txt_addparams.IsEnabled():
             addparam = self.txt_addparams.GetValue()
@@ -676,6 +680,7 @@ class SequenceToVideo(wx.Panel):
                   'args': args[0], 'nmax': countmax, 'duration': args[1],
                   'pre-input-1': self.opt["Preinput"],
                   'resize': self.opt["RESIZE"],
+                  'interval': self.opt["Interval"], 'loop': self.opt["Loop"],
                   'start-time': '', 'end-time': '',
                   'preset name': 'Still Image Maker',
                   }
@@ -36,6 +36,7 @@ from videomass.vdms_io.checkup import check_files
 from videomass.vdms_dialogs.epilogue import Formula
 from videomass.vdms_utils.utils import trailing_name_with_prog_digit
 from videomass.vdms_utils.utils import update_timeseq_duration
+from videomass.vdms_threads.frame_outputs import FrameOutput
 
 
 class VideoToSequence(wx.Panel):
@@ -126,6 +127,17 @@ class VideoToSequence(wx.Panel):
                                     )
         siz_ctrl.Add(self.cmb_frmt, 0, wx.ALL, 5)
         self.cmb_frmt.SetSelection(2)
+        siz_outputs = wx.BoxSizer(wx.HORIZONTAL)
+        boxctrl.Add(siz_outputs)
+        self.ckbx_full = wx.CheckBox(self, wx.ID_ANY,
+                                     _('Also save full-size frames'))
+        siz_outputs.Add(self.ckbx_full, 0, wx.ALL, 5)
+        self.ckbx_mosaic = wx.CheckBox(self, wx.ID_ANY,
+                                       _('Also save mosaics'))
+        siz_outputs.Add(self.ckbx_mosaic, 0, wx.ALL, 5)
+        self.ckbx_seek = wx.CheckBox(self, wx.ID_ANY,
+                                     _('Fast keyframe seeking'))
+        siz_outputs.Add(self.ckbx_seek, 0, wx.ALL, 5)
         siz_tile = wx.FlexGridSizer(4, 4, 0, 0)
         boxctrl.Add(siz_tile, 0, wx.TOP | wx.BOTTOM, 10)
         self.lbl_rows = wx.StaticText(self, wx.ID_ANY, label=_("Rows:"))
@@ -233,10 +245,22 @@ class VideoToSequence(wx.Panel):
         self.spin_pad.SetToolTip(tip)
         tip = _('Spaces around the mosaic borders. From 0 to 32 pixels')
         self.spin_marg.SetToolTip(tip)
+        tip = (_('Saves the thumbnails, the full-size frames and the '
+                 'mosaics by decoding the movie only once.'))
+        self.ckbx_full.SetToolTip(tip)
+        self.ckbx_mosaic.SetToolTip(tip)
+        tip = (_('Reads each thumbnail by seeking the nearest keyframe '
+                 'instead of decoding the whole movie, much faster with '
+                 'low rates on long movies. The thumbnails are taken on '
+                 'keyframes, so they may not be evenly spaced.'))
+        self.ckbx_seek.SetToolTip(tip)
 
         self.Bind(wx.EVT_BUTTON, self.on_help, btn_help)
         self.Bind(wx.EVT_CHECKBOX, self.on_edit, self.ckbx_edit)
         self.Bind(wx.EVT_RADIOBOX, self.on_options, self.rdbx_opt)
+        self.Bind(wx.EVT_CHECKBOX, self.on_mosaic, self.ckbx_mosaic)
+        self.Bind(wx.EVT_CHECKBOX, self.on_seek, self.ckbx_seek)
+        self.Bind(wx.EVT_COMBOBOX, self.on_format, self.cmb_frmt)
         self.Bind(wx.EVT_BUTTON, self.on_resizing, self.btn_resize)
     # --------------------------------------------------------------#
 
@@ -279,12 +303,16 @@ class VideoToSequence(wx.Panel):
             self.spin_cols.Disable()
             self.spin_pad.Disable()
             self.spin_marg.Disable()
+            self.ckbx_full.Disable()
+            self.ckbx_mosaic.Disable()
+            self.ckbx_seek.Disable()
             arg = self.update_arguments(self.cmb_frmt.GetValue())
             self.txt_args.write(arg[1])
         else:
             if self.rdbx_opt.GetSelection() == 0:
                 self.spin_rate.Enable()
                 self.lbl_rate.Enable()
+                self.on_format(self)
             if self.rdbx_opt.GetSelection() in (0, 1):
                 self.cmb_frmt.Enable()
                 self.lbl_frmt.Enable()
@@ -309,6 +337,14 @@ class VideoToSequence(wx.Panel):
         """
         Available user options
         """
+        self.ckbx_full.SetValue(False)
+        self.ckbx_mosaic.SetValue(False)
+        self.ckbx_seek.SetValue(False)
+        if self.rdbx_opt.GetSelection() != 0:
+            self.ckbx_full.Disable()
+            self.ckbx_mosaic.Disable()
+            self.ckbx_seek.Disable()
+
         if self.rdbx_opt.GetSelection() == 0:
             self.cmb_frmt.SetSelection(2)
             self.txt_args.Clear()
@@ -355,6 +391,101 @@ class VideoToSequence(wx.Panel):
             self.on_edit(self)
     # ------------------------------------------------------------------#
 
+    def on_mosaic(self, event):
+        """
+        Enable the mosaic controls if mosaics are saved
+        along with the thumbnails.
+        """
+        if self.rdbx_opt.GetSelection() != 0:
+            return
+        enable = self.ckbx_mosaic.IsChecked()
+        for ctrl in (self.lbl_rows, self.lbl_cols, self.lbl_pad,
+                     self.lbl_marg, self.spin_rows, self.spin_cols,
+                     self.spin_pad, self.spin_marg):
+            ctrl.Enable(enable)
+    # ------------------------------------------------------------------#
+
+    def on_seek(self, event):
+        """
+        The keyframe seeking and the animated gif format
+        save the thumbnails only.
+        """
+        only = (self.ckbx_seek.IsChecked()
+                or self.cmb_frmt.GetValue() == 'gif')
+        if only:
+            self.ckbx_full.SetValue(False)
+            self.ckbx_mosaic.SetValue(False)
+        self.ckbx_full.Enable(not only)
+        self.ckbx_mosaic.Enable(not only)
+        self.on_mosaic(self)
+    # ------------------------------------------------------------------#
+
+    def on_format(self, event):
+        """
+        The keyframe seeking saves an image file per seek and
+        the full-size frames and mosaics are image sequences,
+        so they are not available for the animated gif format.
+        """
+        if self.rdbx_opt.GetSelection() != 0 or self.ckbx_edit.IsChecked():
+            return
+        gif = self.cmb_frmt.GetValue() == 'gif'
+        if gif:
+            self.ckbx_seek.SetValue(False)
+        self.ckbx_seek.Enable(not gif)
+        self.on_seek(self)
+    # ------------------------------------------------------------------#
+
+    def seek_engine(self):
+        """
+        Returns True if the thumbnails are read by keyframe seeking.
+        """
+        return (self.rdbx_opt.GetSelection() == 0
+                and not self.txt_args.IsEnabled()
+                and self.ckbx_seek.IsChecked())
+    # ------------------------------------------------------------------#
+
+    def frame_outputs(self, outfilename):
+        """
+        Returns the list of `FrameOutput` to save the thumbnails
+        along with the full-size frames and/or the mosaics, or
+        by keyframe seeking. None if only the thumbnails are
+        saved from a single decoding.
+        """
+        if (self.rdbx_opt.GetSelection() != 0 or self.txt_args.IsEnabled()
+                or not (self.ckbx_full.IsChecked()
+                        or self.ckbx_mosaic.IsChecked()
+                        or self.ckbx_seek.IsChecked())):
+            return None
+
+        pixfmt = {'jpeg': '-pix_fmt yuvj420p', 'png': '-pix_fmt rgb24',
+                  'bmp': '-pix_fmt bgr24', 'gif': ''
+                  }[self.cmb_frmt.GetValue()]
+        rate = self.spin_rate.GetValue()
+        scale = self.opt["Scale"]
+        if self.opt["Setdar"]:
+            scale = f'{scale},{self.opt["Setdar"]}'
+        if self.opt["Setsar"]:
+            scale = f'{scale},{self.opt["Setsar"]}'
+        name, ext = os.path.splitext(outfilename)
+        if name.endswith('_%d'):
+            name = name[:-len('_%d')]
+        outputs = [FrameOutput(_('Thumbnails'), outfilename, rate,
+                               scale, pixfmt)]
+        if self.ckbx_full.IsChecked():
+            outputs.append(FrameOutput(_('Full-size frames'),
+                                       f'{name}_full_%d{ext}', rate, '',
+                                       pixfmt))
+        if self.ckbx_mosaic.IsChecked():
+            tile = (f'tile={self.spin_rows.GetValue()}x'
+                    f'{self.spin_cols.GetValue()}:'
+                    f'padding={self.spin_pad.GetValue()}:'
+                    f'margin={self.spin_marg.GetValue()}:color=White')
+            outputs.append(FrameOutput(_('Mosaics'),
+                                       f'{name}_mosaic_%d{ext}', rate,
+                                       f'{scale},{tile}', pixfmt))
+        return outputs
+    # ------------------------------------------------------------------#
+
     def file_selection(self):
         """
         Gets the selected file on files list and returns an object
@@ -558,12 +689,15 @@ class VideoToSequence(wx.Panel):
         dur, ss, et = update_timeseq_duration(self.parent.time_seq,
                                               self.parent.duration
                                               )
+        dur = [dur[self.parent.file_src.index(filename)]]  # selected only
         kwargs = {'logname': 'From Movie to Pictures.log',
                   'type': 'video_to_sequence', 'duration': dur,
                   'start-time': ss, 'end-time': et, 'filename': filename,
                   'outputdir': outputdir, 'args': command,
                   'pre-input-1': preargs,
                   'preset name': 'From Movies to Pictures',
+                  'outputs': self.frame_outputs(outfilename),
+                  'engine': 'seek' if self.seek_engine() else 'decode',
                   }
         keyval = self.update_dict(filename, outputdir)
         ending = Formula(self, (700, 280),
@@ -614,6 +748,11 @@ class VideoToSequence(wx.Panel):
             if self.rdbx_opt.GetSelection() == 0:
                 rate = self.spin_rate.GetValue()
                 rows, cols, pad, marg = '', '', '', ''
+                if self.ckbx_mosaic.IsChecked():
+                    rows = self.spin_rows.GetValue()
+                    cols = self.spin_cols.GetValue()
+                    pad = self.spin_pad.GetValue()
+                    marg = self.spin_marg.GetValue()
             elif self.rdbx_opt.GetSelection() == 1:
                 rate = ''
                 rows = self.spin_rows.GetValue()
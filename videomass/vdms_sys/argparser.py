@@ -6,7 +6,7 @@ Compatibility: Python3
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: May.29.2023
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -33,11 +33,19 @@ from videomass.vdms_sys.about_app import (RELNAME,
                                           VERSION,
                                           RELSTATE
                                           )
-try:
-    import wx
-    MSGWX = f"{wx.version()}"
-except ModuleNotFoundError as errwx:
-    MSGWX = f"not installed! ({errwx})"
+
+
+def wx_version():
+    """
+    Returns the wxPython version string. wxPython is imported
+    here only, so that the command line batch mode does not
+    require it.
+    """
+    try:
+        import wx  # pylint: disable=import-outside-toplevel
+        return f"{wx.version()}"
+    except ModuleNotFoundError as errwx:
+        return f"not installed! ({errwx})"
 
 
 def info_this_platform():
@@ -54,7 +62,7 @@ def info_this_platform():
                 f"Release: {osys[1]}\n"
                 f"Architecture: {platform.architecture()}\n"
                 f"Python: {sys.version}\n"
-                f"wxPython: {MSGWX}"
+                f"wxPython: {wx_version()}"
                 )
     return thisplat
 
@@ -87,6 +95,53 @@ def arguments():
                               ),
                         metavar='DIRNAME',
                         )
+    batch = parser.add_argument_group(
+        'batch mode', ('Run conversions without the graphical interface, '
+                       'writing the progress as JSON lines on the standard '
+                       'output. Exit status is 0 if all jobs are done, 1 if '
+                       'some of them failed, 2 on invalid arguments or '
+                       'input files and 130 if interrupted.'))
+    batch.add_argument('--run-queue',
+                       help='Run all the items of a saved queue file.',
+                       metavar='FILENAME',
+                       )
+    batch.add_argument('--resume',
+                       help=('With --run-queue, skip the items completed '
+                             'by a previous run whose output files are '
+                             'unchanged. The state of the items is saved '
+                             'to FILENAME.state next to the queue file.'),
+                       action="store_true",
+                       )
+    batch.add_argument('--preset',
+                       help=('Preset file (.json) or name of a preset of '
+                             'the user configuration folder to use with '
+                             '--profile.'),
+                       metavar='FILENAME',
+                       )
+    batch.add_argument('--profile',
+                       help='Name of the profile of the preset to apply.',
+                       metavar='NAME',
+                       )
+    batch.add_argument('-o', '--output-dir',
+                       help=('Output folder for --preset, default is the '
+                             'one set in the application preferences.'),
+                       metavar='DIRNAME',
+                       )
+    batch.add_argument('-j', '--jobs',
+                       help=('Number of parallel jobs, default is the one '
+                             'set in the application preferences.'),
+                       type=int,
+                       metavar='N',
+                       )
+    batch.add_argument('--overwrite',
+                       help='Overwrite existing output files.',
+                       action="store_true",
+                       )
+    batch.add_argument('inputs',
+                       help='Input files to convert with --preset.',
+                       nargs='*',
+                       metavar='INPUT',
+                       )
 
     argmts = parser.parse_args()
 
@@ -113,6 +168,20 @@ def arguments():
         print(info_this_platform())
         parser.exit(status=0, message=None)
 
+    elif argmts.run_queue or argmts.preset:
+        if argmts.run_queue and (argmts.preset or argmts.inputs):
+            parser.error('--run-queue cannot be used with --preset '
+                         'or input files')
+        if argmts.resume and not argmts.run_queue:
+            parser.error('--resume requires --run-queue')
+        if argmts.preset and not (argmts.profile and argmts.inputs):
+            parser.error('--preset requires --profile and input files')
+        if argmts.jobs is not None and argmts.jobs < 1:
+            parser.error('--jobs must be a positive number')
+        # pylint: disable=import-outside-toplevel
+        from videomass.vdms_sys.headless import run_headless
+        parser.exit(status=run_headless(vars(argmts)), message=None)
+
     else:
         print("Type -h for help.")
 
@@ -0,0 +1,492 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: headless.py
+Porpose: Run presets and queue files from the command line
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+This module must never import wxPython: it runs the same tasks
+of the GUI on machines without a display, using the command
+builders of `vdms_threads.cmd_builders`.
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import subprocess
+import contextlib
+from functools import partial
+from videomass.vdms_sys.argparser import arguments
+from videomass.vdms_sys.configurator import DataSource
+from videomass.vdms_utils.utils import Popen, time_to_integer
+from videomass.vdms_io.make_filelog import (make_log_template,
+                                            flush_logs,
+                                            tolog,
+                                            )
+from videomass.vdms_io.data_cache import metadata_cache
+from videomass.vdms_io.queue_state import QueueState
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.scheduler import JobScheduler
+from videomass.vdms_threads.progress_channel import (ProgressChannel,
+                                                     ProgressPipeReader,
+                                                     parse_progress)
+from videomass.vdms_threads.cmd_builders import (PROCESS_TYPES,
+                                                 MEASURED_MSG,
+                                                 build_jobs,
+                                                 )
+
+EXIT_OK = 0  # all the jobs are done
+EXIT_FAILED = 1  # one or more jobs failed
+EXIT_USAGE = 2  # invalid command line, configuration or input files
+EXIT_STOPPED = 130  # interrupted by the user (Ctrl+C)
+
+QUEUE_KEYS = ('type', 'args', 'extension', 'logname', 'source',
+              'preset name', 'destination', 'duration', 'start-time',
+              'end-time',)
+
+
+def load_configuration(make_portable=None):
+    """
+    Returns the application configuration dict like the GUI
+    bootstrap does. Startup messages are printed on the standard
+    error to keep the standard output for the progress stream.
+    Raises ValueError on errors.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        data = DataSource({'make_portable': make_portable})
+        appdata = data.get_configuration()
+    if appdata.get('ERROR'):
+        raise ValueError(appdata['ERROR'])
+    return appdata
+# ------------------------------------------------------------------------
+
+
+def load_queue(filename):
+    """
+    Load and validate a queue file saved by the Queue Manager.
+    Returns the list of jobs, raises ValueError on errors.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as fln:
+            jobs = json.load(fln)
+    except (OSError, json.decoder.JSONDecodeError) as err:
+        raise ValueError(f'{err}\nInvalid file: «{filename}»') from err
+
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError(f'Empty or invalid queue file: «{filename}»')
+    for job in jobs:
+        if any(key not in job for key in QUEUE_KEYS):
+            raise ValueError(f'Keys mismatched for requested data.\n'
+                             f'Invalid file: «{filename}»')
+        if job['type'] not in PROCESS_TYPES:
+            raise ValueError(f'Unsupported process type "{job["type"]}" '
+                             f'in «{filename}»')
+    dest = [job['destination'] for job in jobs]
+    if len(set(dest)) != len(dest):
+        raise ValueError(f'Cannot contain multiple occurrences in '
+                         f'`destination` keys value: «{filename}»')
+    return jobs
+# ------------------------------------------------------------------------
+
+
+def load_profile(filename, name, confdir):
+    """
+    Returns the profile `name` of the preset `filename`. If
+    `filename` does not exist it is looked up as a preset name
+    in the `presets` folder of the configuration directory.
+    Raises ValueError on errors.
+    """
+    if not os.path.isfile(filename):
+        filename = os.path.join(confdir, 'presets', f'{filename}.json')
+    try:
+        with open(filename, 'r', encoding='utf-8') as fln:
+            profiles = json.load(fln)
+    except (OSError, json.decoder.JSONDecodeError) as err:
+        raise ValueError(f'{err}\nInvalid preset: «{filename}»') from err
+
+    for profile in profiles:
+        if profile.get('Name') == name:
+            profile['Preset'] = os.path.splitext(
+                os.path.basename(filename))[0]
+            return profile
+    raise ValueError(f'Profile "{name}" not found in «{filename}»')
+# ------------------------------------------------------------------------
+
+
+def output_pathname(source, outputdir, suffix, extension):
+    """
+    Returns the output pathname of `source` with the same
+    rules used by `checkup.check_files`. If `outputdir` is
+    empty the output is saved next to the source file with
+    the given `suffix`. An empty `extension` keeps the source
+    extension (copy formats).
+    """
+    name, ext = os.path.splitext(os.path.basename(source))
+    ext = f'.{extension}' if extension else ext
+    if outputdir:
+        return os.path.join(outputdir, f'{name}{ext}')
+    return os.path.join(os.path.dirname(source), f'{name}{suffix}{ext}')
+# ------------------------------------------------------------------------
+
+
+def media_duration(appdata, source):
+    """
+    Returns the duration of `source` in milliseconds (0 if
+    unknown), raises ValueError if ffprobe fails.
+    """
+    probe, error = ffprobe(source,
+                           cmd=appdata['ffprobe_cmd'],
+                           txtenc=appdata['encoding'],
+                           cache=metadata_cache(appdata),
+                           hide_banner=None,
+                           pretty=None,
+                           )
+    if error:
+        raise ValueError(f'{error}\nInvalid file: «{source}»')
+    if 'duration' not in probe['format']:
+        return 0
+    return time_to_integer(probe['format']['duration'])
+# ------------------------------------------------------------------------
+
+
+def profile_jobs(appdata, profile, inputs, outputdir):
+    """
+    Returns the list of jobs to convert the `inputs` files
+    with a preset `profile`, like the Presets Manager batch
+    mode does. Raises ValueError on unsupported inputs.
+    """
+    supported = ''.join(profile['Supported_list'].split()).split(',')
+    extension = profile['Output_extension']
+    extension = '' if extension == 'copy' else extension
+    job = {'type': 'Two pass' if profile['Second_pass'] else 'One pass',
+           'args': [" ".join(profile['First_pass'].split()),
+                    " ".join(profile['Second_pass'].split())],
+           'pre-input-1': " ".join(profile.get('Preinput_1', '').split()),
+           'pre-input-2': " ".join(profile.get('Preinput_2', '').split()),
+           'preset name': f'Presets Manager - {profile["Preset"]}',
+           'logname': 'Presets Manager.log',
+           'extension': extension,
+           'start-time': '',
+           'end-time': '',
+           }
+    jobs = []
+    for source in inputs:
+        ext = os.path.splitext(source)[1].lstrip('.')
+        if supported != [''] and ext not in supported:
+            raise ValueError(f'Supports ({profile["Supported_list"]}) '
+                             f'formats only, not ({ext}): «{source}»')
+        jobs.append({**job,
+                     'source': source,
+                     'destination': output_pathname(source,
+                                                    outputdir,
+                                                    appdata['filesuffix'],
+                                                    extension),
+                     'duration': media_duration(appdata, source),
+                     })
+    return jobs
+# ------------------------------------------------------------------------
+
+
+def check_jobs(jobs, overwrite=False):
+    """
+    Check for missing sources, missing output folders and,
+    unless `overwrite` is True, already existing outputs.
+    Raises ValueError on errors.
+    """
+    for job in jobs:
+        if not os.path.isfile(job['source']):
+            raise ValueError(f'File not found: «{job["source"]}»')
+        dirname = os.path.dirname(os.path.abspath(job['destination']))
+        if not os.path.isdir(dirname):
+            raise ValueError(f'Output folder does not exist: «{dirname}»')
+        if not overwrite and os.path.exists(job['destination']):
+            raise ValueError(f'File already exists (use --overwrite): '
+                             f'«{job["destination"]}»')
+# ------------------------------------------------------------------------
+
+
+class BatchRunner:
+    """
+    Runs a list of jobs (the same dicts used by the `FFmpeg`
+    thread and by the queue files) without the GUI, up to
+    `maxjobs` at the same time.
+
+    The progress is written on `stream` as JSON lines, one
+    object for each event, with the "event" key set to:
+
+        "start"     {"jobs", "maxjobs", "logfile"}
+        "pass"      {"job", "pass", "source", "destination"}
+        "progress"  {"job", "pass", "percent", "time", "speed",
+                     "fps"}
+        "job_end"   {"job", "status", "source", "destination"}
+        "end"       {"done", "failed", "stopped", "exit_code"}
+
+    where "job" is the 1-based position in the list and "status"
+    is one of "DONE", "FAILED", "ERROR" or "STOP". FFmpeg messages
+    are written to the log file as the GUI does.
+
+    Usage:
+        >>> runner = BatchRunner(appdata, jobs, logfile, maxjobs=2)
+        >>> exit_code = runner.run()
+    """
+    RATE = 2  # max progress events per second for each job
+
+    def __init__(self, appdata, jobs, logfile, maxjobs=1, stream=None,
+                 state=None):
+        """
+        appdata: the configuration dict, see `load_configuration`
+        jobs: list of task dicts
+        logfile: pathname of the log file
+        maxjobs: maximum number of jobs running at the same time
+        stream: text stream of the JSON events, default stdout
+        state: optional `QueueState` updated as the jobs complete
+        """
+        self.appdata = appdata
+        self.state = state
+        self.jobs = build_jobs(appdata, jobs, workdirs=True)
+        self.cache = metadata_cache(appdata)  # loudness measurements
+        self.logfile = logfile
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+        self.results = []
+        self.scheduler = JobScheduler(min(max(1, maxjobs), len(jobs)))
+        if appdata['ffmpeg_progress_pipe']:  # see `ffmpeg_cmd_args`
+            self.stdout = subprocess.PIPE
+        else:
+            self.stdout = subprocess.DEVNULL  # never mix with our output
+    # ------------------------------------------------------------------
+
+    def emit(self, event, **data):
+        """
+        Write an event as a JSON line on the output stream.
+        """
+        with self.lock:
+            self.stream.write(json.dumps({'event': event, **data},
+                                         ensure_ascii=False) + '\n')
+            self.stream.flush()
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Run all the jobs and returns the exit code. Ctrl+C stops
+        the running FFmpeg processes and skips the remaining jobs.
+        """
+        self.emit('start', jobs=len(self.jobs),
+                  maxjobs=self.scheduler.maxjobs, logfile=self.logfile)
+        worker = threading.Thread(target=self.run_jobs, daemon=True)
+        worker.start()
+        while worker.is_alive():
+            try:
+                worker.join(0.2)
+            except KeyboardInterrupt:
+                self.scheduler.stop()
+        flush_logs()
+
+        done = self.results.count('DONE')
+        failed = self.results.count('FAILED') + self.results.count('ERROR')
+        if self.scheduler.stopped:
+            code = EXIT_STOPPED
+        elif done < len(self.jobs):
+            code = EXIT_FAILED
+        else:
+            code = EXIT_OK
+        self.emit('end', done=done, failed=failed,
+                  stopped=self.scheduler.stopped, exit_code=code)
+        return code
+    # ------------------------------------------------------------------
+
+    def run_jobs(self):
+        """
+        Worker thread target.
+        """
+        self.results = self.scheduler.run(self.run_job, self.jobs)
+    # ------------------------------------------------------------------
+
+    def run_job(self, count, job):
+        """
+        Runs all the passes of a job in a private working directory
+        (see `FFmpeg.parallel_job`), writing its log section at
+        once. Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        kwa = job.kwargs
+        tmpdir = os.path.join(self.appdata['cachedir'], 'tmp')
+        workdir = tempfile.mkdtemp(prefix='job_', dir=tmpdir)
+        section = []
+        status = 'ERROR'
+        error = self.state.start(kwa) if self.state is not None else None
+        if error:
+            section.append(f"{error}\n")
+        try:
+            status = self.run_passes(count, job, workdir, section)
+        finally:
+            if self.state is not None:
+                error = self.state.finish(kwa, status)
+                if error:
+                    section.append(f"{error}\n")
+            tolog(''.join(section), self.logfile, sep=True, wdate=True)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.emit('job_end', job=count, status=status,
+                  source=kwa['source'], destination=kwa['destination'])
+        return status
+    # ------------------------------------------------------------------
+
+    def run_passes(self, count, job, workdir, section):
+        """
+        Run the first and (if any) the second pass. The first
+        pass is skipped if the loudness was already measured.
+        """
+        section.append(f"{job.first.stamp}\n")
+        if job.load_summary(self.cache):
+            section.append(f"{MEASURED_MSG}\n")
+        else:
+            status = self.run_pass(count, job.first, job, workdir, section)
+            if status != 'DONE' or not job.twopass:
+                return status
+            job.save_summary(self.cache)
+
+        second = job.second_pass()
+        section.append(f"{second.stamp}\n")
+        return self.run_pass(count, second, job, workdir, section)
+    # ------------------------------------------------------------------
+
+    def run_pass(self, count, ffpass, job, workdir, section):
+        """
+        Run a single FFmpeg pass of a job.
+        Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        kwa, npass = job.kwargs, ffpass.npass
+        self.emit('pass', job=count, **{'pass': npass},
+                  source=kwa['source'], destination=kwa['destination'])
+        try:
+            with Popen(ffpass.command,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       cwd=workdir,
+                       stdout=self.stdout,
+                       ) as proc:
+                if not self.scheduler.register(proc):
+                    return 'STOP'
+                channel = ProgressChannel(partial(self.progress, count, npass,
+                                                  kwa['duration']),
+                                          rate=self.RATE)
+                reader = None
+                if proc.stdout is not None:
+                    reader = ProgressPipeReader(proc.stdout, channel.update)
+                try:
+                    for line in proc.stderr:
+                        progress = parse_progress(line)
+                        if progress:
+                            channel.update(progress)
+                        else:
+                            section.append(f"[FFMPEG]: {line}")
+                        if npass == 1:
+                            job.parse_output(line)
+
+                    if self.scheduler.stopped:
+                        return 'STOP'
+                    if proc.wait():  # ..Failed
+                        section.append(f"[VIDEOMASS]: Error Exit Status: "
+                                       f"{proc.wait()}\n")
+                        return 'FAILED'
+                finally:
+                    if reader is not None:
+                        reader.join()
+                    channel.flush()
+                    self.scheduler.unregister(proc)
+
+        except (OSError, FileNotFoundError) as err:
+            section.append(f"{err}\n")
+            return 'ERROR'
+
+        return 'DONE'
+    # ------------------------------------------------------------------
+
+    def progress(self, count, npass, duration, progress, lines):
+        """
+        Post function of the progress channel, see `run_pass`.
+        """
+        if not progress:
+            return
+        percent = None
+        if duration:
+            percent = round(min(progress['msec'] / duration, 1) * 100, 1)
+        self.emit('progress', job=count, **{'pass': npass},
+                  percent=percent, time=progress.get('time'),
+                  speed=progress.get('speed'), fps=progress.get('fps'))
+# ------------------------------------------------------------------------
+
+
+def run_headless(args):
+    """
+    Run a queue file (`run_queue` key) or a preset profile on
+    the `inputs` files (`preset` and `profile` keys) given by the
+    `argparser.arguments` dict `args`. Returns the exit code.
+    """
+    state = None
+    try:
+        appdata = load_configuration(args['make_portable'])
+        if args['run_queue']:
+            jobs = load_queue(args['run_queue'])
+            logname = 'Queue Processing.log'
+            state = QueueState(f"{args['run_queue']}.state")
+            if args['resume']:
+                jobs = state.pending(jobs)
+        else:
+            profile = load_profile(args['preset'], args['profile'],
+                                   appdata['confdir'])
+            if args['output_dir']:
+                outputdir = args['output_dir']
+            elif appdata['outputdir_asinput']:
+                outputdir = None
+            else:
+                outputdir = appdata['outputdir']
+            jobs = profile_jobs(appdata, profile, args['inputs'], outputdir)
+            logname = 'Presets Manager.log'
+        check_jobs(jobs, args['overwrite'] or args['resume'])
+    except ValueError as err:
+        sys.stderr.write(f'videomass: error: {err}\n')
+        return EXIT_USAGE
+    if not jobs:
+        sys.stderr.write('videomass: all items are already completed\n')
+        return EXIT_OK
+
+    logfile = make_log_template(logname, appdata['logdir'], mode="w",
+                                txtenc=appdata['encoding'])
+    maxjobs = args['jobs'] or appdata['max_parallel_jobs']
+    return BatchRunner(appdata, jobs, logfile, maxjobs, state=state).run()
+# ------------------------------------------------------------------------
+
+
+def main():
+    """
+    Entry point of the `videomass-cli` console script. The
+    batch mode options are parsed and run by `arguments`,
+    which exits with the batch mode exit code.
+    """
+    arguments()
+    sys.exit(EXIT_USAGE)  # no batch mode options given
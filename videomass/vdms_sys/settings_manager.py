@@ -149,8 +149,49 @@ class ConfigManager:
     filedrop_column_width (list of int)
         column width in the File Drop panel.
 
+    max_parallel_jobs (int):
+        maximum number of FFmpeg processes to run at the same time
+        on batch and queue processing, default is 1 (sequential).
+
+    max_probe_workers (int):
+        maximum number of ffprobe processes to run at the same time
+        when importing files, default is 4.
+
+    metadata_cache_size (int):
+        maximum size in MiB of the persistent cache of media
+        properties (see `vdms_io.data_cache`), 0 disables the
+        cache. Default is 64.
+
+    ffmpeg_progress_pipe (bool):
+        if True, FFmpeg encodings are run with `-nostats -progress
+        pipe:1` and their progress is read from the standard output
+        instead of the statistics on the standard error.
+        Default is False.
+
+    chunked_encoding (int):
+        number of segments encoded at the same time when a single
+        AV1 (libaom) or VP9 (libvpx) encoding splits its source at
+        keyframes (see `vdms_threads.chunked_encoding`). Only used
+        if `max_parallel_jobs` is 1. Default is 0 (disabled).
+
+    max_analysis_workers (int):
+        maximum number of FFmpeg processes to run at the same time
+        when analyzing the audio volume of the imported files,
+        default is 4.
+
+    max_image_workers (int):
+        maximum number of FFmpeg processes to run at the same time
+        when preparing the images of a slideshow or saving the
+        thumbnails by keyframe seeking, default is 4.
+
+    frame_cache_size (int):
+        maximum size in MiB of the cache of the decoded frames of
+        the filter previews (see `vdms_io.data_cache`), a quarter
+        of it is kept in memory. 0 disables the cache. Default
+        is 128.
+
     """
-    VERSION = 8.5
+    VERSION = 9.3
     DEFAULT_OPTIONS = {"confversion": VERSION,
                        "shutdown": False,
                        "sudo_password": "",
@@ -180,6 +221,14 @@ class ConfigManager:
                        "locale_name": "Default",
                        "prstmng_column_width": [250, 350, 200, 220],
                        "filedrop_column_width": [30, 200, 200, 200, 150, 200],
+                       "max_parallel_jobs": 1,
+                       "max_probe_workers": 4,
+                       "metadata_cache_size": 64,
+                       "ffmpeg_progress_pipe": False,
+                       "chunked_encoding": 0,
+                       "max_analysis_workers": 4,
+                       "max_image_workers": 4,
+                       "frame_cache_size": 128,
                        }
 
     def __init__(self, filename, makeportable=None):
@@ -0,0 +1,403 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: chunked_encoding.py
+Porpose: segment-parallel encoding of a single media file
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+Encoders such as libaom-av1 and libvpx-vp9 do not scale well
+across many threads. A chunked encoding splits the video of the
+source at keyframes, encodes the segments at the same time with
+the same args and joins them without re-encoding by the concat
+demuxer. Audio and subtitles are encoded once from the whole
+source by a separate process and muxed back by the join.
+
+See `ffmpeg.FFmpeg` for the processing thread.
+"""
+import os
+import json
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from videomass.vdms_utils.utils import (Popen,
+                                        integer_to_time,
+                                        write_concat_list,
+                                        )
+from videomass.vdms_io.data_cache import file_signature, make_key
+from videomass.vdms_threads.ffprobe import ffprobe_version
+from videomass.vdms_threads.cmd_builders import (FFmpegJob,
+                                                 FFmpegPass,
+                                                 split_args,
+                                                 )
+
+CHUNKED_ENCODERS = ('libaom-av1', 'libvpx-vp9')
+CHUNKED_TYPES = ('One pass', 'Two pass')
+MIN_SEGMENT = 30  # minimum segment length in seconds
+SEGMENTS_PER_WORKER = 2  # keeps the workers busy until the end
+STREAM_TYPES = {'v': 'video', 'V': 'video', 'a': 'audio',
+                's': 'subtitle', 'd': 'data', 't': 'attachment'}
+
+
+def chunk_encoder(kwa):
+    """
+    Returns the video encoder name of the task dict `kwa` if
+    it can be encoded in chunks, `None` otherwise. Trimmed
+    items and the two-pass filters types are not supported.
+    """
+    if kwa['type'] not in CHUNKED_TYPES:
+        return None
+    if kwa.get('start-time') or kwa.get('end-time'):
+        return None
+    argv = split_args(kwa['args'][1] or kwa['args'][0])
+    for opt, val in zip(argv, argv[1:]):
+        if opt in ('-c:v', '-codec:v', '-vcodec') and val in CHUNKED_ENCODERS:
+            return val
+    return None
+# ----------------------------------------------------------------------
+
+
+def keyframe_times(filename, cmd='ffprobe', txtenc='utf-8', cache=None):
+    """
+    Read the timestamps in seconds of the keyframes of the first
+    video stream of `filename`, from the packet flags, so that no
+    frame is decoded. Returns a tuple (list, None) or (None, error).
+    If a `DataCache` is given, the results are cached like the
+    `ffprobe.ffprobe` ones.
+    """
+    key = None
+    if cache is not None:
+        signature = file_signature(filename)
+        version = ffprobe_version(cmd)
+        if signature and version:
+            key = make_key('keyframes', version, *signature)
+            output = cache.get(key)
+            if output is not None:
+                return json.loads(output), None
+
+    args = [cmd, '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0',
+            filename]
+    try:
+        with Popen(args,
+                   stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE,
+                   universal_newlines=True,
+                   encoding=txtenc,
+                   ) as proc:
+            output, error = proc.communicate()
+            if proc.returncode != 0:
+                return None, f'ffprobe: {error}'
+
+    except (OSError, FileNotFoundError, UnicodeDecodeError) as excepterr:
+        return None, excepterr
+
+    times = []
+    for line in output.splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' in flags:
+            try:
+                times.append(float(pts))
+            except ValueError:  # N/A
+                continue
+    times.sort()
+    if key:
+        cache.put(key, json.dumps(times))
+
+    return times, None
+# ----------------------------------------------------------------------
+
+
+def segment_length(duration, workers):
+    """
+    Returns the length in seconds of the segments for a
+    `duration` in seconds and the number of `workers`.
+    """
+    return max(MIN_SEGMENT, duration / (workers * SEGMENTS_PER_WORKER))
+# ----------------------------------------------------------------------
+
+
+def plan_segments(keyframes, duration, length):
+    """
+    Split a `duration` in seconds into segments of about `length`
+    seconds, starting at the given `keyframes` times (seconds from
+    the start of the file). The last segment is never shorter than
+    half the `length`. Returns a list of (start, end) tuples, where
+    `end` is `None` for the last segment.
+    """
+    cuts = [0.0]
+    for pts in keyframes:
+        if pts - cuts[-1] >= length and duration - pts >= length / 2:
+            cuts.append(pts)
+    return list(zip(cuts, cuts[1:] + [None]))
+# ----------------------------------------------------------------------
+
+
+def map_indexes(spec, streams):
+    """
+    Returns the indexes of the `streams` (the codec types of the
+    source, in index order) selected by the `-map` value `spec`,
+    e.g. '0', '0:a', '0:1' or '0:s:0?'. Returns `None` if the
+    map can not be resolved: other inputs, negative maps or
+    specifiers other than the stream type and index.
+    """
+    parts = spec.rstrip('?').split(':')
+    if parts[0] != '0':
+        return None
+    indexes = list(range(len(streams)))
+    specs = parts[1:]
+    if specs and specs[0] in STREAM_TYPES:
+        indexes = [idx for idx in indexes
+                   if streams[idx] == STREAM_TYPES[specs[0]]]
+        specs = specs[1:]
+    if not specs:
+        return indexes
+    if len(specs) > 1 or not specs[0].isdigit():
+        return None
+    return indexes[int(specs[0]):int(specs[0]) + 1]
+# ----------------------------------------------------------------------
+
+
+def mapped_types(argv, streams):
+    """
+    Returns the set of the codec types of the `streams` of the
+    first input selected by the `argv` args (e.g. {'video',
+    'audio'}), `None` if a `-map` option can not be resolved,
+    see `map_indexes`.
+    """
+    maps = [val for opt, val in zip(argv, argv[1:]) if opt == '-map']
+    if not maps:
+        types = set(streams)  # automatic stream selection
+    else:
+        types = set()
+        for val in maps:
+            indexes = map_indexes(val, streams)
+            if indexes is None:
+                return None
+            types.update(streams[idx] for idx in indexes)
+    for opt, ctype in (('-vn', 'video'), ('-an', 'audio'),
+                       ('-sn', 'subtitle'), ('-dn', 'data')):
+        if opt in argv:
+            types.discard(ctype)
+    return types
+# ----------------------------------------------------------------------
+
+
+class MergedProgress:
+    """
+    Merges the progress of the segments of a chunked encoding
+    into a single progress dict, as if they were encoded by a
+    single FFmpeg process: the `msec` are the sum of the encoded
+    time of all the segments passes divided by the number of
+    passes, the `speed` is the sum of the speeds of the running
+    segments.
+
+    Usage:
+        >>> merged = MergedProgress(channel.update, nseg, npasses=1)
+        >>> ProgressChannel(partial(merged.update, segment, npass))
+        >>> merged.finish(segment)  # when a segment ends
+    """
+    def __init__(self, post, nseg, npasses=1):
+        """
+        post: callable which receives the merged progress dict
+        nseg: the number of segments
+        npasses: the number of passes of each segment
+        """
+        self.post = post
+        self.nseg = nseg
+        self.npasses = npasses
+        self.encoded = {}  # msec by (segment, npass)
+        self.speeds = {}  # speed of the running segments
+        self.finished = 0
+        self.lock = threading.Lock()
+    # ------------------------------------------------------------------
+
+    def update(self, segment, npass, progress=None, lines=None):
+        """
+        Update the progress of the pass `npass` of a `segment`.
+        The `progress` and `lines` args are the ones sent by
+        `ProgressChannel`, the `lines` are ignored. Jobs without
+        progress (e.g. the audio/subtitles one) use `segment=None`.
+        """
+        if not progress or segment is None:
+            return
+        try:
+            speed = float(progress.get('speed', 'N/A').split('x')[0])
+        except ValueError:
+            speed = 0
+        with self.lock:
+            self.encoded[(segment, npass)] = progress['msec']
+            self.speeds[segment] = speed
+            merged = self.merged()
+        self.post(merged)
+    # ------------------------------------------------------------------
+
+    def finish(self, segment):
+        """
+        Notify the end of a `segment`.
+        """
+        with self.lock:
+            self.speeds.pop(segment, None)
+            self.finished += 1
+            merged = self.merged()
+        self.post(merged)
+    # ------------------------------------------------------------------
+
+    def merged(self):
+        """
+        Returns the merged progress dict. Called with the lock held.
+        """
+        msec = sum(self.encoded.values()) // self.npasses
+        speed = sum(self.speeds.values()) / self.npasses
+        return {'segments': f'{self.finished}/{self.nseg}',
+                'time': integer_to_time(msec),
+                'speed': f'{speed:.3g}x',
+                'msec': msec,
+                }
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class ChunkedJob:
+    """
+    The FFmpeg commands of a chunked encoding of `job` (a
+    `FFmpegJob`), given the `segments` list of `plan_segments`,
+    the temporary `workdir` where segments are written and the
+    `streams` codec types of the source (e.g. ['video', 'audio']).
+    Raises ValueError if the `-map` options of the job can not be
+    resolved against the `streams`, see `mapped_types`.
+
+    `jobs` are the segment jobs (video only), `rest` is the job
+    which encodes the audio and subtitles of the whole source,
+    if any, and `join` the pass which concatenates the segments
+    and muxes the `rest` output into the final destination.
+    All the `jobs` and the `rest` can be run at the same time;
+    call `write_list` before running the `join` pass.
+    """
+    job: FFmpegJob
+    segments: list
+    workdir: str
+    streams: list = field(default_factory=list)
+    jobs: list = field(init=False)
+    rest: FFmpegJob = field(init=False, default=None)
+    join: FFmpegPass = field(init=False)
+
+    def __post_init__(self):
+        """
+        Build all the jobs.
+        """
+        kwa = self.job.kwargs
+        ext = os.path.splitext(kwa['destination'])[1]
+        nseg = len(self.segments)
+        self.jobs = [FFmpegJob(self.segment_kwargs(num, start, end, ext),
+                               num, nseg, self.job.cmd, label='Segment')
+                     for num, (start, end) in enumerate(self.segments, 1)]
+
+        args = kwa['args'][1] or kwa['args'][0]
+        argv = split_args(args)
+        types = mapped_types(argv, self.streams)
+        if types is None:
+            raise ValueError('unresolved -map options, the streams '
+                             'of the segments are unknown')
+        if types & {'audio', 'subtitle'}:
+            rest = {**kwa, 'type': 'One pass', 'args': [f'{args} -vn', ''],
+                    'destination': os.path.join(self.workdir, f'rest{ext}')}
+            self.rest = FFmpegJob(rest, self.job.count, self.job.total,
+                                  self.job.cmd, label='Audio/Subtitles')
+        self.join = self.join_pass(argv)
+    # ------------------------------------------------------------------
+
+    @property
+    def header(self):
+        """
+        The description shown on the processing panel.
+        """
+        kwa = self.job.kwargs
+        return (f'File {self.job.count}/{self.job.total} - Chunked encoding '
+                f'of {len(self.segments)} segments\n'
+                f'Source: "{kwa["source"]}"\n'
+                f'Destination: "{kwa["destination"]}"')
+    # ------------------------------------------------------------------
+
+    @property
+    def listfile(self):
+        """
+        The concat demuxer script pathname.
+        """
+        return os.path.join(self.workdir, 'segments.txt')
+    # ------------------------------------------------------------------
+
+    def segment_kwargs(self, num, start, end, ext):
+        """
+        Returns the task dict of the segment `num` from `start`
+        to `end` seconds. Audio, subtitles and data streams are
+        disabled, two-pass log files are named after the segment.
+        """
+        kwa = self.job.kwargs
+        name = os.path.join(self.workdir, f'segment_{num:04}')
+        args = [f'{arg} -an -sn -dn' if arg else '' for arg in kwa['args']]
+        if kwa['type'] == 'Two pass':
+            args = [f'{arg} -passlogfile "{name}"' for arg in args]
+        return {**kwa,
+                'args': args,
+                'start-time': f'-ss {start:.6f}' if start else '',
+                'end-time': '' if end is None else f'-t {end - start:.6f}',
+                'destination': f'{name}{ext}',
+                'volume': '',
+                }
+    # ------------------------------------------------------------------
+
+    def join_pass(self, argv):
+        """
+        Build the pass which concatenates the segments with the
+        concat demuxer (see `concat_demuxer.ConcatDemuxer`) and
+        muxes the `rest` output, copying all the streams.
+        """
+        kwa = self.job.kwargs
+        ffmpeg = self.job.cmd['ffmpeg_cmd']
+        defargs = self.job.cmd['ffmpeg-default-args']
+        dest = kwa['destination']
+        opts = '-map 0:v'
+        if self.rest:
+            opts += ' -map 1 -map_metadata 1 -map_chapters 1'
+        opts += ' -c copy'
+        if '-movflags' in argv[:-1]:
+            opts += f' -movflags {argv[argv.index("-movflags") + 1]}'
+        restin = (f'-i "{self.rest.kwargs["destination"]}" '
+                  if self.rest else '')
+        cmdline = (f'"{ffmpeg}" {defargs} -f concat -safe 0 -i '
+                   f'"{self.listfile}" {restin}{opts} "{dest}"')
+        argv = [ffmpeg, *split_args(defargs), '-f', 'concat', '-safe', '0',
+                '-i', self.listfile]
+        if self.rest:
+            argv += ['-i', self.rest.kwargs['destination']]
+        argv += [*split_args(opts), dest]
+        header = (f'File {self.job.count}/{self.job.total} - Joining '
+                  f'{len(self.segments)} segments\nDestination: "{dest}"')
+        return FFmpegPass(argv, cmdline, header, npass=2)
+    # ------------------------------------------------------------------
+
+    def write_list(self):
+        """
+        Write the concat demuxer script of the segments.
+        """
+        write_concat_list([job.kwargs['destination'] for job in self.jobs],
+                          self.listfile)
@@ -0,0 +1,338 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: cmd_builders.py
+Porpose: Build the FFmpeg command lines of the conversion tasks
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+The jobs are built from the task dicts of the panels and queue
+files (see `FFmpegJob`) and shared by the `ffmpeg.FFmpeg` thread
+and the command line batch mode (see `vdms_sys.headless`).
+"""
+import os
+import json
+import shlex
+import platform
+from functools import lru_cache
+from dataclasses import dataclass, field
+from videomass.vdms_io.data_cache import measurement_key
+
+PROCESS_TYPES = ('One pass', 'Two pass', 'Two pass EBU', 'Two pass VIDSTAB')
+WINDOWS = platform.system() == 'Windows'
+NUL = 'NUL' if WINDOWS else '/dev/null'
+EBU_KEYS = ('Input Integrated:', 'Input True Peak:', 'Input LRA:',
+            'Input Threshold:', 'Output Integrated:', 'Output True Peak:',
+            'Output LRA:', 'Output Threshold:', 'Normalization Type:',
+            'Target Offset:')
+# first pass args which also analyze the video, see `FFmpegJob.loudness_key`
+VIDEO_ANALYSIS = ('-pass', 'pass=1', 'vidstabdetect')
+MEASURED_MSG = ('[VIDEOMASS]: Loudness already measured with the same '
+                'args, first pass skipped.')
+
+
+@lru_cache(maxsize=1024)
+def split_args(string):
+    """
+    Split a string of FFmpeg arguments using shell-like syntax.
+    Returns a tuple. Results are memoized since the same args
+    are shared by all the items of a task.
+    """
+    return tuple(shlex.split(string))
+# ----------------------------------------------------------------------
+
+
+def ffmpeg_cmd_args(appdata):
+    """
+    Get ffmpeg command and default args from the `appdata`
+    configuration dict. If the `ffmpeg_progress_pipe` option
+    is enabled, FFmpeg writes its progress on the standard
+    output instead of the statistics on the standard error.
+    """
+    if appdata['ffmpeg_progress_pipe']:
+        defargs = (f'-y -nostats -progress pipe:1 -hide_banner '
+                   f'{appdata["ffmpeg_loglev"]}')
+    else:
+        defargs = f'-y -stats -hide_banner {appdata["ffmpeg_loglev"]}'
+    return {"ffmpeg_cmd": appdata["ffmpeg_cmd"],
+            "ffmpeg-default-args": defargs}
+# ----------------------------------------------------------------------
+
+
+def ebu_filters(ebu, summary):
+    """
+    Returns the loudnorm filter of the second EBU pass
+    using the values measured by the first pass.
+    """
+    return (f'{ebu}'
+            f':measured_I={summary["Input Integrated:"]}'
+            f':measured_LRA={summary["Input LRA:"]}'
+            f':measured_TP={summary["Input True Peak:"]}'
+            f':measured_thresh={summary["Input Threshold:"]}'
+            f':offset={summary["Target Offset:"]}'
+            f':linear=true:dual_mono=true'
+            )
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class FFmpegPass:
+    """
+    A single FFmpeg command of a job. `argv` is the argument
+    list given to `Popen`, `cmdline` the same command as a
+    string for logs and display, `header` the description
+    shown on the processing panel.
+    """
+    argv: list
+    cmdline: str
+    header: str
+    npass: int = 1
+
+    @property
+    def command(self):
+        """
+        The `Popen` args: MS Windows takes the command line
+        string as it is, the other platforms the `argv` list.
+        """
+        return self.cmdline if WINDOWS else self.argv
+
+    @property
+    def stamp(self):
+        """
+        The log file message with the header and the command.
+        """
+        sep = '\n' if self.npass > 1 else ''
+        return f'{sep}{self.header}\n\n[COMMAND]:\n{self.cmdline}'
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class FFmpegJob:
+    """
+    The FFmpeg commands of a single item of a task, built once
+    from its task dict (`kwargs`, the same dicts used by the panels
+    and the queue files) when the job is created.
+
+    `count` and `total` are the position of the item and the
+    number of items of the task, shown in the pass headers after
+    the `label` ('File' by default). `cmd` is the dict given by
+    `ffmpeg_cmd_args`. The second pass of the 'Two pass EBU' type
+    depends on the loudness measured by the first one: feed the
+    first pass output lines to `parse_output`, then call
+    `second_pass`. The measured loudness can be saved to a
+    `DataCache` with `save_summary`; if `load_summary` finds it
+    on later runs, the first pass can be skipped.
+
+    Usage:
+        >>> job = FFmpegJob(kwargs, 1, 1, ffmpeg_cmd_args(appdata))
+        >>> Popen(job.first.command, ...)
+        >>> job.parse_output(line)  # for each line of the first pass
+        >>> if job.twopass:
+        >>>     Popen(job.second_pass().command, ...)
+    """
+    kwargs: dict
+    count: int
+    total: int
+    cmd: dict = field(repr=False)
+    label: str = 'File'
+    first: FFmpegPass = field(init=False)
+    second: FFmpegPass = field(init=False, default=None)
+    summary: dict = field(init=False, default=None)
+
+    def __post_init__(self):
+        """
+        Build the first pass and, if not depending on the
+        first pass output, the second one.
+        """
+        kwa = self.kwargs
+        if kwa['type'] not in PROCESS_TYPES:
+            raise ValueError(f'Unsupported process type "{kwa["type"]}"')
+        head = f'{self.label} {self.count}/{self.total}'
+        if kwa['type'] == 'One pass':
+            self.first = self.make_pass(1, f'{head}\n', kwa['destination'],
+                                        kwa.get('volume', ''))
+            return
+
+        stats = ''
+        if kwa['type'] in ('Two pass EBU', 'Two pass VIDSTAB'):
+            stats = 'Detecting statistics for measurements...\n\n'
+        self.first = self.make_pass(1, f'{head} - Pass One\n{stats}', NUL)
+        if kwa['type'] == 'Two pass EBU':
+            self.summary = dict.fromkeys(EBU_KEYS)
+        elif kwa['args'][1]:
+            self.second = self.second_pass()
+    # ------------------------------------------------------------------
+
+    @property
+    def twopass(self):
+        """
+        True if the job has a second pass.
+        """
+        return self.kwargs['type'] != 'One pass' and bool(
+            self.kwargs['args'][1])
+    # ------------------------------------------------------------------
+
+    def make_pass(self, npass, header, output, extra=''):
+        """
+        Build the pass `npass` (1 or 2) writing to `output`.
+        `extra` are args added after the pass args.
+        """
+        kwa = self.kwargs
+        ffmpeg = self.cmd['ffmpeg_cmd']
+        defargs = self.cmd['ffmpeg-default-args']
+        preinput = kwa.get(f'pre-input-{npass}', '')
+        args = kwa['args'][npass - 1]
+        qout = output if output == NUL else f'"{output}"'
+        cmdline = (f'"{ffmpeg}" {defargs} {preinput} {kwa["start-time"]} '
+                   f'-i "{kwa["source"]}" {kwa["end-time"]} {args} '
+                   f'{extra + " " if extra else ""}{qout}')
+        argv = [ffmpeg, *split_args(defargs), *split_args(preinput),
+                *split_args(kwa["start-time"]), '-i', kwa["source"],
+                *split_args(kwa["end-time"]), *split_args(args),
+                *split_args(extra), output]
+        header = f'{header}Source: "{kwa["source"]}"\nDestination: "{output}"'
+        return FFmpegPass(argv, cmdline, header, npass)
+    # ------------------------------------------------------------------
+
+    def parse_output(self, line):
+        """
+        Update the EBU `summary` with the values measured
+        on the first pass output `line`, if any.
+        """
+        if self.summary is None:
+            return
+        for key in self.summary:
+            if line.startswith(key):
+                self.summary[key] = line.split(':')[1].split()[0]
+    # ------------------------------------------------------------------
+
+    def loudness_key(self):
+        """
+        Returns the cache key of the loudness measured by the
+        first pass, `None` if the job has no EBU measurement or
+        if its first pass also analyzes the video (two-pass
+        encoders stats or vidstabdetect), so it cannot be skipped.
+        """
+        kwa = self.kwargs
+        if self.summary is None:
+            return None
+        if any(opt in kwa['args'][0] for opt in VIDEO_ANALYSIS):
+            return None
+        return measurement_key('loudnorm', kwa['source'],
+                               kwa.get('audiomap'),
+                               [kwa['start-time'], kwa['end-time']],
+                               [kwa.get('pre-input-1', ''), kwa['args'][0]])
+    # ------------------------------------------------------------------
+
+    def load_summary(self, cache):
+        """
+        Set the EBU `summary` measured by a previous run from
+        the `cache` (a `DataCache` or `None`). Returns True if
+        found, so that the first pass can be skipped.
+        """
+        key = self.loudness_key() if cache is not None else None
+        value = cache.get(key) if key else None
+        if value is None:
+            return False
+        self.summary.update(json.loads(value))
+        return True
+    # ------------------------------------------------------------------
+
+    def save_summary(self, cache):
+        """
+        Store the EBU `summary` of a successful first pass
+        to the `cache` (a `DataCache` or `None`).
+        """
+        if cache is None or self.summary is None:
+            return
+        if None in self.summary.values():
+            return
+        key = self.loudness_key()
+        if key:
+            cache.put(key, json.dumps(self.summary))
+    # ------------------------------------------------------------------
+
+    def second_pass(self):
+        """
+        Returns the second pass, building it if needed.
+        """
+        if self.second is not None:
+            return self.second
+        kwa = self.kwargs
+        head = f'{self.label} {self.count}/{self.total} - Pass Two\n'
+        if kwa['type'] == 'Two pass EBU':
+            head += 'Application of Audio/Video filters...\n\n'
+            extra = (f'-filter:a:{kwa["audiomap"][1]} '
+                     f'{ebu_filters(kwa["EBU"], self.summary)}')
+            return self.make_pass(2, head, kwa['destination'], extra)
+        if kwa['type'] == 'Two pass VIDSTAB':
+            head += 'Application of Audio/Video filters...\n\n'
+        return self.make_pass(2, head, kwa['destination'],
+                              kwa.get('volume', ''))
+# ----------------------------------------------------------------------
+
+
+def absolute_paths(kwa, cmd):
+    """
+    Returns copies of the task dict `kwa` and of the `cmd` dict
+    given by `ffmpeg_cmd_args` with absolute pathnames, for jobs
+    run in their own working directory.
+    """
+    kwa = {**kwa,
+           'source': os.path.abspath(kwa['source']),
+           'destination': os.path.abspath(kwa['destination'])}
+    if os.path.dirname(cmd['ffmpeg_cmd']):  # relative to the new cwd
+        cmd = {**cmd, 'ffmpeg_cmd': os.path.abspath(cmd['ffmpeg_cmd'])}
+    return kwa, cmd
+# ----------------------------------------------------------------------
+
+
+def build_jobs(appdata, kwargslist, workdirs=False):
+    """
+    Returns a list of `FFmpegJob` from a list of task dicts.
+    If `workdirs` is True the jobs use absolute pathnames,
+    see `absolute_paths`. Raises ValueError on unsupported
+    process types.
+    """
+    cmd = ffmpeg_cmd_args(appdata)
+    total = len(kwargslist)
+    jobs = []
+    for count, kwa in enumerate(kwargslist, 1):
+        jcmd = cmd
+        if workdirs:
+            kwa, jcmd = absolute_paths(kwa, cmd)
+        jobs.append(FFmpegJob(kwa, count, total, jcmd))
+    return jobs
+# ----------------------------------------------------------------------
+
+
+def get_raw_cmdline_args(appdata, **kwa):
+    """
+    Return a list of raw command lines.
+    """
+    if kwa['type'] not in PROCESS_TYPES:
+        return None
+    job = FFmpegJob(kwa, 1, 1, ffmpeg_cmd_args(appdata))
+    if not job.twopass:
+        return (job.first.cmdline,)
+    if job.summary is not None:
+        job.summary = dict.fromkeys(job.summary, '<?>')
+    return job.first.cmdline, job.second_pass().cmdline
@@ -25,13 +25,18 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 from threading import Thread
+from functools import partial
+import os
+import tempfile
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import Popen, write_concat_list
 from videomass.vdms_io.make_filelog import tolog
+from videomass.vdms_threads.progress_channel import ProgressChannel
+from videomass.vdms_threads.scheduler import JobScheduler
 if not platform.system() == 'Windows':
     import shlex
 
@@ -41,6 +46,12 @@ class ConcatDemuxer(Thread):
     This class represents a separate thread for running processes,
     which need to read the stdout/stderr in real time.
 
+    The files listed by the `normalize` keyword arg, as tuples
+    (index, FFmpeg args), are first re-encoded in a temporary
+    directory by the parallel jobs of a `JobScheduler` (see
+    `max_parallel_jobs`), then the concat list is rewritten
+    with the re-encoded files in place of the originals.
+
     NOTE capturing output in real-time (Windows, Unix):
 
     https://stackoverflow.com/questions/1388753/how-to-get-output-
@@ -59,6 +70,7 @@ class ConcatDemuxer(Thread):
         self.stop_work_thread = False  # process terminate
         self.logfile = args[0]  # log filename
         self.kwa = kwargs
+        self.scheduler = JobScheduler(self.appdata['max_parallel_jobs'])
 
         Thread.__init__(self)
 
@@ -68,6 +80,123 @@ class ConcatDemuxer(Thread):
         """
         Subprocess initialize thread.
 
+        """
+        if not self.kwa.get('normalize'):
+            self.concat()
+            return
+        with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
+            if self.normalize(tempdir):
+                self.concat()
+                return
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='STOP',
+                         duration=self.kwa['duration'],
+                         status=1,
+                         )
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=None)
+    # --------------------------------------------------------------------#
+
+    def normalize(self, tempdir):
+        """
+        Re-encode the odd files at the same time, on errors all
+        the other jobs are stopped. Returns True on success.
+        """
+        odd = self.kwa['normalize']
+        files = list(self.kwa['source'])
+        ext = os.path.splitext(self.kwa['destination'])[1]
+        count1 = (f'Re-encoding {len(odd)} of {len(files)} Items to '
+                  f'concatenate...\nDestination: "{tempdir}"')
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count1,
+                     duration=len(odd),
+                     end='CONTINUE',
+                     )
+        tolog(count1, self.logfile, sep=True, wdate=True)
+        errors = []
+
+        def encode(count, item):
+            """
+            Re-encode a single file as the reference file.
+            """
+            index, args = item
+            tmpf = os.path.join(tempdir, f'{index}{ext}')
+            cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+                   f'{self.appdata["ffmpeg-default-args"]} '
+                   f'{self.appdata["ffmpeg_loglev"]} '
+                   f'-i "{files[index]}" {args} -y "{tmpf}"')
+            tolog(f'[COMMAND]:\n{cmd}', self.logfile)
+            if not platform.system() == 'Windows':
+                cmd = shlex.split(cmd)
+            try:
+                with Popen(cmd,
+                           stderr=subprocess.PIPE,
+                           stdin=subprocess.PIPE,
+                           bufsize=1,
+                           universal_newlines=True,
+                           encoding=self.appdata['encoding'],
+                           ) as proc:
+                    if not self.scheduler.register(proc):
+                        return None
+                    try:
+                        out = proc.communicate()[1]
+                    finally:
+                        self.scheduler.unregister(proc)
+
+                if proc.returncode:  # ffmpeg error
+                    if not self.scheduler.stopped:
+                        errors.append(proc.returncode)
+                        self.scheduler.stop()
+                        wx.CallAfter(pub.sendMessage,
+                                     "UPDATE_EVT",
+                                     output='FAILED',
+                                     duration=0,
+                                     status=proc.returncode,
+                                     )
+                        tolog(f"[VIDEOMASS]: Error Exit Status: "
+                              f"{proc.returncode} {out}", self.logfile)
+                    return None
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output=(f' |{count}/{len(odd)}|  '
+                                     f'{files[index]}  >  {tmpf}\n'),
+                             duration=0,
+                             status=0,
+                             )
+                return tmpf
+            except (OSError, FileNotFoundError) as err:  # cmd not found
+                errors.append(err)
+                self.scheduler.stop()
+                wx.CallAfter(pub.sendMessage,
+                             "COUNT_EVT",
+                             count=err,
+                             duration=0,
+                             end='ERROR',
+                             )
+                tolog(err, self.logfile)
+                return None
+
+        done = self.scheduler.run(encode, odd)
+        if errors or self.stop_work_thread:
+            return False
+        for (index, args), tmpf in zip(odd, done):
+            files[index] = tmpf
+        write_concat_list(files, self.kwa['listfile'])
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count='',
+                     duration=0,
+                     end='DONE'
+                     )
+        return True
+    # --------------------------------------------------------------------#
+
+    def concat(self):
+        """
+        Concatenate the files of the concat list.
         """
         filedone = None
         cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
@@ -103,14 +232,15 @@ class ConcatDemuxer(Thread):
                        universal_newlines=True,
                        encoding=self.appdata['encoding'],
                        ) as proc:
+                dur = self.kwa['duration']
+                channel = ProgressChannel(partial(wx.CallAfter,
+                                                  pub.sendMessage,
+                                                  "PROGRESS_EVT",
+                                                  duration=dur))
                 for line in proc.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line,
-                                 duration=self.kwa['duration'],
-                                 status=0,
-                                 )
+                    channel.feed(line)
                     if self.stop_work_thread:
+                        channel.flush()
                         proc.stdin.write('q')  # stop ffmpeg
                         out = proc.communicate()[1]
                         proc.wait()
@@ -126,6 +256,7 @@ class ConcatDemuxer(Thread):
                                      filetotrash=filedone)
                         return
 
+                channel.flush()
                 if proc.wait():  # error
                     out = proc.communicate()[1]
                     wx.CallAfter(pub.sendMessage,
@@ -165,3 +296,4 @@ class ConcatDemuxer(Thread):
         Sets the stop work thread to terminate the process
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
@@ -25,273 +25,32 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 from threading import Thread
+from functools import partial
+import os
+import shutil
+import tempfile
 import time
 import subprocess
-import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import Popen, time_to_integer
 from videomass.vdms_io.make_filelog import tolog
-if not platform.system() == 'Windows':
-    import shlex
+from videomass.vdms_io.data_cache import metadata_cache
+from videomass.vdms_threads.scheduler import JobScheduler, stop_process
+from videomass.vdms_threads.progress_channel import (ProgressChannel,
+                                                     ProgressPipeReader,
+                                                     parse_progress)
+from videomass.vdms_threads.cmd_builders import build_jobs, MEASURED_MSG
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_threads.chunked_encoding import (ChunkedJob,
+                                                     MergedProgress,
+                                                     chunk_encoder,
+                                                     keyframe_times,
+                                                     plan_segments,
+                                                     segment_length)
 
 
-def get_raw_cmdline_args(**kwa):
-    """
-    Return a list of raw command lines.
-    """
-    if kwa['type'] == 'One pass':
-        model = simple_one_pass(1, 1, **kwa)
-
-    elif kwa['type'] == 'Two pass EBU':
-        model = one_pass_ebu(1, 1, **kwa)
-
-    elif kwa['type'] == 'Two pass VIDSTAB':
-        model = one_pass_stab(1, 1, **kwa)
-
-    elif kwa['type'] == 'Two pass':
-        model = one_pass(1, 1, **kwa)
-    else:
-        return None
-
-    spl1 = model['stamp1'].split('\n')
-    idx1 = spl1.index('[COMMAND]:') + 1
-    cmd1 = spl1[idx1]
-
-    if not kwa["args"][1]:
-        return (cmd1,)
-
-    if kwa["type"] == 'Two pass EBU':
-        filters = (f'{kwa["EBU"]}'
-                   f':measured_I=<?>'
-                   f':measured_LRA=<?>'
-                   f':measured_TP=<?>'
-                   f':measured_thresh=<?>'
-                   f':offset=<?>'
-                   f':linear=true:dual_mono=true'
-                   )
-        model = two_pass_ebu(1, 1, filters, **kwa)
-
-    elif kwa['type'] == 'Two pass VIDSTAB':
-        model = two_pass_stab(1, 1, **kwa)
-
-    elif kwa['type'] == 'Two pass':
-        model = two_pass(1, 1, **kwa)
-
-    spl2 = model['stamp2'].split('\n')
-    idx2 = spl2.index('[COMMAND]:') + 1
-    cmd2 = spl2[idx2]
-
-    return cmd1, cmd2
-# ----------------------------------------------------------------------
-
-
-def ffmpeg_cmd_args():
-    """
-    Get ffmpeg command and default args
-    """
-    get = wx.GetApp()
-    appdata = get.appset
-    defargs = f'-y -stats -hide_banner {appdata["ffmpeg_loglev"]}'
-    return {"ffmpeg_cmd": appdata["ffmpeg_cmd"],
-            "ffmpeg-default-args": defargs}
-# ----------------------------------------------------------------------
-
-
-def one_pass(*args, **kwa):
-    """
-    Command builder for first pass of two
-    """
-    cmd = ffmpeg_cmd_args()
-    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
-    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-1", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][0]} '
-             f'{nul}'
-             )
-    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
-              f'Source: "{kwa["source"]}"\nDestination: "{nul}"')
-    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
-
-    if not platform.system() == 'Windows':
-        pass1 = shlex.split(pass1)
-
-    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
-# ----------------------------------------------------------------------
-
-
-def two_pass(*args, **kwa):
-    """
-    Command builder for second pass of two
-    """
-    cmd = ffmpeg_cmd_args()
-    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-2", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][1]} '
-             f'{kwa.get("volume", "")} '
-             f'"{kwa["destination"]}"'
-             )
-    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
-              f'Source: "{kwa["source"]}"\nDestination: '
-              f'"{kwa["destination"]}"'
-              )
-    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
-
-    if not platform.system() == 'Windows':
-        pass2 = shlex.split(pass2)
-
-    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
-# ----------------------------------------------------------------------
-
-
-def one_pass_stab(*args, **kwa):
-    """
-    Command builder for one pass video stabilizer
-    """
-    cmd = ffmpeg_cmd_args()
-    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
-    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-1", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][0]} '
-             f'{nul}'
-             )
-    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
-              f'Detecting statistics for measurements...\n\nSource: '
-              f'"{kwa["source"]}"\nDestination: "{nul}"')
-    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
-
-    if not platform.system() == 'Windows':
-        pass1 = shlex.split(pass1)
-
-    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
-# ----------------------------------------------------------------------
-
-
-def two_pass_stab(*args, **kwa):
-    """
-    Command builder for two pass video stabilizer
-    """
-    cmd = ffmpeg_cmd_args()
-    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-2", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][1]} '
-             f'{kwa.get("volume", "")} '
-             f'"{kwa["destination"]}"'
-             )
-    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
-              f'Application of Audio/Video filters...\n\nSource: '
-              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
-    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
-
-    if not platform.system() == 'Windows':
-        pass2 = shlex.split(pass2)
-
-    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
-# ----------------------------------------------------------------------
-
-
-def simple_one_pass(*args, **kwa):
-    """
-    Command builder for one pass ebu
-    """
-    cmd = ffmpeg_cmd_args()
-    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-1", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][0]} '
-             f'{kwa.get("volume", "")} '
-             f'"{kwa["destination"]}"'
-             )
-    count1 = (f'File {args[0]}/{args[1]}\nSource: '
-              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
-    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
-
-    if not platform.system() == 'Windows':
-        pass1 = shlex.split(pass1)
-
-    return {'pass1': pass1, 'count1': count1, 'stamp1': stamp1}
-# ----------------------------------------------------------------------
-
-
-def one_pass_ebu(*args, **kwa):
-    """
-    Command builder for one pass ebu
-    """
-    cmd = ffmpeg_cmd_args()
-    nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
-    pass1 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-1", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][0]} '
-             f'{nul}'
-             )
-    count1 = (f'File {args[0]}/{args[1]} - Pass One\n'
-              f'Detecting statistics for measurements...\n\nSource: '
-              f'"{kwa["source"]}"\nDestination: "{nul}"')
-    stamp1 = f'{count1}\n\n[COMMAND]:\n{pass1}'
-
-    if not platform.system() == 'Windows':
-        pass1 = shlex.split(pass1)
-
-    summary = {'Input Integrated:': None, 'Input True Peak:': None,
-               'Input LRA:': None, 'Input Threshold:': None,
-               'Output Integrated:': None, 'Output True Peak:': None,
-               'Output LRA:': None, 'Output Threshold:': None,
-               'Normalization Type:': None, 'Target Offset:': None
-               }
-    return {'pass1': pass1, 'count1': count1,
-            'stamp1': stamp1, 'summary': summary}
-# ----------------------------------------------------------------------
-
-
-def two_pass_ebu(*args, **kwa):
-    """
-    Command builder for two pass ebu
-    """
-    cmd = ffmpeg_cmd_args()
-    pass2 = (f'"{cmd["ffmpeg_cmd"]}" '
-             f'{cmd["ffmpeg-default-args"]} '
-             f'{kwa.get("pre-input-2", "")} '
-             f'{kwa["start-time"]} '
-             f'-i "{kwa["source"]}" '
-             f'{kwa["end-time"]} '
-             f'{kwa["args"][1]} '
-             f'-filter:a:{kwa["audiomap"][1]} '
-             f'{args[2]} '
-             f'"{kwa["destination"]}"'
-             )
-    count2 = (f'File {args[0]}/{args[1]} - Pass Two\n'
-              f'Application of Audio/Video filters...\n\nSource: '
-              f'"{kwa["source"]}"\nDestination: "{kwa["destination"]}"')
-    stamp2 = f'\n{count2}\n\n[COMMAND]:\n{pass2}'
-
-    if not platform.system() == 'Windows':
-        pass2 = shlex.split(pass2)
-
-    return {'pass2': pass2, 'count2': count2, 'stamp2': stamp2}
-# ----------------------------------------------------------------------
+JOB_STOP_MSG = '[VIDEOMASS]: STOP command received.'
 
 
 class FFmpeg(Thread):
@@ -309,6 +68,12 @@ class FFmpeg(Thread):
         """
         Called from `long_processing_task.topic_thread`.
         Also see `main_frame.switch_to_processing`.
+        The optional third argument is a `QueueState` instance
+        which records the state of each item as it completes.
+        The first pass of 'Two pass EBU' items is skipped when
+        the loudness was already measured, see `FFmpegJob`.
+        Items are encoded in segments at the same time (see
+        `run_chunked`) only when they are processed one at a time.
 
         """
         get = wx.GetApp()  # get data from bootstrap
@@ -317,7 +82,23 @@ class FFmpeg(Thread):
         self.count = 0  # count for loop
         self.logfile = args[0]  # log filename
         self.kwargs = args[1]  # it is a list of dictionaries
+        self.state = args[2] if len(args) > 2 else None  # queue state
         self.nargs = len(self.kwargs)  # how many items...
+        self.maxjobs = min(self.appdata['max_parallel_jobs'], self.nargs)
+        if self.appdata['ffmpeg_progress_pipe']:  # see `ffmpeg_cmd_args`
+            self.stdout = subprocess.PIPE
+        else:
+            self.stdout = None
+        if self.maxjobs == 1:
+            self.chunkjobs = self.appdata['chunked_encoding']
+        else:
+            self.chunkjobs = 0
+        # used if maxjobs > 1 or for chunked encodings
+        self.scheduler = JobScheduler(max(self.maxjobs, self.chunkjobs))
+        # parallel jobs run in their own working directory
+        self.jobs = build_jobs(self.appdata, self.kwargs,
+                               workdirs=self.maxjobs > 1)
+        self.cache = metadata_cache(self.appdata)  # loudness measurements
 
         Thread.__init__(self)
         self.start()
@@ -326,48 +107,61 @@ class FFmpeg(Thread):
         """
         Run the separated thread.
         """
+        if self.maxjobs > 1:
+            self.run_parallel()
+            return
+
         filedone = []
-        for kwa in self.kwargs:
+        for job in self.jobs:
             self.count += 1
-            if kwa['type'] == 'One pass':
-                model = simple_one_pass(self.count, self.nargs, **kwa)
-
-            elif kwa['type'] == 'Two pass EBU':
-                model = one_pass_ebu(self.count, self.nargs, **kwa)
-
-            elif kwa['type'] == 'Two pass VIDSTAB':
-                model = one_pass_stab(self.count, self.nargs, **kwa)
+            kwa = job.kwargs
+            self.update_state(kwa)
+            if self.chunkjobs > 1 and chunk_encoder(kwa):
+                status = self.run_chunked(job)
+                if status == 'STOP':
+                    time.sleep(.5)
+                    wx.CallAfter(pub.sendMessage, "END_EVT",
+                                 filetotrash=None)
+                    return
+                if status == 'DONE':
+                    filedone.append(kwa["source"])
+                if status is not None:
+                    continue
 
-            elif kwa['type'] == 'Two pass':
-                model = one_pass(self.count, self.nargs, **kwa)
+            if job.load_summary(self.cache):
+                tolog(f"{job.first.stamp}\n{MEASURED_MSG}", self.logfile,
+                      sep=True, wdate=True)
             else:
-                return
-
-            wx.CallAfter(pub.sendMessage,
-                         "COUNT_EVT",
-                         count=model['count1'],
-                         duration=kwa['duration'],
-                         end='CONTINUE',
-                         )
-            tolog(model['stamp1'], self.logfile, sep=True, wdate=True)
-            try:
-                with Popen(model['pass1'],
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc1:
-
-                    for line in proc1.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=kwa['duration'],
-                                     status=0
-                                     )
+                wx.CallAfter(pub.sendMessage,
+                             "COUNT_EVT",
+                             count=job.first.header,
+                             duration=kwa['duration'],
+                             end='CONTINUE',
+                             )
+                tolog(job.first.stamp, self.logfile, sep=True, wdate=True)
+                try:
+                    with Popen(job.first.command,
+                               stderr=subprocess.PIPE,
+                               stdin=subprocess.PIPE,
+                               bufsize=1,
+                               universal_newlines=True,
+                               encoding=self.appdata['encoding'],
+                               stdout=self.stdout,
+                               ) as proc1:
+                        # stopped by `stop`, no stderr lines on progress pipe
+                        self.scheduler.register(proc1)
+                        channel = self.progress_channel(kwa['duration'])
+                        reader = self.progress_reader(proc1, channel)
+                        for line in proc1.stderr:
+                            channel.feed(line)
+                            if self.stop_work_thread:
+                                break
+                            job.parse_output(line)
+
+                        self.scheduler.unregister(proc1)
                         if self.stop_work_thread:
-                            proc1.stdin.write('q')  # stop ffmpeg
+                            stop_process(proc1)  # stop ffmpeg
+                            self.end_progress(channel, reader)
                             out = proc1.communicate()[1]
                             proc1.wait()
                             wx.CallAfter(pub.sendMessage,
@@ -377,113 +171,104 @@ class FFmpeg(Thread):
                                          status=1,
                                          )
                             tolog(out, self.logfile)
+                            self.update_state(kwa, 'STOP')
 
                             time.sleep(.5)
                             wx.CallAfter(pub.sendMessage, "END_EVT",
                                          filetotrash=None)
                             return
 
-                        if kwa["type"] == 'Two pass EBU':
-                            summary = model['summary']
-                            for k in summary:
-                                if line.startswith(k):
-                                    summary[k] = line.split(':')[1].split()[0]
-
-                    if proc1.wait():  # ..Failed
-                        out = proc1.communicate()[1]
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='FAILED',
-                                     duration=kwa['duration'],
-                                     status=proc1.wait(),
-                                     )
-                        tolog(f"[VIDEOMASS]: Error Exit Status: "
-                              f"{proc1.wait()} {out}", self.logfile
-                              )
-                        time.sleep(1)
-                        continue
-
-            except (OSError, FileNotFoundError) as err:
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count=err,
-                             duration=0,
-                             end='ERROR'
-                             )
-                tolog(err, self.logfile)
-                break
-
-            if proc1.wait() == 0:  # ..Finished
-                if not kwa["args"][1]:
-                    filedone.append(kwa["source"])
-                wx.CallAfter(pub.sendMessage,
-                             "COUNT_EVT",
-                             count='',
-                             duration=kwa['duration'],
-                             end='DONE'
-                             )
+                        self.end_progress(channel, reader)
+                        if proc1.wait():  # ..Failed
+                            out = proc1.communicate()[1]
+                            wx.CallAfter(pub.sendMessage,
+                                         "UPDATE_EVT",
+                                         output='FAILED',
+                                         duration=kwa['duration'],
+                                         status=proc1.wait(),
+                                         )
+                            tolog(f"[VIDEOMASS]: Error Exit Status: "
+                                  f"{proc1.wait()} {out}", self.logfile
+                                  )
+                            self.update_state(kwa, 'FAILED')
+                            time.sleep(1)
+                            continue
+
+                except (OSError, FileNotFoundError) as err:
+                    wx.CallAfter(pub.sendMessage,
+                                 "COUNT_EVT",
+                                 count=err,
+                                 duration=0,
+                                 end='ERROR'
+                                 )
+                    tolog(err, self.logfile)
+                    self.update_state(kwa, 'ERROR')
+                    break
+
+                if proc1.wait() == 0:  # ..Finished
+                    job.save_summary(self.cache)
+                    if not kwa["args"][1]:
+                        filedone.append(kwa["source"])
+                        self.update_state(kwa, 'DONE')
+                    wx.CallAfter(pub.sendMessage,
+                                 "COUNT_EVT",
+                                 count='',
+                                 duration=kwa['duration'],
+                                 end='DONE'
+                                 )
 
             if not kwa["args"][1]:
                 continue
 
             # --------------- second pass ----------------#
+            second = job.second_pass()
             if kwa["type"] == 'Two pass EBU':
-                filters = (f'{kwa["EBU"]}'
-                           f':measured_I={summary["Input Integrated:"]}'
-                           f':measured_LRA={summary["Input LRA:"]}'
-                           f':measured_TP={summary["Input True Peak:"]}'
-                           f':measured_thresh={summary["Input Threshold:"]}'
-                           f':offset={summary["Target Offset:"]}'
-                           f':linear=true:dual_mono=true'
-                           )
-                model = two_pass_ebu(self.count, self.nargs, filters, **kwa)
                 time.sleep(.5)
 
-            elif kwa['type'] == 'Two pass VIDSTAB':
-                model = two_pass_stab(self.count, self.nargs, **kwa)
-
-            elif kwa['type'] == 'Two pass':
-                model = two_pass(self.count, self.nargs, **kwa)
-
             wx.CallAfter(pub.sendMessage,
                          "COUNT_EVT",
-                         count=model['count2'],
+                         count=second.header,
                          duration=kwa['duration'],
                          end='CONTINUE',
                          )
-            tolog(model['stamp2'], self.logfile)
+            tolog(second.stamp, self.logfile)
 
-            with Popen(model['pass2'],
+            with Popen(second.command,
                        stderr=subprocess.PIPE,
                        stdin=subprocess.PIPE,
                        bufsize=1,
                        universal_newlines=True,
                        encoding=self.appdata['encoding'],
+                       stdout=self.stdout,
                        ) as proc2:
-
+                self.scheduler.register(proc2)
+                channel = self.progress_channel(kwa['duration'])
+                reader = self.progress_reader(proc2, channel)
                 for line2 in proc2.stderr:
+                    channel.feed(line2)
+                    if self.stop_work_thread:
+                        break
+
+                self.scheduler.unregister(proc2)
+                if self.stop_work_thread:
+                    stop_process(proc2)  # stop ffmpeg
+                    self.end_progress(channel, reader)
+                    out = proc2.communicate()[1]
+                    proc2.wait()
                     wx.CallAfter(pub.sendMessage,
                                  "UPDATE_EVT",
-                                 output=line2,
+                                 output='STOP',
                                  duration=kwa['duration'],
-                                 status=0,
+                                 status=1,
                                  )
-                    if self.stop_work_thread:
-                        proc2.stdin.write('q')  # stop ffmpeg
-                        out = proc2.communicate()[1]
-                        proc2.wait()
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output='STOP',
-                                     duration=kwa['duration'],
-                                     status=1,
-                                     )
-                        tolog(out, self.logfile)
-                        time.sleep(.5)
-                        wx.CallAfter(pub.sendMessage, "END_EVT",
-                                     filetotrash=None)
-                        return
-
+                    tolog(out, self.logfile)
+                    self.update_state(kwa, 'STOP')
+                    time.sleep(.5)
+                    wx.CallAfter(pub.sendMessage, "END_EVT",
+                                 filetotrash=None)
+                    return
+
+                self.end_progress(channel, reader)
                 if proc2.wait():  # ..Failed
                     out = proc2.communicate()[1]
                     wx.CallAfter(pub.sendMessage,
@@ -495,11 +280,13 @@ class FFmpeg(Thread):
                     tolog(f"[VIDEOMASS]: Error Exit Status: "
                           f"{proc2.wait()} {out}", self.logfile
                           )
+                    self.update_state(kwa, 'FAILED')
                     time.sleep(1)
                     continue
 
             if proc2.wait() == 0:  # ..Finished
                 filedone.append(kwa["source"])
+                self.update_state(kwa, 'DONE')
                 wx.CallAfter(pub.sendMessage,
                              "COUNT_EVT",
                              count='',
@@ -510,8 +297,357 @@ class FFmpeg(Thread):
         wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
     # --------------------------------------------------------------------#
 
+    def run_chunked(self, job):
+        """
+        Encode the item of `job` splitting its source in segments
+        which are encoded at the same time, see `chunked_encoding`.
+        Returns `None` if the source cannot be split, so that the
+        item is encoded as usual, one of 'DONE', 'FAILED' or 'STOP'
+        otherwise.
+        """
+        kwa = job.kwargs
+        tmpdir = os.path.join(self.appdata['cachedir'], 'tmp')
+        workdir = tempfile.mkdtemp(prefix='chunks_', dir=tmpdir)
+        try:
+            chunked = self.chunked_job(job, workdir)
+            if chunked is None:
+                return None
+            status = self.run_chunks(chunked)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        if status == 'DONE':
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count='',
+                         duration=kwa['duration'],
+                         end='DONE'
+                         )
+        else:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output=status,
+                         duration=kwa['duration'],
+                         status=1,
+                         )
+            time.sleep(1)
+        self.update_state(kwa, status)
+        return status
+    # --------------------------------------------------------------------#
+
+    def chunked_job(self, job, workdir):
+        """
+        Plan the segments of `job` at the keyframes of its source.
+        Returns a `ChunkedJob`, `None` if the source cannot be
+        probed, is too short to be split or its streams maps
+        cannot be resolved.
+        """
+        kwa = job.kwargs
+        cache = metadata_cache(self.appdata)
+        probe, error = ffprobe(kwa['source'],
+                               cmd=self.appdata['ffprobe_cmd'],
+                               txtenc=self.appdata['encoding'],
+                               cache=cache,
+                               hide_banner=None,
+                               pretty=None,
+                               )
+        if not error:
+            keyframes, error = keyframe_times(kwa['source'],
+                                              self.appdata['ffprobe_cmd'],
+                                              self.appdata['encoding'],
+                                              cache)
+        if error:
+            tolog(f"[VIDEOMASS]: Chunked encoding not available: {error}",
+                  self.logfile)
+            return None
+
+        start = time_to_integer(probe['format'].get('start_time', '0'))
+        keyframes = [pts - start / 1000 for pts in keyframes]
+        duration = kwa['duration'] / 1000
+        segments = plan_segments(keyframes, duration,
+                                 segment_length(duration, self.chunkjobs))
+        if len(segments) < 2:
+            return None
+        streams = [stream.get('codec_type') for stream in probe['streams']]
+        try:
+            return ChunkedJob(job, segments, workdir, streams)
+        except ValueError as error:
+            tolog(f"[VIDEOMASS]: Chunked encoding not available: {error}",
+                  self.logfile)
+            return None
+    # --------------------------------------------------------------------#
+
+    def run_chunks(self, chunked):
+        """
+        Run the segments of a `ChunkedJob` and the audio/subtitles
+        encoding at the same time, showing their merged progress on
+        a single bar, then join them.
+        Returns one of 'DONE', 'FAILED' or 'STOP'.
+        """
+        kwa = chunked.job.kwargs
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=chunked.header,
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     )
+        tolog(chunked.header, self.logfile, sep=True, wdate=True)
+        channel = self.progress_channel(kwa['duration'])
+        merged = MergedProgress(channel.update, len(chunked.jobs),
+                                npasses=2 if chunked.job.twopass else 1)
+        jobs = chunked.jobs + ([chunked.rest] if chunked.rest else [])
+        results = self.scheduler.run(partial(self.chunk_job, merged), jobs)
+        channel.flush()
+        if self.scheduler.stopped:
+            return 'STOP'
+        if any(res != 'DONE' for res in results):
+            return 'FAILED'
+
+        chunked.write_list()
+        section = [f"{chunked.join.stamp}\n"]
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=chunked.join.header,
+                     duration=kwa['duration'],
+                     end='CONTINUE',
+                     )
+        status = self.run_pass(chunked.join, section,
+                               partial(wx.CallAfter, pub.sendMessage,
+                                       "PROGRESS_EVT",
+                                       duration=kwa['duration']))
+        tolog(''.join(section), self.logfile)
+        if status in ('DONE', 'STOP'):
+            return status
+        return 'FAILED'
+    # --------------------------------------------------------------------#
+
+    def chunk_job(self, merged, count, job):
+        """
+        Run all the passes of a segment (or of the audio/subtitles
+        job, which has no progress) of a chunked encoding. The log
+        section of each segment is written when it ends.
+        Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        segment = count if count <= merged.nseg else None
+        section = [f"{job.first.stamp}\n"]
+        status = self.run_pass(job.first, section,
+                               partial(merged.update, segment, 1))
+        if status == 'DONE' and job.twopass:
+            second = job.second_pass()
+            section.append(f"{second.stamp}\n")
+            status = self.run_pass(second, section,
+                                   partial(merged.update, segment, 2))
+        if segment is not None:
+            merged.finish(segment)
+        tolog(''.join(section), self.logfile)
+        return status
+    # --------------------------------------------------------------------#
+
+    def update_state(self, kwa, status=None):
+        """
+        Record the start (if `status` is None) or the end of an
+        item on the queue state, if any. Write errors are logged.
+        """
+        if self.state is None:
+            return
+        if status is None:
+            error = self.state.start(kwa)
+        else:
+            error = self.state.finish(kwa, status)
+        if error:
+            tolog(error, self.logfile)
+    # --------------------------------------------------------------------#
+
+    def progress_reader(self, proc, channel):
+        """
+        Returns a `ProgressPipeReader` which updates the `channel`
+        if FFmpeg writes its progress on the standard output (see
+        `ffmpeg_cmd_args`), `None` otherwise.
+        """
+        if proc.stdout is None:
+            return None
+        return ProgressPipeReader(proc.stdout, channel.update)
+    # --------------------------------------------------------------------#
+
+    def end_progress(self, channel, reader):
+        """
+        Wait for the end of the progress `reader` (if any), then
+        send the last pending messages of the `channel`.
+        """
+        if reader is not None:
+            reader.join()
+        channel.flush()
+    # --------------------------------------------------------------------#
+
+    def progress_channel(self, duration):
+        """
+        Returns a new `ProgressChannel` which sends the
+        FFmpeg messages by the pubsub PROGRESS_EVT protocol.
+        """
+        return ProgressChannel(partial(wx.CallAfter, pub.sendMessage,
+                                       "PROGRESS_EVT", duration=duration))
+    # --------------------------------------------------------------------#
+
+    def run_parallel(self):
+        """
+        Run up to `maxjobs` items at the same time using a
+        `JobScheduler`. Each job sends its own progress tagged
+        with its item number (see JOB_* events on `LogOut`) and
+        writes its log section all at once when it ends, so the
+        sections of concurrent jobs never interleave.
+        """
+        jobs = [(kwa['source'], kwa['duration'] * (2 if kwa['args'][1] else 1))
+                for kwa in self.kwargs]
+        wx.CallAfter(pub.sendMessage, "JOBS_START_EVT",
+                     jobs=jobs, maxjobs=self.maxjobs)
+
+        results = self.scheduler.run(self.parallel_job, self.jobs)
+
+        if self.scheduler.stopped:
+            filedone = None
+        else:
+            filedone = [kwa['source'] for kwa, res in
+                        zip(self.kwargs, results) if res == 'DONE']
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+    # --------------------------------------------------------------------#
+
+    def parallel_job(self, count, job):
+        """
+        Runs all the passes of a single item in a private working
+        directory, since two-pass log files and vidstab transforms
+        are written to the current directory by FFmpeg.
+        Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        tmpdir = os.path.join(self.appdata['cachedir'], 'tmp')
+        workdir = tempfile.mkdtemp(prefix='job_', dir=tmpdir)
+        section = []
+        self.update_state(job.kwargs)
+        status = 'ERROR'
+        try:
+            status = self.parallel_job_passes(count, job, workdir, section)
+        finally:
+            tolog(''.join(section), self.logfile, sep=True, wdate=True)
+            shutil.rmtree(workdir, ignore_errors=True)
+            self.update_state(job.kwargs, status)
+
+        return status
+    # --------------------------------------------------------------------#
+
+    def parallel_job_passes(self, count, job, workdir, section):
+        """
+        Run the first and (if any) the second pass of
+        an item. Log messages are collected in `section`.
+        """
+        kwa = job.kwargs
+        section.append(f"{job.first.stamp}\n")
+        if job.load_summary(self.cache):
+            section.append(f"{MEASURED_MSG}\n")
+        else:
+            status = self.parallel_job_pass(count, job.first, job,
+                                            workdir, section, 0)
+            if status != 'DONE' or not job.twopass:
+                return self.parallel_job_end(count, kwa, status, section)
+            job.save_summary(self.cache)
+
+        second = job.second_pass()
+        section.append(f"{second.stamp}\n")
+        status = self.parallel_job_pass(count, second, job, workdir,
+                                        section, kwa['duration'])
+        return self.parallel_job_end(count, kwa, status, section)
+    # --------------------------------------------------------------------#
+
+    def parallel_job_pass(self, count, ffpass, job, workdir, section, offset):
+        """
+        Run a single FFmpeg pass of an item. The `offset` is
+        the progress already done by the previous passes of the
+        same item, in milliseconds.
+        Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        wx.CallAfter(pub.sendMessage, "JOB_COUNT_EVT", jobid=count,
+                     count=ffpass.header, offset=offset, end='CONTINUE')
+        return self.run_pass(ffpass, section,
+                             partial(self.job_progress, count, offset),
+                             job=job, cwd=workdir)
+    # --------------------------------------------------------------------#
+
+    def run_pass(self, ffpass, section, post, job=None, cwd=None):
+        """
+        Run a FFmpeg pass registered on the `scheduler`, so that
+        it can be stopped along with the other running passes.
+        The progress is sent by a `ProgressChannel` to `post`, the
+        other messages are collected in `section`. First pass
+        lines are given to the `job` (if any) to be parsed.
+        Returns one of 'DONE', 'FAILED', 'STOP' or 'ERROR'.
+        """
+        try:
+            with Popen(ffpass.command,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       cwd=cwd,
+                       stdout=self.stdout,
+                       ) as proc:
+                if not self.scheduler.register(proc):
+                    return 'STOP'
+                channel = ProgressChannel(post)
+                reader = self.progress_reader(proc, channel)
+                try:
+                    for line in proc.stderr:
+                        progress = parse_progress(line)
+                        if progress:
+                            channel.update(progress)
+                        else:
+                            section.append(f"[FFMPEG]: {line}")
+
+                        if job is not None and ffpass.npass == 1:
+                            job.parse_output(line)
+
+                        if self.scheduler.stopped:
+                            out = proc.stderr.read()
+                            section.append(f"{out}\n{JOB_STOP_MSG}\n")
+                            return 'STOP'
+
+                    if proc.wait():  # ..Failed
+                        out = proc.stderr.read()
+                        section.append(f"[VIDEOMASS]: Error Exit Status: "
+                                       f"{proc.wait()} {out}\n")
+                        return 'FAILED'
+                finally:
+                    self.end_progress(channel, reader)
+                    self.scheduler.unregister(proc)
+
+        except (OSError, FileNotFoundError) as err:
+            section.append(f"{err}\n")
+            return 'ERROR'
+
+        return 'DONE'
+    # --------------------------------------------------------------------#
+
+    def job_progress(self, jobid, offset, progress, lines):
+        """
+        Send the progress of a parallel job, see `parallel_job_pass`.
+        """
+        if progress:
+            wx.CallAfter(pub.sendMessage, "JOB_UPDATE_EVT", jobid=jobid,
+                         progress=progress, offset=offset)
+    # --------------------------------------------------------------------#
+
+    def parallel_job_end(self, count, kwa, status, section):
+        """
+        Notify the end of an item along with its log section.
+        """
+        wx.CallAfter(pub.sendMessage, "JOB_COUNT_EVT", jobid=count,
+                     count=''.join(section), offset=kwa['duration'],
+                     end=status)
+        return status
+    # --------------------------------------------------------------------#
+
     def stop(self):
         """
         Sets the stop work thread to terminate the process
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
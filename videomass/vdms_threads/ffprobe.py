@@ -29,7 +29,12 @@ import subprocess
 import shlex
 import platform
 import json
+import threading
 from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.data_cache import file_signature, make_key
+
+VERSIONS = {}  # ffprobe version string by command
+LOCK = threading.Lock()
 
 
 def from_kwargs_to_args(kwargs):
@@ -46,7 +51,30 @@ def from_kwargs_to_args(kwargs):
     return args
 
 
-def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
+def ffprobe_version(cmd='ffprobe'):
+    """
+    Returns the first line of `ffprobe -version` output for the
+    given command, `None` on errors. The output is memoized,
+    so that ffprobe is run only once per command.
+    """
+    with LOCK:
+        if cmd not in VERSIONS:
+            try:
+                with Popen([cmd, '-version'],
+                           stdout=subprocess.PIPE,
+                           stderr=subprocess.PIPE,
+                           universal_newlines=True,
+                           ) as proc:
+                    output = proc.communicate()[0]
+                version = None if proc.returncode else output.split('\n')[0]
+            except (OSError, UnicodeDecodeError):
+                version = None
+            VERSIONS[cmd] = version
+        return VERSIONS[cmd]
+# ------------------------------------------------------------------------
+
+
+def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', cache=None, **kwargs):
     """
     Run ffprobe subprocess on the specified file.
     This function always returns a tuple of two items (data, error),
@@ -61,6 +89,11 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
         non-zero exit code, Returns (None, str(error)).
         Returns a JSON representation (dict(data), None) of the
         subprocess output otherwise.
+    Cache:
+        If a `DataCache` instance is given with the `cache` arg,
+        successful outputs are stored by file path, size, mtime,
+        ffprobe version and args; unchanged files are then read
+        from the cache without running ffprobe.
     Usage:
         >>> from videomass.vdms_threads.ffprobe import ffprobe
         >>> probe = ffprobe(filename,
@@ -74,8 +107,19 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
         >>> else:
         >>>     probe[0]
     """
+    opts = " ".join(from_kwargs_to_args(kwargs))
+    key = None
+    if cache is not None:
+        signature = file_signature(filename)
+        version = ffprobe_version(cmd)
+        if signature and version:
+            key = make_key('ffprobe', version, opts, *signature)
+            output = cache.get(key)
+            if output is not None:
+                return json.loads(output), None
+
     args = (f'"{cmd}" -show_format -show_streams -of json '
-            f'{" ".join(from_kwargs_to_args(kwargs))} '
+            f'{opts} '
             f'"{filename}"'
             )
     args = shlex.split(args) if platform.system() != 'Windows' else args
@@ -95,4 +139,8 @@ def ffprobe(filename, cmd='ffprobe', txtenc='utf-8', **kwargs):
     except (OSError, FileNotFoundError, UnicodeDecodeError) as excepterr:
         return (None, excepterr)
 
-    return json.loads(output), None
+    data = json.loads(output)
+    if key:
+        cache.put(key, output)
+
+    return data, None
@@ -0,0 +1,302 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: filter_preview.py
+Porpose: live preview of the video filters chain
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+FFmpeg can not change the filter graph of a running process, so the
+live preview decodes a small window of frames of the source file once
+and keeps them in memory as raw PPM images. Each change of the filter
+chain only runs a short-lived FFmpeg process which reads those frames
+from its standard input, applies the chain and writes back PNG images
+scaled to the preview size: the source is never seeked and decoded
+again until the file or the time position change.
+"""
+from dataclasses import dataclass
+from threading import Thread, Condition
+import platform
+import re
+import subprocess
+import time
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import tolog
+if not platform.system() == 'Windows':
+    import shlex
+
+WINDOW = 5  # decoded frames kept in memory, for temporal filters
+LATENCY = 0.5  # seconds, render time budget of a preview
+PNG_END = b'IEND\xaeB`\x82'  # the last chunk of each PNG image
+PPM_HEADER = re.compile(rb'P6\s+(\d+)\s+(\d+)\s+(\d+)\s')
+
+
+def split_png(data):
+    """
+    Split the concatenated PNG images `data` (bytes) read
+    from an FFmpeg image2pipe output. Returns a list of bytes.
+    """
+    frames, start = [], 0
+    while True:
+        end = data.find(PNG_END, start)
+        if end < 0:
+            return frames
+        end += len(PNG_END)
+        frames.append(data[start:end])
+        start = end
+# ------------------------------------------------------------------------
+
+
+def split_ppm(data):
+    """
+    Split the concatenated binary PPM images `data` (bytes)
+    read from an FFmpeg image2pipe output. Returns a list of
+    bytes, an incomplete last image is discarded.
+    """
+    frames, pos = [], 0
+    while True:
+        header = PPM_HEADER.match(data, pos)
+        if not header:
+            return frames
+        width, height, maxval = (int(num) for num in header.groups())
+        end = header.end() + width * height * (3 if maxval < 256 else 6)
+        if end > len(data):
+            return frames
+        frames.append(data[pos:end])
+        pos = end
+# ------------------------------------------------------------------------
+
+
+@dataclass
+class PreviewJob:
+    """
+    A filter chain to preview on a time position of a file.
+    """
+    filename: str  # source filename
+    position: str  # time position, e.g. '00:01:30.000'
+    chain: str  # video filters chain, without `-vf`
+    size: tuple  # (width, height) of the preview
+    callback: object  # called with (error, frames, elapsed)
+    logfile: str = 'generic_task.log'
+    serial: int = 0  # number of the update
+    closes: int = 0  # number of closes before the update
+# ------------------------------------------------------------------------
+
+
+class FilterPreview(Thread):
+    """
+    Renders the preview of a video filter chain from a
+    background thread.
+    The frames of the last decoded window are kept until the
+    file or the time position change, so that each update only
+    filters them. A new update stops the render still running
+    and only the last one is delivered, by calling its callback
+    with `post`, e.g. `wx.CallAfter`.
+
+    To keep each render within the `budget` (seconds), the
+    number of frames filtered is halved when a render takes
+    longer, and doubled again when it is much faster.
+
+    Usage:
+        >>> preview = FilterPreview(appdata, wx.CallAfter)
+        >>> preview.update('a.mkv', '00:00:05.000', 'hqdn3d,eq=gamma=1.2',
+                           (480, 270), self.on_preview, logfile)
+        >>> preview.close()  # releases the decoded frames
+    """
+    def __init__(self, appdata, post=None, window=WINDOW, budget=LATENCY):
+        """
+        appdata: the application settings (`ffmpeg_cmd`, etc.)
+        post: function to call the callbacks, `post(func, *args)`,
+              default calls them directly from the worker thread.
+        window: number of frames to decode.
+        budget: render time budget in seconds.
+        """
+        self.appdata = appdata
+        self.post = post or (lambda func, *args: func(*args))
+        self.window = window
+        self.budget = budget
+        self.cond = Condition()
+        self.job = None  # the next job to run
+        self.serial = 0  # serial number of the latest job
+        self.closes = 0  # times the preview was closed
+        self.proc = None  # the running FFmpeg process
+        self.decoding = None  # (filename, position) being decoded
+        self.source = None  # (filename, position) of the decoded frames
+        self.frames = []  # the decoded PPM frames
+        self.count = window  # frames to filter, see `adapt`
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ------------------------------------------------------------------
+
+    def update(self, filename, position, chain, size, callback,
+               logfile='generic_task.log'):
+        """
+        Render the preview of `chain` at the `position` of
+        `filename`, superseding any previous update.
+        """
+        with self.cond:
+            self.serial += 1
+            self.job = PreviewJob(filename, position, chain, size,
+                                  callback, logfile, self.serial,
+                                  self.closes)
+            proc, decoding = self.proc, self.decoding
+            self.cond.notify()
+        if proc and decoding != (filename, position):
+            self.kill(proc)
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """
+        Discard the pending updates and release the
+        decoded frames.
+        """
+        with self.cond:
+            self.serial += 1
+            self.closes += 1
+            self.job = None
+            self.source, self.frames = None, []
+            proc = self.proc
+        if proc:
+            self.kill(proc)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def kill(proc):
+        """
+        Stop a running FFmpeg process. The stdin pipe of the
+        renders is binary, so `q` can not be sent.
+        """
+        try:
+            proc.terminate()
+        except OSError:
+            pass
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Serve the latest update, then wait for the next one.
+        """
+        while True:
+            with self.cond:
+                while self.job is None:
+                    self.cond.wait()
+                job, self.job = self.job, None
+            start = time.monotonic()
+            error, frames = self.preview(job)
+            elapsed = time.monotonic() - start
+            with self.cond:
+                if job.serial != self.serial:
+                    continue  # superseded or closed
+            self.post(job.callback, error, frames, elapsed)
+    # ------------------------------------------------------------------
+
+    def preview(self, job):
+        """
+        Decode the frames window if needed, then filter it.
+        Returns a tuple (error, list of PNG images).
+        """
+        source = (job.filename, job.position)
+        if source != self.source:
+            self.source, self.frames = None, []
+            data, error = self.execute(f'-ss {job.position} '
+                                       f'-i "{job.filename}" -an -sn '
+                                       f'-frames:v {self.window} '
+                                       f'-pix_fmt rgb24 -f image2pipe '
+                                       f'-c:v ppm pipe:1',
+                                       job.logfile, decoding=source)
+            if error:
+                return error, []
+            frames = split_ppm(data)
+            if not frames:
+                return (f"[VIDEOMASS]: ERROR:\nNo frames decoded at "
+                        f"{job.position}"), []
+            with self.cond:
+                if job.closes == self.closes:  # not closed meanwhile
+                    self.source, self.frames = source, frames
+                    self.count = len(frames)
+        else:
+            frames = self.frames
+        width, height = job.size
+        scale = (f'scale={width}:{height}:'
+                 f'force_original_aspect_ratio=decrease')
+        vfilter = ','.join(flt for flt in (job.chain, scale) if flt)
+        start = time.monotonic()
+        data, error = self.execute(f'-f ppm_pipe -i pipe:0 '
+                                   f'-vf "{vfilter}" -f image2pipe '
+                                   f'-c:v png pipe:1', job.logfile,
+                                   stdin=b''.join(frames[-self.count:]))
+        if error:
+            return error, []
+        self.adapt(time.monotonic() - start)
+        return None, split_png(data)
+    # ------------------------------------------------------------------
+
+    def adapt(self, elapsed):
+        """
+        Adjust the number of frames to filter according to
+        the `elapsed` time of the last render.
+        """
+        if elapsed > self.budget and self.count > 1:
+            self.count = max(1, self.count // 2)
+        elif elapsed < self.budget / 4 and self.count < len(self.frames):
+            self.count = min(len(self.frames), self.count * 2)
+    # ------------------------------------------------------------------
+
+    def execute(self, args, logfile, stdin=None, decoding=None):
+        """
+        Run FFmpeg with `args`, writing `stdin` (bytes) to its
+        input. Returns a tuple (output data, error message).
+        The command is only logged on error.
+        """
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} {args}'
+               )
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        try:
+            with Popen(cmd,
+                       stdin=subprocess.PIPE if stdin is not None else None,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                with self.cond:
+                    self.proc, self.decoding = proc, decoding
+                data, output = proc.communicate(stdin)
+                with self.cond:
+                    self.proc, self.decoding = None, None
+
+        except OSError as err:  # command not found
+            with self.cond:
+                self.proc, self.decoding = None, None
+            tolog(f"[VIDEOMASS]: ERROR:\n{err}", logfile)
+            return None, f"[VIDEOMASS]: ERROR:\n{err}"
+
+        if proc.returncode:  # ffmpeg error
+            output = output.decode(self.appdata["encoding"], 'replace')
+            tolog(f'INFO: VIDEOMASS TASK: Filters preview\n'
+                  f'INFO: VIDEOMASS COMMAND: {cmd}\n'
+                  f'INFO: [FFMPEG] OUTPUT:\n{output}', logfile,
+                  sep=True, wdate=True
+                  )
+            return None, f"[FFMPEG] OUTPUT ERROR:\n{output}"
+        return data, None
@@ -0,0 +1,235 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: frame_grabber.py
+Porpose: grab video frames for the filter previews in background
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from dataclasses import dataclass
+from threading import Thread, Condition, Lock
+import os
+import platform
+import subprocess
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import tolog
+from videomass.vdms_io.data_cache import frame_cache, frame_key
+from videomass.vdms_threads.scheduler import stop_process
+if not platform.system() == 'Windows':
+    import shlex
+
+GRABBERS = {}  # shared FrameGrabber instances by FFmpeg command
+PIPE_OUTPUT = '-f image2pipe -c:v png pipe:1'  # frames read from stdout
+LOCK = Lock()
+
+
+@dataclass
+class GrabRequest:
+    """
+    A frame to grab for the `owner` of the request.
+    """
+    owner: object  # any hashable, e.g. a dialog or (dialog, 'edit')
+    args: str  # FFmpeg input and output args, without the output file
+    output: str  # output image filename, `None` to read it from pipe
+    callback: object  # called with (error, output or data) on completion
+    logfile: str = 'generic_task.log'
+    source: str = None  # source filename, to cache the frame
+    proc: object = None  # the FFmpeg subprocess while running
+    data: bytes = None  # the PNG image read from pipe
+# ------------------------------------------------------------------------
+
+
+class FrameGrabber(Thread):
+    """
+    Grabs video frames for the previews of the filter dialogs
+    by FFmpeg subprocesses run from a background thread, so
+    that the GUI keeps responsive while seeking and decoding
+    large sources.
+
+    Each request belongs to an owner. A new request supersedes
+    the pending one of the same owner and stops its running
+    FFmpeg process, so that only the frame of the last request
+    is delivered. The callbacks are called by the `post`
+    function, e.g. `wx.CallAfter` to run them on the GUI thread.
+    Requests without an output filename get the frame as PNG
+    data read from the FFmpeg standard output, so that it can
+    be loaded by `wx.Image` without any temporary file.
+    Frames of requests with a `source` file are kept in the
+    preview frames cache (see `data_cache.frame_cache`), so
+    that the same frame is decoded only once.
+
+    Usage:
+        >>> grabber = frame_grabber(appdata, wx.CallAfter)
+        >>> grabber.request(self, '-ss 5 -i "a.mkv" -frames:v 1',
+                            '/tmp/a.png', self.on_frame, logfile,
+                            source='a.mkv')
+        >>> grabber.request(self, '-ss 5 -i "a.mkv" -frames:v 1 '
+                            '-vf scale=320:180', None, self.on_frame,
+                            logfile, source='a.mkv')  # PNG data
+        >>> grabber.cancel(self)  # e.g. when closing the dialog
+    """
+    def __init__(self, appdata, post=None):
+        """
+        appdata: the application settings (`ffmpeg_cmd`, etc.)
+        post: function to call the callbacks, `post(func, *args)`,
+              default calls them directly from the worker thread.
+        """
+        self.appdata = appdata
+        self.post = post or (lambda func, *args: func(*args))
+        self.cond = Condition()
+        self.pending = {}  # owner > request waiting to run, in order
+        self.latest = {}  # owner > last request not yet delivered
+        self.running = None
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ------------------------------------------------------------------
+
+    def request(self, owner, args, output, callback,
+                logfile='generic_task.log', source=None):
+        """
+        Queue a new frame grab for `owner`, superseding any other
+        request of the same owner. Returns the `GrabRequest`.
+        """
+        req = GrabRequest(owner, args, output, callback, logfile, source)
+        with self.cond:
+            self.latest[owner] = req
+            self.pending.pop(owner, None)
+            self.pending[owner] = req
+            running = self.running
+            self.cond.notify()
+        if running and running.owner == owner and running.proc:
+            stop_process(running.proc)
+        return req
+    # ------------------------------------------------------------------
+
+    def cancel(self, owner):
+        """
+        Discard the pending and running requests of `owner`,
+        their callbacks will not be called.
+        """
+        with self.cond:
+            self.latest.pop(owner, None)
+            self.pending.pop(owner, None)
+            running = self.running
+        if running and running.owner == owner and running.proc:
+            stop_process(running.proc)
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Serve the requests one at a time, in order.
+        """
+        while True:
+            with self.cond:
+                while not self.pending:
+                    self.cond.wait()
+                owner = next(iter(self.pending))
+                req = self.pending.pop(owner)
+                self.running = req
+            error = self.grab(req)
+            with self.cond:
+                self.running = None
+            self.post(self.deliver, req, error)
+    # ------------------------------------------------------------------
+
+    def grab(self, req):
+        """
+        Run FFmpeg for a request, returns an error message
+        or `None` on success.
+        """
+        pipe = req.output is None
+        cache = frame_cache(self.appdata) if req.source else None
+        if cache:  # the output image format is part of the key
+            ext = 'pipe' if pipe else os.path.splitext(req.output)[1]
+            key = frame_key(req.source, f'{req.args} {ext}')
+        else:
+            key = None
+        if key and pipe:
+            req.data = cache.get(key)
+            if req.data is not None:
+                return None
+        elif key and cache.restore(key, req.output):
+            return None
+        output = PIPE_OUTPUT if pipe else f'"{req.output}"'
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} '
+               f'{req.args} {output}'
+               )
+        tolog(f'INFO: VIDEOMASS TASK: Frame grab\n'
+              f'INFO: VIDEOMASS COMMAND: {cmd}', req.logfile,
+              sep=True, wdate=True
+              )
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE if pipe else None,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                with self.cond:
+                    req.proc = proc
+                    superseded = self.latest.get(req.owner) is not req
+                if superseded:
+                    stop_process(proc)
+                data, output = proc.communicate()
+                output = output.decode(self.appdata["encoding"], 'replace')
+                tolog(f'INFO: [FFMPEG] OUTPUT:\n{output}', req.logfile)
+                if proc.returncode or (pipe and not data):  # ffmpeg error
+                    return f"[FFMPEG] OUTPUT ERROR:\n{output}"
+
+            if pipe:
+                req.data = data
+                if key:
+                    cache.put(key, data)
+            elif key:
+                cache.store(key, req.output)
+
+        except OSError as err:  # command not found
+            tolog(f"[VIDEOMASS]: ERROR:\n{err}", req.logfile)
+            return f"[VIDEOMASS]: ERROR:\n{err}"
+
+        return None
+    # ------------------------------------------------------------------
+
+    def deliver(self, req, error):
+        """
+        Call the callback of a request unless it was superseded
+        or cancelled in the meantime.
+        """
+        with self.cond:
+            if self.latest.get(req.owner) is not req:
+                return
+            del self.latest[req.owner]
+        req.callback(error, req.data if req.output is None else req.output)
+# ------------------------------------------------------------------------
+
+
+def frame_grabber(appdata, post=None):
+    """
+    Returns the `FrameGrabber` shared by all the filter
+    dialogs, it is started on first use.
+    """
+    with LOCK:
+        if appdata['ffmpeg_cmd'] not in GRABBERS:
+            GRABBERS[appdata['ffmpeg_cmd']] = FrameGrabber(appdata, post)
+        return GRABBERS[appdata['ffmpeg_cmd']]
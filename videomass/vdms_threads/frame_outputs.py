@@ -0,0 +1,125 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: frame_outputs.py
+Porpose: several image sequences from a single video decoding
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+Thumbnails, mosaics and full-size frames of the same movie are
+made by a single FFmpeg process: the decoded video is duplicated
+by the split filter into a chain of filters per output.
+Sparse thumbnails of long movies can instead be read by seeking
+the input at each timestamp, so that only a few frames around the
+keyframes are decoded (see `seek_batches`).
+See `image_extractor` for the processing thread.
+"""
+import os
+import re
+from dataclasses import dataclass
+
+SEEK_BATCH = 16  # thumbnails per FFmpeg process on seeking
+
+
+@dataclass
+class FrameOutput:
+    """
+    An image sequence to save from the decoded video.
+
+    Usage:
+        >>> out = FrameOutput('Thumbnails', '/out/clip_%d.jpg', fps=0.2,
+                              vfilter='scale=w=320:h=-1',
+                              args='-pix_fmt yuvj420p')
+    """
+    name: str  # shown in the summary
+    filename: str  # output pathname, e.g. '/out/clip_%d.jpg'
+    fps: float = 0  # frames per second to save, 0 to save all
+    vfilter: str = ''  # further filters, e.g. scale or tile
+    args: str = ''  # further output args, e.g. '-pix_fmt rgb24'
+
+    def chain(self):
+        """
+        Returns the filter chain of this output.
+        """
+        filters = [f'fps={self.fps}' if self.fps else '', self.vfilter]
+        return ','.join(flt for flt in filters if flt) or 'null'
+
+    def count(self):
+        """
+        Returns the number of images saved so far.
+        """
+        dirname, basename = os.path.split(self.filename)
+        if '%d' not in basename:
+            return int(os.path.isfile(self.filename))
+        prefix, suffix = basename.split('%d', 1)
+        pattern = re.compile(f'{re.escape(prefix)}[0-9]+{re.escape(suffix)}')
+        try:
+            return len([name for name in os.listdir(dirname)
+                        if pattern.fullmatch(name)])
+        except OSError:
+            return 0
+# ------------------------------------------------------------------------
+
+
+def frame_outputs_args(outputs):
+    """
+    Returns the FFmpeg output args to save all the `outputs`
+    (list of `FrameOutput`) from the first video stream.
+    """
+    if len(outputs) == 1:
+        graph = f'[0:v:0]{outputs[0].chain()}[o0]'
+    else:
+        labels = ''.join(f'[v{num}]' for num in range(len(outputs)))
+        chains = ';'.join(f'[v{num}]{out.chain()}[o{num}]'
+                          for num, out in enumerate(outputs))
+        graph = f'[0:v:0]split={len(outputs)}{labels};{chains}'
+    maps = ' '.join(' '.join(arg for arg in (f'-map "[o{num}]"', out.args,
+                                             f'-y "{out.filename}"') if arg)
+                    for num, out in enumerate(outputs))
+    return f'-filter_complex "{graph}" {maps}'
+# ------------------------------------------------------------------------
+
+
+def seek_batches(filename, output, duration, start=0.0, batch=SEEK_BATCH):
+    """
+    Split the thumbnails of `output` (a `FrameOutput`) into
+    batches of FFmpeg args, each thumbnail is read by its own
+    input-side seek instead of decoding the whole movie. Only
+    the keyframe next to each seek point is decoded.
+    `duration` and `start` are in seconds. Returns a list of
+    tuples (args, number of thumbnails).
+    """
+    total = max(1, int(duration * output.fps))
+    seeks = [start + num / output.fps for num in range(total)]
+    skip = '-skip_frame nokey -noaccurate_seek '
+    vfilter = f'-vf "{output.vfilter}" ' if output.vfilter else ''
+    extra = f'{output.args} ' if output.args else ''
+    batches = []
+    for first in range(0, total, batch):
+        times = seeks[first:first + batch]
+        inputs = ' '.join(f'{skip}-ss {pos:.3f} -i "{filename}"'
+                          for pos in times)
+        names = [output.filename.replace('%d', str(first + num + 1))
+                 for num in range(len(times))]
+        outs = ' '.join(f'-map {num}:v:0 -frames:v 1 {vfilter}{extra}'
+                        f'-y "{name}"' for num, name in enumerate(names))
+        batches.append((f'{inputs} {outs}', len(times)))
+    return batches
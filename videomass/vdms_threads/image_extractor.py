@@ -24,14 +24,20 @@ This file is part of Videomass.
    You should have received a copy of the GNU General Public License
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
 from threading import Thread
+from functools import partial
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import Popen, time_to_integer
 from videomass.vdms_io.make_filelog import tolog
+from videomass.vdms_threads.progress_channel import ProgressChannel
+from videomass.vdms_threads.frame_outputs import (frame_outputs_args,
+                                                  seek_batches)
+from videomass.vdms_threads.scheduler import JobScheduler
 if not platform.system() == 'Windows':
     import shlex
 
@@ -40,6 +46,13 @@ class PicturesFromVideo(Thread):
     """
     This class represents a separate thread for running simple
     single processes to save video sequences as pictures.
+    If the `outputs` keyword arg is given (a list of
+    `FrameOutput`), all the image sequences are saved
+    from a single decoding and counted at the end.
+    If the `engine` keyword arg is 'seek', the thumbnails of
+    the first output are read by seeking the input at each
+    timestamp, by batches of FFmpeg processes run at the same
+    time (see `frame_outputs.seek_batches`).
 
     NOTE capturing output in real-time (Windows, Unix):
 
@@ -60,10 +73,14 @@ class PicturesFromVideo(Thread):
         self.fname = kwargs['filename']
         self.outputdir = kwargs['outputdir']  # output directory
         self.cmd = kwargs['args']  # comand set on single pass
-        self.duration = kwargs['duration'][0]  # duration list
+        self.outputs = kwargs.get('outputs')
+        if self.outputs:
+            self.cmd = frame_outputs_args(self.outputs)
+        self.duration = kwargs['duration'][0]  # of the selected file
         self.count = 0  # count first for loop
         self.logfile = args[0]  # log filename
         self.kwa = kwargs
+        self.scheduler = JobScheduler(self.appdata['max_image_workers'])
 
         Thread.__init__(self)
         self.start()  # self.run()
@@ -72,6 +89,9 @@ class PicturesFromVideo(Thread):
         """
         Subprocess initialize thread.
         """
+        if self.kwa.get('engine') == 'seek':
+            self.run_seeks()
+            return
         filedone = []
         cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
                f'{self.kwa["start-time"]} '
@@ -104,14 +124,14 @@ class PicturesFromVideo(Thread):
                        universal_newlines=True,
                        encoding=self.appdata['encoding'],
                        ) as proc:
+                channel = ProgressChannel(partial(wx.CallAfter,
+                                                  pub.sendMessage,
+                                                  "PROGRESS_EVT",
+                                                  duration=self.duration))
                 for line in proc.stderr:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output=line,
-                                 duration=self.duration,
-                                 status=0,
-                                 )
+                    channel.feed(line)
                     if self.stop_work_thread:
+                        channel.flush()
                         proc.stdin.write('q')  # stop ffmpeg
                         out = proc.communicate()[1]
                         proc.wait()
@@ -127,6 +147,7 @@ class PicturesFromVideo(Thread):
                                      filetotrash=None)
                         return
 
+                channel.flush()
                 if proc.wait():  # error
                     out = proc.communicate()[1]
                     wx.CallAfter(pub.sendMessage,
@@ -142,6 +163,7 @@ class PicturesFromVideo(Thread):
 
                 else:  # Done
                     filedone.append(self.fname)
+                    self.summary()
                     wx.CallAfter(pub.sendMessage,
                                  "COUNT_EVT",
                                  count='',
@@ -161,8 +183,123 @@ class PicturesFromVideo(Thread):
         wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
     # --------------------------------------------------------------------#
 
+    def run_seeks(self):
+        """
+        Save the thumbnails by input-side seeks, see `seek_batches`.
+        """
+        start = 0.0
+        if self.kwa["start-time"]:  # e.g. -ss 00:01:00.000
+            start = time_to_integer(self.kwa["start-time"].split()[1]) / 1000
+        batches = seek_batches(self.fname, self.outputs[0],
+                               self.duration / 1000, start)
+        count1 = (f'File 1/1\nSource: "{self.fname}"\n'
+                  f'Destination: "{self.outputdir}"\n'
+                  f'Keyframe seeking: {len(batches)} batches')
+        wx.CallAfter(pub.sendMessage,
+                     "COUNT_EVT",
+                     count=count1,
+                     duration=len(batches),
+                     end='CONTINUE',
+                     )
+        tolog(count1, self.logfile, sep=True, wdate=True)
+        errors = []
+
+        def seek(count, batch):
+            """
+            Run a batch of seeks, on errors all the other
+            batches are stopped.
+            """
+            cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+                   f'{self.appdata["ffmpeg-default-args"]} '
+                   f'{self.appdata["ffmpeg_loglev"]} '
+                   f'{batch[0]}'
+                   )
+            tolog(f'[COMMAND]:\n{cmd}', self.logfile)
+            if not platform.system() == 'Windows':
+                cmd = shlex.split(cmd)
+            try:
+                with Popen(cmd,
+                           stderr=subprocess.PIPE,
+                           stdin=subprocess.PIPE,
+                           bufsize=1,
+                           universal_newlines=True,
+                           encoding=self.appdata['encoding'],
+                           ) as proc:
+                    if not self.scheduler.register(proc):
+                        return
+                    try:
+                        out = proc.communicate()[1]
+                    finally:
+                        self.scheduler.unregister(proc)
+
+                if proc.returncode and not self.scheduler.stopped:
+                    errors.append(proc.returncode)
+                    self.scheduler.stop()
+                    tolog(f"[VIDEOMASS]: Error Exit Status: "
+                          f"{proc.returncode} {out}", self.logfile)
+                elif not proc.returncode:
+                    wx.CallAfter(pub.sendMessage,
+                                 "UPDATE_EVT",
+                                 output=(f' |{count}/{len(batches)}|  '
+                                         f'{batch[1]} thumbnails\n'),
+                                 duration=0,
+                                 status=0,
+                                 )
+            except (OSError, FileNotFoundError) as err:
+                errors.append(err)
+                self.scheduler.stop()
+                tolog(err, self.logfile)
+
+        self.scheduler.run(seek, batches)
+        filedone = []
+        if self.stop_work_thread:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='STOP',
+                         duration=self.kwa['duration'],
+                         status=1,
+                         )
+        elif errors:
+            wx.CallAfter(pub.sendMessage,
+                         "UPDATE_EVT",
+                         output='FAILED',
+                         duration=self.kwa['duration'],
+                         status=1,
+                         )
+        else:
+            filedone.append(self.fname)
+            self.summary()
+            wx.CallAfter(pub.sendMessage,
+                         "COUNT_EVT",
+                         count='',
+                         duration='',
+                         end='DONE'
+                         )
+        time.sleep(.5)
+        wx.CallAfter(pub.sendMessage, "END_EVT", filetotrash=filedone)
+    # --------------------------------------------------------------------#
+
+    def summary(self):
+        """
+        Report the number of images saved by each output.
+        """
+        if not self.outputs:
+            return
+        text = ''.join(f'{out.name}: {out.count()} images in '
+                       f'"{os.path.dirname(out.filename)}"\n'
+                       for out in self.outputs)
+        wx.CallAfter(pub.sendMessage,
+                     "UPDATE_EVT",
+                     output=text,
+                     duration=0,
+                     status=0,
+                     )
+        tolog(text, self.logfile)
+    # --------------------------------------------------------------------#
+
     def stop(self):
         """
         Sets the stop work thread to terminate the process
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: probe_files.py
+Porpose: Get media properties of many files at the same time
+Compatibility: Python3, wxPython Phoenix
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
+import wx
+from pubsub import pub
+from videomass.vdms_threads.ffprobe import ffprobe
+from videomass.vdms_io.data_cache import metadata_cache
+from videomass.vdms_io.image_header import image_probe
+from videomass.vdms_io.stream_signature import signature
+
+
+class ProbeFiles(Thread):
+    """
+    Runs ffprobe on a list of files using a bounded pool of
+    concurrent ffprobe processes, without blocking the GUI.
+
+    The results are sent in the same order as the given file
+    list, as soon as each of them is available, by the pubsub
+    "PROBE_RESULT_EVT" protocol with arguments (path, probe, error).
+    The "PROBE_END_EVT" protocol is sent at the end with the
+    `stopped` argument set to True if the stop method was called.
+    JPEG, PNG, BMP and WebP images are read by their header
+    without running ffprobe (see `image_header`). The stream
+    signature of each file is stored along with its data (see
+    `stream_signature`).
+    """
+    def __init__(self, filelist, maxworkers=4):
+        """
+        filelist: list of files to probe
+        maxworkers: maximum number of ffprobe processes at the same time
+        """
+        get = wx.GetApp()
+        self.appdata = get.appset
+        self.stop_work_thread = False  # process terminate
+        self.filelist = filelist
+        self.maxworkers = max(1, maxworkers)
+        self.cache = metadata_cache(self.appdata)
+
+        Thread.__init__(self)
+        self.start()
+    # ----------------------------------------------------------------#
+
+    def run(self):
+        """
+        Subprocesses initialization
+        """
+        with ThreadPoolExecutor(max_workers=self.maxworkers) as pool:
+            futures = [pool.submit(self.probe, path)
+                       for path in self.filelist]
+            for path, fut in zip(self.filelist, futures):
+                if self.stop_work_thread:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    break
+                probe, error = fut.result()
+                wx.CallAfter(pub.sendMessage,
+                             "PROBE_RESULT_EVT",
+                             path=path,
+                             probe=probe,
+                             error=error,
+                             )
+        wx.CallAfter(pub.sendMessage,
+                     "PROBE_END_EVT",
+                     stopped=self.stop_work_thread,
+                     )
+    # ----------------------------------------------------------------#
+
+    def probe(self, path):
+        """
+        Probe a single file, returns the tuple
+        given from the `ffprobe` function.
+        """
+        if self.stop_work_thread:
+            return None, None
+        probe = image_probe(path)
+        if probe:
+            return probe, None
+        probe, error = ffprobe(path,
+                               cmd=self.appdata['ffprobe_cmd'],
+                               txtenc=self.appdata['encoding'],
+                               cache=self.cache,
+                               hide_banner=None,
+                               pretty=None,
+                               )
+        if probe:
+            signature(probe)
+        return probe, error
+    # ----------------------------------------------------------------#
+
+    def stop(self):
+        """
+        Sets the stop work thread to skip the remaining files.
+        The ffprobe processes already running are completed.
+        """
+        self.stop_work_thread = True
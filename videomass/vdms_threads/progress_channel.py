@@ -0,0 +1,215 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: progress_channel.py
+Porpose: Coalesce FFmpeg output messages sent to the GUI
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import time
+import threading
+from videomass.vdms_utils.utils import time_to_integer
+
+
+def parse_progress(line):
+    """
+    Parse a FFmpeg statistics line such as:
+
+        "frame= 1178 fps=155 q=29.0 size=    2072kB time=00:00:39.02
+         bitrate= 435.0kbits/s speed=5.15x  "
+
+    Returns a dict with string values of all the keys found, e.g.
+    {'frame': '1178', 'fps': '155', ..., 'speed': '5.15x'}, with
+    the additional 'msec' key (int) equal to the `time` value in
+    milliseconds. Returns `None` if `line` is not a progress line.
+    """
+    if 'time=' not in line:
+        return None
+    out = [a for a in "=".join(line.split()).split('=') if a]
+    itobj = iter(out)
+    progress = dict(zip(itobj, itobj))
+    progress['msec'] = time_to_integer(progress.get('time', '0'))
+    return progress
+# ----------------------------------------------------------------------
+
+
+def parse_progress_block(block):
+    """
+    Convert a block of key=value pairs written by the FFmpeg
+    `-progress` option into a dict like the one returned by
+    `parse_progress`. `block` is a dict of the raw pairs, e.g.
+    {'frame': '1178', 'out_time_us': '39020000', ...}.
+    """
+    progress = {}
+    for key in ('frame', 'fps', 'bitrate'):
+        if key in block:
+            progress[key] = block[key]
+    if block.get('total_size', 'N/A').isdigit():
+        progress['size'] = f"{int(block['total_size']) // 1024}kB"
+    progress['time'] = block.get('out_time', 'N/A')
+    progress['speed'] = block.get('speed', 'N/A').strip()
+    usec = block.get('out_time_us', 'N/A')
+    progress['msec'] = int(usec) // 1000 if usec.lstrip('-').isdigit() else 0
+    progress['msec'] = max(progress['msec'], 0)
+    return progress
+# ----------------------------------------------------------------------
+
+
+def read_progress_blocks(stream):
+    """
+    Generator which reads the output of the FFmpeg `-progress`
+    option from `stream` (a text file object) and yields a dict
+    given by `parse_progress_block` at the end of each block.
+    """
+    block = {}
+    for line in stream:
+        key, sep, val = line.strip().partition('=')
+        if not sep:
+            continue
+        if key == 'progress':  # `continue` or `end`, the block ends
+            yield parse_progress_block(block)
+            block = {}
+        else:
+            block[key] = val
+# ----------------------------------------------------------------------
+
+
+class ProgressPipeReader(threading.Thread):
+    """
+    Reads the FFmpeg `-progress pipe:1` output in a separated
+    thread, calling `callback(progress)` for each block, where
+    `progress` is the dict given by `parse_progress_block`.
+    Use `join` to wait until FFmpeg closes its standard output.
+
+    Usage:
+        >>> reader = ProgressPipeReader(proc.stdout, channel.update)
+        >>> for line in proc.stderr:  # diagnostic messages only
+        >>>     channel.feed(line)
+        >>> reader.join()
+        >>> channel.flush()
+    """
+    def __init__(self, stream, callback):
+        """
+        stream: the standard output of the FFmpeg process
+        callback: callable which receives the progress dict
+        """
+        self.stream = stream
+        self.callback = callback
+        threading.Thread.__init__(self, daemon=True)
+        self.start()
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Read blocks until the end of the stream.
+        """
+        try:
+            for progress in read_progress_blocks(self.stream):
+                self.callback(progress)
+        except (OSError, ValueError):
+            pass  # stream closed
+# ----------------------------------------------------------------------
+
+
+class ProgressChannel:
+    """
+    Collects the output lines of a FFmpeg subprocess in the
+    worker thread and sends them to the GUI at a fixed maximum
+    rate, instead of sending one event for each line.
+
+    Progress lines are parsed here and only the last one is sent;
+    all the other lines are sent together as a list, so the
+    receiver can write them with a single call.
+
+    Usage:
+        >>> post = partial(wx.CallAfter, pub.sendMessage, "PROGRESS_EVT",
+                           duration=duration)
+        >>> channel = ProgressChannel(post, rate=10)
+        >>> for line in proc.stderr:
+        >>>     channel.feed(line)
+        >>> channel.flush()  # always flush at the end
+
+    `post` is called with the keyword arguments `progress`
+    (a dict given by `parse_progress` or `None`) and `lines`
+    (a list of strings, possibly empty). It is called at most
+    `rate` times per second by `feed`; the `events` attribute
+    counts all the calls. The `feed`, `update` and `flush` methods
+    can be called from different threads.
+    """
+    def __init__(self, post, rate=10, clock=time.monotonic):
+        """
+        post: callable which sends the collected data
+        rate: maximum number of `post` calls per second
+        clock: function returning the current time in seconds
+        """
+        self.post = post
+        self.interval = 1 / rate
+        self.clock = clock
+        self.progress = None
+        self.lines = []
+        self.last = None
+        self.events = 0
+        self.lock = threading.RLock()
+    # ------------------------------------------------------------------
+
+    def feed(self, line):
+        """
+        Add an output line, sending the pending data if the
+        time interval since the last sending has elapsed.
+        """
+        progress = parse_progress(line)
+        with self.lock:
+            if progress:
+                self.progress = progress
+            else:
+                self.lines.append(line)
+            self.flush_if_due()
+    # ------------------------------------------------------------------
+
+    def update(self, progress):
+        """
+        Same as `feed` but with an already parsed `progress` dict.
+        """
+        with self.lock:
+            self.progress = progress
+            self.flush_if_due()
+    # ------------------------------------------------------------------
+
+    def flush_if_due(self):
+        """
+        Send the pending data if the time interval is elapsed.
+        """
+        if self.last is None or self.clock() - self.last >= self.interval:
+            self.flush()
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """
+        Send the pending data now, if any.
+        """
+        with self.lock:
+            if self.progress is None and not self.lines:
+                return
+            progress, lines = self.progress, self.lines
+            self.progress, self.lines = None, []
+            self.last = self.clock()
+            self.events += 1
+            self.post(progress=progress, lines=lines)
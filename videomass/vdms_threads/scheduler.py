@@ -0,0 +1,149 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: scheduler.py
+Porpose: Bounded worker pool to run concurrent subprocess jobs
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import threading
+import time
+
+
+def stop_process(proc, timeout=10):
+    """
+    Ask a running FFmpeg subprocess to quit by sending `q` on
+    its standard input, then wait up to `timeout` seconds for
+    it to finish. If the process does not exit in time it is
+    killed. Processes without a stdin pipe are terminated.
+    """
+    stop_processes([proc], timeout)
+# ----------------------------------------------------------------------
+
+
+def stop_processes(procs, timeout=10):
+    """
+    Like `stop_process` for a list of subprocesses: all of them
+    are asked to quit first, then they share the same `timeout`,
+    so that stopping many processes never takes longer than one.
+    """
+    procs = [proc for proc in procs if proc.poll() is None]
+    for proc in procs:
+        try:
+            if proc.stdin:
+                proc.stdin.write('q')  # stop ffmpeg
+                proc.stdin.flush()
+            else:
+                proc.terminate()
+        except (OSError, ValueError):
+            pass  # pipe already closed, the process is exiting
+    deadline = time.monotonic() + timeout
+    for proc in procs:
+        try:
+            proc.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+# ----------------------------------------------------------------------
+
+
+class JobScheduler:
+    """
+    Runs a callable over a list of items using a bounded pool
+    of worker threads. Workers register the subprocess they spawn,
+    so that a stop request cancels all the running children at
+    once.
+
+    Usage:
+        >>> sched = JobScheduler(maxjobs=4)
+        >>> results = sched.run(func, items)  # calls func(count, item)
+        >>> sched.stop()  # from any other thread
+
+    The `run` method blocks until all the jobs are done and
+    returns the results in the same order as `items`. Jobs
+    not yet started when `stop` is called are skipped and
+    their result is `None`.
+    """
+    def __init__(self, maxjobs=1, timeout=10):
+        """
+        maxjobs: maximum number of jobs running at the same time.
+        timeout: seconds to wait for the subprocesses to quit
+                 on stop before killing them.
+        """
+        self.maxjobs = max(1, int(maxjobs))
+        self.timeout = timeout
+        self.stopped = False
+        self.procs = set()
+        self.lock = threading.Lock()
+    # ------------------------------------------------------------------
+
+    def run(self, func, items):
+        """
+        Call `func(count, item)` for each item, where `count`
+        is the 1-based position of the item. Returns a list of
+        results in input order.
+        """
+        with ThreadPoolExecutor(max_workers=self.maxjobs) as pool:
+            futures = [pool.submit(self.call, func, count, item)
+                       for count, item in enumerate(items, 1)]
+            return [fut.result() for fut in futures]
+    # ------------------------------------------------------------------
+
+    def call(self, func, count, item):
+        """
+        Run a single job unless a stop was requested.
+        """
+        if self.stopped:
+            return None
+        return func(count, item)
+    # ------------------------------------------------------------------
+
+    def register(self, proc):
+        """
+        Keep track of a running subprocess. Returns False if a
+        stop was already requested, in which case the process is
+        stopped immediately.
+        """
+        with self.lock:
+            if not self.stopped:
+                self.procs.add(proc)
+                return True
+        stop_process(proc, self.timeout)
+        return False
+    # ------------------------------------------------------------------
+
+    def unregister(self, proc):
+        """
+        Forget a subprocess that has finished.
+        """
+        with self.lock:
+            self.procs.discard(proc)
+    # ------------------------------------------------------------------
+
+    def stop(self):
+        """
+        Skip the queued jobs and stop all the running subprocesses.
+        """
+        with self.lock:
+            self.stopped = True
+            procs = list(self.procs)
+        stop_processes(procs, self.timeout)
@@ -6,7 +6,7 @@ Compatibility: Python3, wxPython4 Phoenix
 Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
 Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
 license: GPL3
-Rev: Mar.08.2024
+Rev: Oct.18.2026
 Code checker: flake8, pylint
 
 This file is part of Videomass.
@@ -27,26 +27,35 @@ This file is part of Videomass.
 import os
 import tempfile
 from threading import Thread
+from functools import partial
 import time
 import subprocess
 import platform
 import wx
 from pubsub import pub
-from videomass.vdms_utils.utils import Popen
+from videomass.vdms_utils.utils import (Popen,
+                                        integer_to_time,
+                                        write_concat_list,
+                                        )
 from videomass.vdms_io.make_filelog import tolog
+from videomass.vdms_threads.progress_channel import ProgressChannel
+from videomass.vdms_threads.scheduler import JobScheduler
 if not platform.system() == 'Windows':
     import shlex
 
 
 def convert_images(*varargs, **kwargs):
     """
-    Convert images to PNG format and assign
-    progressive digits to them.
+    Convert images to BMP format and assign progressive
+    digits to them in the order of the file list. Images
+    are converted at the same time by the bounded pool of
+    the given `JobScheduler`, see `max_image_workers`.
     """
     flist = varargs[0]
     tmpdir = varargs[1]
     logfile = varargs[2]
     imagenames = varargs[3]
+    scheduler = varargs[4]
 
     count1 = (f'Preparing temporary files...\nSource: Imported file list\n'
               f'Destination: "{tmpdir}"\n')
@@ -56,15 +65,19 @@ def convert_images(*varargs, **kwargs):
                  duration=len(flist),
                  end='CONTINUE',
                  )
-    prognum = 0
     args = (f'"{kwargs["ffmpeg_cmd"]}" '
             f'{kwargs["ffmpeg-default-args"]} '
             f'{kwargs["ffmpeg_loglev"]} ')
     tolog(f'Preparing temporary files...\n'
           f'\n[COMMAND:]\n{args}', logfile, sep=True, wdate=True
           )
-    for files in flist:
-        prognum += 1
+    errors = []
+
+    def convert(prognum, files):
+        """
+        Convert a single image, on errors all the other
+        conversions are stopped.
+        """
         tmpf = os.path.join(tmpdir, f'{imagenames}{prognum}.bmp')
         cmd_1 = f'{args} -i "{files}" "{tmpf}"'
 
@@ -77,22 +90,27 @@ def convert_images(*varargs, **kwargs):
                        universal_newlines=True,
                        encoding=kwargs['encoding'],
                        ) as proc1:
-                error = proc1.communicate()[1]
+                if not scheduler.register(proc1):
+                    return
+                try:
+                    error = proc1.communicate()[1]
+                finally:
+                    scheduler.unregister(proc1)
 
             if proc1.returncode:  # ffmpeg error
-                if error:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='FAILED',
-                                 duration=0,
-                                 status=proc1.wait(),
-                                 )
-                    tolog(f"[VIDEOMASS]: Error Exit Status: "
-                          f"{proc1.wait()} {error}", logfile
-                          )
-                    time.sleep(1)
-                    return error
-
+                if scheduler.stopped:  # stopped by others
+                    return
+                errors.append(error)
+                scheduler.stop()
+                wx.CallAfter(pub.sendMessage,
+                             "UPDATE_EVT",
+                             output='FAILED',
+                             duration=0,
+                             status=proc1.returncode,
+                             )
+                tolog(f"[VIDEOMASS]: Error Exit Status: "
+                      f"{proc1.returncode} {error}", logfile
+                      )
             else:  # ok
                 wx.CallAfter(pub.sendMessage,
                              "UPDATE_EVT",
@@ -101,13 +119,19 @@ def convert_images(*varargs, **kwargs):
                              status=0,
                              )
         except (OSError, FileNotFoundError) as err:  # cmd not found
+            errors.append(err)
+            scheduler.stop()
             wx.CallAfter(pub.sendMessage,
                          "COUNT_EVT",
                          count=err,
                          duration=0,
                          end='ERROR',
                          )
-            return err
+
+    scheduler.run(convert, flist)
+    if errors:
+        time.sleep(1)
+        return errors[0]
 
     time.sleep(.5)
     wx.CallAfter(pub.sendMessage,
@@ -203,11 +227,23 @@ def resizing_process(*varargs, **kwargs):
     return None
 
 
+def image_format(flist):
+    """
+    Returns the file extension shared by all the images
+    of `flist` (jpg and jpeg are the same), None if their
+    formats are mixed.
+    """
+    exts = {os.path.splitext(name)[1].lower().replace('jpeg', 'jpg')
+            for name in flist}
+    return exts.pop() if len(exts) == 1 else None
+
+
 class SlideshowMaker(Thread):
     """
     Represents the ffmpeg subprocess to produce a video in
-    mkv format from a sequence of images already converted
-    and resized in a temporary context.
+    mkv format from a sequence of images. Images of the same
+    format are read straight from the source files, otherwise
+    they are first converted and resized in a temporary context.
     """
 
     def __init__(self, *args, **kwargs):
@@ -226,6 +262,7 @@ class SlideshowMaker(Thread):
         self.logfile = args[0]  # log filename
         self.destination = kwargs['destination']
         self.kwa = kwargs
+        self.scheduler = JobScheduler(self.appdata['max_image_workers'])
 
         self.start()
 
@@ -233,16 +270,14 @@ class SlideshowMaker(Thread):
         """
         Subprocess initialize thread.
         """
-        imgtmpnames = 'TMP_' if self.kwa["resize"] else 'IMAGE_'
         filedone = []
         with tempfile.TemporaryDirectory() as tempdir:  # make tmp dir
-            tmpproc1 = convert_images(self.kwa['source'],
-                                      tempdir,
-                                      self.logfile,
-                                      imgtmpnames,
-                                      **self.appdata,
-                                      )
-            if tmpproc1 is not None or self.stop_work_thread:
+            if image_format(self.kwa['source']):
+                source, preinput, args = self.streaming_input(tempdir)
+            elif self.temporary_images(tempdir):
+                source = os.path.join(tempdir, 'IMAGE_%d.bmp')
+                preinput, args = self.kwa["pre-input-1"], self.kwa["args"]
+            else:
                 wx.CallAfter(pub.sendMessage,
                              "UPDATE_EVT",
                              output='ERROR',
@@ -252,35 +287,16 @@ class SlideshowMaker(Thread):
                 self.end_process(None)
                 return
 
-            if imgtmpnames == 'TMP_':
-                tmpproc2 = resizing_process(self.kwa['source'],
-                                            tempdir,
-                                            self.kwa["resize"],
-                                            self.logfile,
-                                            **self.appdata,
-                                            )
-
-                if tmpproc2 is not None or self.stop_work_thread:
-                    wx.CallAfter(pub.sendMessage,
-                                 "UPDATE_EVT",
-                                 output='ERROR',
-                                 duration=self.kwa['duration'],
-                                 status=1,
-                                 )
-                    self.end_process(None)
-                    return
-
             # ------------------------------- make video
-            tmpgroup = os.path.join(tempdir, 'IMAGE_%d.bmp')
             cmd_2 = (f'"{self.appdata["ffmpeg_cmd"]}" '
                      f'{self.appdata["ffmpeg-default-args"]} '
                      f'{self.appdata["ffmpeg_loglev"]} '
-                     f'{self.kwa["pre-input-1"]} '
-                     f'-i "{tmpgroup}" '
-                     f'{self.kwa["args"]} '
+                     f'{preinput} '
+                     f'-i "{source}" '
+                     f'{args} '
                      f'"{self.destination}"'
                      )
-            count = (f'\n\nVideo production...\nSource: "{tempdir}"\n'
+            count = (f'\n\nVideo production...\nSource: "{source}"\n'
                      f'Destination: "{self.destination}"\n')
             log = f'{count}\n\n[COMMAND]:\n{cmd_2}'
 
@@ -304,14 +320,14 @@ class SlideshowMaker(Thread):
                            universal_newlines=True,
                            encoding=self.appdata['encoding'],
                            ) as proc2:
+                    channel = ProgressChannel(partial(wx.CallAfter,
+                                                      pub.sendMessage,
+                                                      "PROGRESS_EVT",
+                                                      duration=self.duration))
                     for line in proc2.stderr:
-                        wx.CallAfter(pub.sendMessage,
-                                     "UPDATE_EVT",
-                                     output=line,
-                                     duration=self.duration,
-                                     status=0,
-                                     )
+                        channel.feed(line)
                         if self.stop_work_thread:
+                            channel.flush()
                             proc2.stdin.write('q')  # stop ffmpeg
                             out = proc2.communicate()[1]
                             proc2.wait()
@@ -326,6 +342,7 @@ class SlideshowMaker(Thread):
                             self.end_process(None)
                             return
 
+                    channel.flush()
                     if proc2.wait():  # error
                         out = proc2.communicate()[1]
                         wx.CallAfter(pub.sendMessage,
@@ -357,6 +374,61 @@ class SlideshowMaker(Thread):
                 tolog(err, self.logfile)
         self.end_process(filedone)
 
+    def temporary_images(self, tempdir):
+        """
+        Convert the images to BMP format in `tempdir`, then
+        resize them if required. Needed when images of different
+        formats cannot be read by a single demuxer.
+        Returns True if done, False otherwise.
+        """
+        imgtmpnames = 'TMP_' if self.kwa["resize"] else 'IMAGE_'
+        tmpproc1 = convert_images(self.kwa['source'],
+                                  tempdir,
+                                  self.logfile,
+                                  imgtmpnames,
+                                  self.scheduler,
+                                  **self.appdata,
+                                  )
+        if tmpproc1 is not None or self.stop_work_thread:
+            return False
+
+        if imgtmpnames == 'TMP_':
+            tmpproc2 = resizing_process(self.kwa['source'],
+                                        tempdir,
+                                        self.kwa["resize"],
+                                        self.logfile,
+                                        **self.appdata,
+                                        )
+            if tmpproc2 is not None or self.stop_work_thread:
+                return False
+        return True
+
+    def streaming_input(self, tempdir):
+        """
+        Feed the source images straight into the encoder by a
+        concat demuxer list, the resizing is made by the same
+        filter graph, so no temporary images are written.
+        Returns a tuple (source, pre-input args, output args).
+        """
+        args = self.kwa["args"]
+        if self.kwa["resize"]:  # e.g. -vf "scale=640:-1"
+            scale = self.kwa["resize"].split('"')[1]
+            args = args.replace('-vf "', f'-vf "{scale},', 1)
+
+        if len(self.kwa['source']) == 1:
+            return self.kwa['source'][0], self.kwa["pre-input-1"], args
+
+        listfile = os.path.join(tempdir, 'images.txt')
+        write_concat_list([os.path.abspath(f) for f in self.kwa['source']],
+                          listfile, self.kwa['interval'] or 1)
+        preinput = '-f concat -safe 0'
+        if self.kwa['loop']:
+            preinput = (f'-stream_loop -1 -t {integer_to_time(self.duration)} '
+                        f'{preinput}')
+        tolog(f'Streaming {len(self.kwa["source"])} images by "{listfile}"',
+              self.logfile, sep=True, wdate=True)
+        return listfile, preinput, args
+
     def end_process(self, filedone):
         """
         The process is finished
@@ -369,3 +441,4 @@ class SlideshowMaker(Thread):
         Sets the stop work thread to terminate the process
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
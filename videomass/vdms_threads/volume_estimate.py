@@ -0,0 +1,112 @@
+# -*- coding: UTF-8 -*-
+"""
+File Name: volume_estimate.py
+Porpose: fast volume estimate by sampling short windows
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+A full volumedetect analysis decodes the whole audio stream, which
+takes minutes on multi-hour recordings. The fast estimate measures
+only a few short windows evenly spaced along the probed duration,
+each window is read by its own input seeking, so only the sampled
+audio is decoded. The mean volume is extrapolated from the energy
+of the windows with a 95% error bound, the max volume of the
+windows is a lower bound of the real one.
+
+See `volumedetect` for the processing thread.
+"""
+import re
+import math
+import statistics
+
+SAMPLE_WINDOWS = 12  # number of windows to measure
+SAMPLE_LENGTH = 10  # length of each window in seconds
+MIN_RATIO = 4  # sample at most 1/MIN_RATIO of the duration
+VOLUME_RE = re.compile(r'Parsed_volumedetect_(\d+) .*\] '
+                       r'(max|mean)_volume: (\S+) dB')
+
+
+def sample_windows(duration, start=0.0, nwin=SAMPLE_WINDOWS,
+                   length=SAMPLE_LENGTH):
+    """
+    Returns the start times in seconds of `nwin` windows of
+    `length` seconds, each centered on an equal part of the
+    `duration` (in seconds) from `start`. Returns an empty
+    list if the duration is too short to be worth sampling.
+    """
+    if duration < nwin * length * MIN_RATIO:
+        return []
+    step = duration / nwin
+    return [round(start + num * step + (step - length) / 2, 3)
+            for num in range(nwin)]
+# ------------------------------------------------------------------------
+
+
+def sample_args(filename, windows, audiomap='', length=SAMPLE_LENGTH):
+    """
+    Returns the FFmpeg input and filter args to measure each
+    window by a separate volumedetect filter. `audiomap` is the
+    audio index map, e.g. '-map 0:a:1', default is the first
+    audio stream.
+    """
+    stream = audiomap.split()[-1].split(':', 1)[1] if audiomap else 'a:0'
+    inputs = ' '.join(f'-ss {pos} -t {length} -i "{filename}"'
+                      for pos in windows)
+    graph = ';'.join(f'[{num}:{stream}]volumedetect[a{num}]'
+                     for num in range(len(windows)))
+    maps = ' '.join(f'-map "[a{num}]"' for num in range(len(windows)))
+    return f'{inputs} -filter_complex "{graph}" {maps}'
+# ------------------------------------------------------------------------
+
+
+def parse_windows(lines):
+    """
+    Parse the volumedetect report lines of FFmpeg, returns a
+    list of (max_volume, mean_volume) float values per window,
+    in the order of the windows.
+    """
+    measures = {}
+    for line in lines:
+        match = VOLUME_RE.search(line)
+        if match:
+            num, name, value = match.groups()
+            measures.setdefault(int(num), {})[name] = float(value)
+    return [(val['max'], val['mean']) for num, val in
+            sorted(measures.items()) if len(val) == 2]
+# ------------------------------------------------------------------------
+
+
+def estimate_volume(measures):
+    """
+    Extrapolate the volume of the whole stream from the
+    `measures` of the windows (see `parse_windows`). Returns
+    a tuple (maxvol, meanvol, bound) formatted as volumedetect
+    does, where bound is the 95% error bound in dB of meanvol.
+    """
+    peak = max(mx for mx, mean in measures)
+    energy = statistics.fmean([10 ** (mean / 10) for mx, mean in measures])
+    meanvol = 10 * math.log10(energy) if energy else -math.inf
+    bound = 0.0
+    finite = [mean for mx, mean in measures if math.isfinite(mean)]
+    if len(finite) > 1:
+        bound = 1.96 * statistics.stdev(finite) / math.sqrt(len(finite))
+    return f'{peak:.1f} dB', f'{meanvol:.1f} dB', round(bound, 1)
@@ -25,13 +25,22 @@ This file is part of Videomass.
    along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
 """
 import os
-from threading import Thread
+import json
+from threading import Thread, Lock
 import subprocess
 import platform
 import wx
 from pubsub import pub
 from videomass.vdms_utils.utils import Popen
 from videomass.vdms_io.make_filelog import make_log_template, tolog
+from videomass.vdms_io.data_cache import metadata_cache, measurement_key
+from videomass.vdms_threads.scheduler import JobScheduler
+from videomass.vdms_threads.volume_estimate import (sample_windows,
+                                                    sample_args,
+                                                    parse_windows,
+                                                    estimate_volume,
+                                                    )
+from videomass.vdms_utils.utils import time_to_integer
 if not platform.system() == 'Windows':
     import shlex
 
@@ -40,7 +49,13 @@ class VolumeDetectThread(Thread):
     """
     This class represents a separate subprocess thread to get
     audio volume peak level when required for audio normalization
-    process.
+    process. Up to `max_analysis_workers` files are analyzed at
+    the same time, each completed file is notified to the pop-up
+    dialog by the "POPUP_PROGRESS_EVT" pubsub protocol.
+    Measurements are kept in the metadata cache, so unchanged
+    files are not analyzed again with the same args.
+    If the `durations` of the files are given, long files get a
+    fast estimate by sampling short windows (see `volume_estimate`).
 
     NOTE: all error handling (including verification of the
     existence of files) is entrusted to ffmpeg, except for the
@@ -50,7 +65,7 @@ class VolumeDetectThread(Thread):
     STOP = ('WARNING: [VIDEOMASS]: STOP command received by signal '
             'event.\nTerminated process ')
 
-    def __init__(self, timeseq, filelist, audiomap):
+    def __init__(self, timeseq, filelist, audiomap, durations=None):
         """
         Replace /dev/null with NUL on Windows.
 
@@ -60,6 +75,11 @@ class VolumeDetectThread(Thread):
                    parameters and the self.status of the output error,
                    in the form:
                    ([[maxvol, medvol], [etc,etc]], None or "str errors")
+                   The list of volume parameters is in the same order
+                   as `filelist`. Estimated volumes have a third item,
+                   the error bound in dB of medvol.
+        durations: list of the durations in milliseconds of the
+                   files, or None for full measurements only.
         """
         get = wx.GetApp()
         self.appdata = get.appset
@@ -67,8 +87,13 @@ class VolumeDetectThread(Thread):
         self.filelist = filelist
         self.time_seq = timeseq
         self.audiomap = audiomap
+        self.durations = durations
         self.status = None
         self.data = None
+        self.done = 0  # count of analyzed files
+        self.lock = Lock()
+        self.scheduler = JobScheduler(self.appdata['max_analysis_workers'])
+        self.cache = metadata_cache(self.appdata)
         self.nul = 'NUL' if platform.system() == 'Windows' else '/dev/null'
         self.logfile = os.path.join(self.appdata['logdir'],
                                     'volumedetected.log')
@@ -88,73 +113,150 @@ class VolumeDetectThread(Thread):
               the end of the process to close of the pop-up
 
         """
-        volume = []
-        for files in self.filelist:
-            cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
-                   f'{self.appdata["ffmpeg-default-args"]} '
-                   f'{self.appdata["ffmpeg_loglev"]} '
-                   f'{self.time_seq[0]} '
-                   f'-i "{files}" '
-                   f'{self.time_seq[1]} '
-                   f'{self.audiomap} '
-                   f'-af volumedetect -vn -sn -dn -f null '
-                   f'{self.nul}'
-                   )
-            tolog(f'INFO: VIDEOMASS COMMAND: {cmd}',
+        volume = self.scheduler.run(self.volume_detect, self.filelist)
+        if not self.status and self.scheduler.stopped:
+            self.status = 'STOP'
+        self.data = (volume, self.status)
+
+        wx.CallAfter(pub.sendMessage,
+                     "RESULT_EVT",
+                     status=''
+                     )
+    # ----------------------------------------------------------------#
+
+    def volume_detect(self, count, files):
+        """
+        Analyze a single file, returns a tuple (maxvol, meanvol),
+        or (maxvol, meanvol, bound) for estimates.
+        On errors all the other analyses are stopped.
+        """
+        windows = self.windows(count)
+        kind = 'volumeestimate' if windows else 'volumedetect'
+        key = None
+        if self.cache is not None:
+            key = measurement_key(kind, files, self.audiomap,
+                                  list(self.time_seq))
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            tolog(f'INFO: VIDEOMASS: "{files}" already analyzed: {cached}',
                   self.logfile, sep=True, wdate=True)
+            self.progress(files)
+            return tuple(json.loads(cached))
 
-            if not platform.system() == 'Windows':
-                cmd = shlex.split(cmd)
-            try:
-                with Popen(cmd,
-                           stderr=subprocess.PIPE,
-                           stdin=subprocess.PIPE,
-                           bufsize=1,
-                           universal_newlines=True,
-                           encoding=self.appdata['encoding'],
-                           ) as proc:
-                    meanv, maxv = '', ''
+        if windows:
+            source = sample_args(files, windows, self.audiomap)
+        else:
+            source = (f'{self.time_seq[0]} -i "{files}" {self.time_seq[1]} '
+                      f'{self.audiomap} -af volumedetect')
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} '
+               f'{source} -vn -sn -dn -f null '
+               f'{self.nul}'
+               )
+        tolog(f'INFO: VIDEOMASS COMMAND: {cmd}',
+              self.logfile, sep=True, wdate=True)
+
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        meanv, maxv = '', ''
+        result = (maxv, meanv)
+        try:
+            with Popen(cmd,
+                       stderr=subprocess.PIPE,
+                       stdin=subprocess.PIPE,
+                       bufsize=1,
+                       universal_newlines=True,
+                       encoding=self.appdata['encoding'],
+                       ) as proc:
+                if not self.scheduler.register(proc):
+                    return result
+                output = []
+                try:
                     for line in proc.stderr:
+                        output.append(line)
                         if 'max_volume:' in line:
                             maxv = line.split(':')[1].strip()
                         if 'mean_volume:' in line:
                             meanv = line.split(':')[1].strip()
+                finally:
+                    self.scheduler.unregister(proc)
 
-                        if self.stop_work_thread:
-                            proc.stdin.write('q')  # stop ffmpeg
-                            proc.communicate()[1]
-                            out = (VolumeDetectThread.STOP
-                                   + f'with PID {proc.pid}')
-                            tolog(out, self.logfile)
-                            proc.wait()
-                            self.status = 'STOP'
-                            break
+                measures = parse_windows(output) if windows else None
+                if self.stop_work_thread:
+                    out = (VolumeDetectThread.STOP
+                           + f'with PID {proc.pid}')
+                    tolog(out, self.logfile)
 
-                        if proc.wait():
-                            output = proc.communicate()[1]
-                            tolog(f"[FFMPEG] ERROR:\n{output}", self.logfile)
-                            self.status = 'ERROR'
-                            break
+                elif proc.wait():
+                    tolog(f"[FFMPEG] ERROR:\n{''.join(output)}",
+                          self.logfile)
+                    self.error('ERROR')
 
-                    volume.append((maxv, meanv))
+                elif windows and not measures:
+                    tolog(f"[FFMPEG] ERROR: no volume data:\n"
+                          f"{''.join(output)}", self.logfile)
+                    self.error('ERROR')
 
-            except (OSError, FileNotFoundError) as err:
-                tolog(f'[VIDEOMASS]: ERROR: {err}', self.logfile)
-                self.status = 'ERROR'
+                elif windows:
+                    result = estimate_volume(measures)
+                    if key:
+                        self.cache.put(key, json.dumps(result))
 
-            if self.status:
-                break
+                else:
+                    result = (maxv, meanv)
+                    if key and maxv and meanv:
+                        self.cache.put(key, json.dumps(result))
 
-        self.data = (volume, self.status)
+        except (OSError, FileNotFoundError) as err:
+            tolog(f'[VIDEOMASS]: ERROR: {err}', self.logfile)
+            self.error('ERROR')
+
+        self.progress(files)
+        return result
+    # ----------------------------------------------------------------#
 
+    def windows(self, count):
+        """
+        Returns the start times of the windows to sample for the
+        file at `count` position, an empty list for a full analysis.
+        """
+        if not self.durations:
+            return []
+        start, duration = 0.0, self.durations[count - 1] / 1000
+        if self.time_seq[0]:
+            start = time_to_integer(self.time_seq[0].split()[1]) / 1000
+            duration = time_to_integer(self.time_seq[1].split()[1]) / 1000
+        return sample_windows(duration, start)
+    # ----------------------------------------------------------------#
+
+    def progress(self, files):
+        """
+        Notify the pop-up dialog that a file has been analyzed.
+        """
+        with self.lock:
+            self.done += 1
+            done = self.done
         wx.CallAfter(pub.sendMessage,
-                     "RESULT_EVT",
-                     status=''
+                     "POPUP_PROGRESS_EVT",
+                     message=(f'{done}/{len(self.filelist)}  '
+                              f'{os.path.basename(files)}'),
                      )
     # ----------------------------------------------------------------#
 
+    def error(self, status):
+        """
+        Set the error `status` and stop the other analyses.
+        """
+        with self.lock:
+            if not self.status:
+                self.status = status
+        self.scheduler.stop()
+    # ----------------------------------------------------------------#
+
     def stop(self):
         """
-        Sets the stop work thread to terminate the process
+        Sets the stop work thread to terminate the processes
         """
         self.stop_work_thread = True
+        self.scheduler.stop()
@@ -0,0 +1,199 @@
+# -*- coding: UTF-8 -*-
+"""
+Name: waveform_peaks.py
+Porpose: read the audio peaks of the timeline waveform
+Compatibility: Python3
+Author: Gianluca Pernigotto <jeanlucperni@gmail.com>
+Copyleft - 2026 Gianluca Pernigotto <jeanlucperni@gmail.com>
+license: GPL3
+Rev: Oct.18.2026
+Code checker: flake8, pylint
+
+This file is part of Videomass.
+
+   Videomass is free software: you can redistribute it and/or modify
+   it under the terms of the GNU General Public License as published by
+   the Free Software Foundation, either version 3 of the License, or
+   (at your option) any later version.
+
+   Videomass is distributed in the hope that it will be useful,
+   but WITHOUT ANY WARRANTY; without even the implied warranty of
+   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+   GNU General Public License for more details.
+
+   You should have received a copy of the GNU General Public License
+   along with Videomass.  If not, see <http://www.gnu.org/licenses/>.
+
+The waveform of the timeline is drawn from the peaks of the first
+audio stream: FFmpeg decodes it downsampled to mono 16-bit samples,
+which are reduced to one peak per `1 / PEAK_RATE` seconds, stored as
+one unsigned byte each (about 180 KiB per hour). The peaks are kept
+in the metadata cache, so that the waveform of an unchanged file is
+read once and can be drawn at any width or zoom (see `peak_columns`).
+"""
+from array import array
+from threading import Thread
+import platform
+import subprocess
+import sys
+from videomass.vdms_utils.utils import Popen
+from videomass.vdms_io.make_filelog import tolog
+from videomass.vdms_io.data_cache import metadata_cache, measurement_key
+if not platform.system() == 'Windows':
+    import shlex
+
+SAMPLE_RATE = 4000  # Hz, the audio is decoded downsampled
+PEAK_RATE = 50  # peaks per second
+CHUNK = SAMPLE_RATE // PEAK_RATE  # samples per peak
+BLOCK = CHUNK * 2 * PEAK_RATE * 60  # bytes read at a time, one minute
+
+
+def pcm_peaks(data):
+    """
+    Returns the peaks of the mono signed 16-bit little-endian
+    samples `data` (bytes), one byte (0-255) every `CHUNK`
+    samples.
+    """
+    samples = array('h')
+    samples.frombytes(data[:len(data) - len(data) % 2])
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    peaks = array('B')
+    for start in range(0, len(samples), CHUNK):
+        chunk = samples[start:start + CHUNK]
+        peaks.append(min(255, max(max(chunk), -min(chunk)) >> 7))
+    return peaks.tobytes()
+# ------------------------------------------------------------------------
+
+
+def peak_columns(peaks, width, start=0.0, end=1.0):
+    """
+    Reduce the `peaks` (bytes) between the `start` and `end`
+    fractions of the duration to `width` columns. Returns a
+    list of amplitudes from 0 to 1.
+    """
+    span = peaks[int(len(peaks) * start):int(len(peaks) * end)]
+    if not span or width < 1:
+        return []
+    columns = []
+    for col in range(width):
+        first = col * len(span) // width
+        last = max(first + 1, (col + 1) * len(span) // width)
+        columns.append(max(span[first:last]) / 255)
+    return columns
+# ------------------------------------------------------------------------
+
+
+class WaveformPeaks(Thread):
+    """
+    Reads the audio peaks of `filename` in background, then
+    calls `callback(error, peaks)` by the `post` function, e.g.
+    `wx.CallAfter`. The callback is not called if the thread
+    is stopped.
+
+    Usage:
+        >>> thread = WaveformPeaks(appdata, 'a.mkv', self.on_peaks,
+                                   wx.CallAfter, logfile)
+        >>> thread.stop()  # e.g. when the selected file changes
+    """
+    def __init__(self, appdata, filename, callback, post=None,
+                 logfile='generic_task.log'):
+        """
+        appdata: the application settings (`ffmpeg_cmd`, etc.)
+        post: function to call the callback, `post(func, *args)`,
+              default calls it directly from this thread.
+        """
+        self.appdata = appdata
+        self.filename = filename
+        self.callback = callback
+        self.post = post or (lambda func, *args: func(*args))
+        self.logfile = logfile
+        self.proc = None
+        self.stopped = False
+
+        Thread.__init__(self, daemon=True)
+        self.start()
+    # ------------------------------------------------------------------
+
+    def run(self):
+        """
+        Read the peaks and deliver them.
+        """
+        error, peaks = self.read()
+        if not self.stopped:
+            self.post(self.callback, error, peaks)
+    # ------------------------------------------------------------------
+
+    def read(self):
+        """
+        Returns a tuple (error, peaks), the peaks are read
+        from the metadata cache if available.
+        """
+        cache = metadata_cache(self.appdata)
+        key = (measurement_key('waveform', self.filename, 'a:0',
+                               SAMPLE_RATE, PEAK_RATE) if cache else None)
+        if key:
+            peaks = cache.get(key)
+            if peaks is not None:
+                return None, peaks
+
+        cmd = (f'"{self.appdata["ffmpeg_cmd"]}" '
+               f'{self.appdata["ffmpeg-default-args"]} '
+               f'{self.appdata["ffmpeg_loglev"]} -nostats '
+               f'-i "{self.filename}" -map 0:a:0 -vn -sn -dn -ac 1 '
+               f'-ar {SAMPLE_RATE} -c:a pcm_s16le -f s16le pipe:1'
+               )
+        tolog(f'INFO: VIDEOMASS TASK: Timeline Waveform\n'
+              f'INFO: VIDEOMASS COMMAND: {cmd}', self.logfile,
+              sep=True, wdate=True
+              )
+        if not platform.system() == 'Windows':
+            cmd = shlex.split(cmd)
+        output = []
+        peaks = bytearray()
+        try:
+            with Popen(cmd,
+                       stdout=subprocess.PIPE,
+                       stderr=subprocess.PIPE,
+                       ) as proc:
+                self.proc = proc
+                reader = Thread(target=lambda: output.append(
+                    proc.stderr.read()), daemon=True)
+                reader.start()  # keeps the stderr pipe empty
+                while not self.stopped:
+                    data = proc.stdout.read(BLOCK)
+                    if not data:
+                        break
+                    peaks += pcm_peaks(data)
+                if self.stopped:
+                    proc.terminate()
+                proc.wait()
+                reader.join()
+
+        except OSError as err:  # command not found
+            tolog(f"[VIDEOMASS]: ERROR:\n{err}", self.logfile)
+            return f"[VIDEOMASS]: ERROR:\n{err}", None
+
+        output = b''.join(output).decode(self.appdata["encoding"], 'replace')
+        tolog(f'INFO: [FFMPEG] OUTPUT:\n{output}', self.logfile)
+        if self.stopped:
+            return None, None
+        if proc.returncode or not peaks:  # ffmpeg error
+            return f"[FFMPEG] OUTPUT ERROR:\n{output}", None
+        peaks = bytes(peaks)
+        if key:
+            cache.put(key, peaks)
+        return None, peaks
+    # ------------------------------------------------------------------
+
+    def stop(self):
+        """
+        Stop reading, the callback will not be called.
+        """
+        self.stopped = True
+        proc = self.proc
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
@@ -28,6 +28,7 @@ import os
 import json
 import wx
 from videomass.vdms_dialogs.singlechoicedlg import SingleChoice
+from videomass.vdms_io.queue_state import QueueState, write_json_atomic
 
 
 def write_json_file_queue(data, queuefile=None):
@@ -38,8 +39,18 @@ def write_json_file_queue(data, queuefile=None):
         get = wx.GetApp()
         appdata = get.appset
         queuefile = os.path.join(appdata["confdir"], 'queue.backup')
-    with open(queuefile, 'w', encoding='utf-8') as outfile:
-        json.dump(data, outfile, ensure_ascii=False, indent=4)
+    write_json_atomic(data, queuefile)
+# --------------------------------------------------------------------
+
+
+def queue_state():
+    """
+    Returns the `QueueState` of the items of the queue
+    backup, stored in the configuration directory.
+    """
+    get = wx.GetApp()
+    appdata = get.appset
+    return QueueState(os.path.join(appdata["confdir"], 'queue.state'))
 # --------------------------------------------------------------------
 
 
@@ -560,6 +560,26 @@ def update_timeseq_duration(time_seq, duration):
 # ------------------------------------------------------------------#
 
 
+def write_concat_list(filenames, listfile, duration=None):
+    """
+    Write the `filenames` list as a concat demuxer script,
+    see <https://ffmpeg.org/ffmpeg-formats.html#concat>
+    If `duration` is given (in seconds) each file is shown
+    for that time, as needed to make a video from images.
+    """
+    lines = []
+    for name in filenames:
+        escaped = name.replace(r"'", r"'\''")  # need escaping some chars
+        lines.append(f"file '{escaped}'")
+        if duration:
+            lines.append(f"duration {duration}")
+    if duration and filenames:
+        lines.append(lines[-2])  # the last duration needs a further file
+    with open(listfile, 'w', encoding='utf-8') as txt:
+        txt.write('\n'.join(lines))
+# ------------------------------------------------------------------#
+
+
 def detect_binaries(name, extradir=None):
     """
     <https://stackoverflow.com/questions/11210104/check-if